@@ -2,6 +2,27 @@ const ResumeResult = require('../models/ResumeResult');
 const { publishToQueue } = require('../queue/rabbitmq');
 const path = require('path');
 const fs = require('fs');
+const zlib = require('zlib');
+const mongoose = require('mongoose');
+
+// Uploads at or under this size go to the worker's small-file fast lane
+// (0 disables it); must match RESUME_SMALL_MAX_BYTES in the python worker
+const RESUME_SMALL_MAX_BYTES = parseInt(process.env.RESUME_SMALL_MAX_BYTES || '262144', 10);
+
+// Uploads at or over this size go to the worker's bulk lane so they never
+// hold up interactive uploads (0 disables it); must match
+// RESUME_BULK_MIN_BYTES in the python worker
+const RESUME_BULK_MIN_BYTES = parseInt(process.env.RESUME_BULK_MIN_BYTES || '2097152', 10);
+
+const chooseResumeQueue = (size) => {
+    if (RESUME_BULK_MIN_BYTES > 0 && size >= RESUME_BULK_MIN_BYTES) {
+        return 'resume_bulk_queue';
+    }
+    if (RESUME_SMALL_MAX_BYTES > 0 && size <= RESUME_SMALL_MAX_BYTES) {
+        return 'resume_small_queue';
+    }
+    return 'resume_parse_queue';
+};
 
 const uploadResume = async (req, res) => {
     try {
@@ -41,7 +62,8 @@ const uploadResume = async (req, res) => {
         }
 
         // Validate file extension
-        const allowedExtensions = ['.pdf', '.doc', '.docx'];
+        // Images and scanned PDFs are OCRed by the Python worker's OCR queue
+        const allowedExtensions = ['.pdf', '.doc', '.docx', '.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp'];
         const fileExtension = path.extname(file.originalname).toLowerCase();
 
         if (!allowedExtensions.includes(fileExtension)) {
@@ -50,7 +72,7 @@ const uploadResume = async (req, res) => {
             console.log(`❌ File rejected: Invalid extension ${fileExtension}`);
             return res.status(400).json({
                 success: false,
-                message: 'Invalid file type. Only PDF, DOC, and DOCX files are allowed.',
+                message: 'Invalid file type. Only PDF, DOC, DOCX and image (PNG, JPG, TIFF, BMP) files are allowed.',
             });
         }
 
@@ -76,9 +98,13 @@ const uploadResume = async (req, res) => {
             filePath: filePath,
         };
 
+        // Small files skip the line behind large interactive uploads, and
+        // very large ones wait in the bulk lane instead of in front of them
+        const queueName = chooseResumeQueue(file.size);
+
         try {
-            await publishToQueue('resume_parse_queue', queueMessage);
-            console.log(`✅ Message published to queue for resume: ${resumeResult._id}`);
+            await publishToQueue(queueName, queueMessage);
+            console.log(`✅ Message published to ${queueName} for resume: ${resumeResult._id}`);
 
             // Return success response
             return res.status(200).json({
@@ -133,6 +159,27 @@ const uploadResume = async (req, res) => {
     }
 };
 
+// Load resume text, inflating it from 'resumerawtexts' when the worker offloaded it
+const loadRawText = async (resumeResult) => {
+    if (!resumeResult.rawTextRef) {
+        return resumeResult.rawText || '';
+    }
+
+    const { collection = 'resumerawtexts', codec } = resumeResult.rawTextRef;
+    if (codec !== 'zlib') {
+        console.error(`❌ Unsupported raw text codec for resume ${resumeResult._id}: ${codec}`);
+        return '';
+    }
+
+    const stored = await mongoose.connection.db.collection(collection).findOne({ _id: resumeResult._id });
+    if (!stored) {
+        console.error(`❌ Offloaded raw text missing for resume ${resumeResult._id}`);
+        return '';
+    }
+
+    return zlib.inflateSync(stored.data.buffer).toString('utf-8');
+};
+
 const getResumeResult = async (req, res) => {
     try {
         const { id } = req.params;
@@ -199,7 +246,7 @@ const getResumeResult = async (req, res) => {
                     educationScore: 0,
                     formatScore: 0,
                 },
-                rawText: resumeResult.rawText || '',
+                rawText: await loadRawText(resumeResult),
                 createdAt: resumeResult.createdAt,
             },
         });
@@ -10,6 +10,12 @@ const resumeResultSchema = new mongoose.Schema({
         type: String,
         default: '',
     },
+    // Set when the worker offloads rawText to the compressed
+    // 'resumerawtexts' collection (rawText is then empty)
+    rawTextRef: {
+        type: mongoose.Schema.Types.Mixed,
+        default: null,
+    },
     skills: {
         type: [String],
         default: [],
@@ -42,9 +48,30 @@ const resumeResultSchema = new mongoose.Schema({
             default: 0,
         },
     },
+    // Inputs the scores were computed from, written by the worker so
+    // scores can be refreshed without re-parsing the file (not sent to clients)
+    features: {
+        type: mongoose.Schema.Types.Mixed,
+        default: null,
+        select: false,
+    },
+    skillsVersion: {
+        type: String,
+        default: null,
+    },
+    rubricVersion: {
+        type: String,
+        default: null,
+    },
+    // Set when the worker reused the result of a near-duplicate resume:
+    // { resumeId, similarity }
+    duplicateOf: {
+        type: mongoose.Schema.Types.Mixed,
+        default: null,
+    },
     status: {
         type: String,
-        enum: ['pending', 'processing', 'text_extracted', 'skills_extracted', 'completed', 'failed'],
+        enum: ['pending', 'processing', 'ocr_queued', 'text_extracted', 'skills_extracted', 'completed', 'failed'],
         default: 'pending',
     },
     error: {
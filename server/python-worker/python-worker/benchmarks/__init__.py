@@ -0,0 +1 @@
+# Offline benchmarks for the resume worker (run from the worker root)
@@ -0,0 +1,113 @@
+"""
+Golden check for the ATS scoring engine.
+
+Scores a deterministic synthetic corpus with calculate_ats_score and
+compares every result against benchmarks/golden/ats_scores.json, which was
+recorded from the original per-scorer implementation. Any scoring change
+that is not an intentional rubric change (RUBRIC_VERSION bump) must keep
+this check passing.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.ats_golden            # verify
+    python -m benchmarks.ats_golden --update   # re-record after a rubric change
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import logging
+
+from utils.ats_engine import calculate_ats_score
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'ats_scores.json')
+
+CORPUS_SIZE = 300
+CORPUS_SEED = 1234
+
+# Fixed vocabulary so the corpus does not change with the skills dictionary
+SKILL_POOL = [
+    'python', 'java', 'javascript', 'react', 'node.js', 'aws', 'docker', 'git',
+    'sql', 'agile', 'kafka', 'redis', 'mongodb', 'kubernetes', 'flask', 'django',
+    'typescript', 'graphql', 'terraform', 'linux', 'pandas', 'spark', 'go', 'rust',
+]
+SECTION_TITLES = ['SUMMARY', 'Skills', 'EXPERIENCE', 'Work History', 'Education',
+                  'Projects', 'Objective', 'Employment', 'Certifications']
+SENTENCES = [
+    'Developed and deployed microservices used by 2 million users',
+    'Led a team of 5 engineers and improved release cadence',
+    'Built data pipelines; optimized query latency by 40%',
+    'Collaborated with product and design to launch features',
+    'Bachelor of Technology in Computer Science, XYZ University',
+    'M.S. in Data Science, graduated 2021',
+    'Worked 2018 - 2022 at Acme Corp',
+    '2020 - present: Senior Engineer',
+    '3+ years of experience in backend systems',
+    'Responsible for various tasks',
+    'Volunteered at local community events',
+]
+BULLETS = ['- ', '• ', '* ', '▪ ', '∙ ', '']
+
+
+def build_corpus(size=CORPUS_SIZE, seed=CORPUS_SEED):
+    """
+    Build (text, skills) pairs covering headings, bullets, long paragraphs,
+    blank-line runs and year patterns.
+
+    Returns:
+        list: (raw_text, detected_skills) tuples
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        blocks = []
+        for _ in range(rng.randint(1, 7)):
+            lines = [rng.choice(SECTION_TITLES)]
+            for _ in range(rng.randint(0, 8)):
+                lines.append(rng.choice(BULLETS) + rng.choice(SENTENCES))
+            if rng.random() < 0.2:
+                lines.append(' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(4, 12))))
+            blocks.append('\n'.join(lines))
+        separator = rng.choice(['\n\n', '\n', '\n\n\n', '\n \n\n\n\n\n\n'])
+        text = separator.join(blocks)
+        if rng.random() < 0.15:
+            text = text.upper()
+        skills = sorted(rng.sample(SKILL_POOL, rng.randint(0, len(SKILL_POOL))))
+        corpus.append((text, skills))
+    return corpus
+
+
+def score_corpus():
+    return [calculate_ats_score(text, skills) for text, skills in build_corpus()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--update', action='store_true', help='Re-record the golden file')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = score_corpus()
+
+    if args.update:
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        with open(GOLDEN_PATH, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=1, sort_keys=True)
+        print(f"Recorded {len(results)} golden ATS results")
+        return
+
+    with open(GOLDEN_PATH, encoding='utf-8') as handle:
+        expected = json.load(handle)
+
+    mismatches = [index for index, (got, want) in enumerate(zip(results, expected)) if got != want]
+    if len(results) != len(expected) or mismatches:
+        print(f"ATS golden check FAILED: {len(mismatches)} of {len(expected)} results differ "
+              f"(first: {mismatches[:5]})")
+        sys.exit(1)
+
+    print(f"ATS golden check passed: {len(results)} results identical")
+
+
+if __name__ == '__main__':
+    main()
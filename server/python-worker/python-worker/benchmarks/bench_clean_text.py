@@ -0,0 +1,101 @@
+"""
+Microbenchmark: clean_text against the original multi-regex implementation.
+
+Before timing, both implementations are run on randomly generated inputs
+(spaces, tabs, newlines, unicode whitespace and control characters) and
+must produce identical output.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.bench_clean_text
+    python -m benchmarks.bench_clean_text --cases 200000 --seed 7
+"""
+
+import re
+import json
+import random
+import argparse
+import timeit
+
+from utils.text_extractor import clean_text
+
+# Characters that exercise every branch of the normalizer
+FUZZ_ALPHABET = [
+    ' ', '  ', '\n', '\n\n', '\t', '\r', '\x0b', '\x0c', '\x1c', '\x1f',
+    '\x00', '\x01', '\x7f', '\x85', '\xa0', ' ', '　', 'a', 'b', 'word',
+]
+
+
+def legacy_clean_text(raw_text):
+    """
+    Original clean_text implementation, kept as the reference output.
+    """
+    if not raw_text:
+        return ""
+    text = re.sub(r' +', ' ', raw_text)
+    text = re.sub(r'\n\s*\n+', '\n\n', text)
+    lines = [line.strip() for line in text.split('\n')]
+    text = '\n'.join(lines)
+    text = text.strip()
+    text = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]', '', text)
+    return text
+
+
+def check_equivalence(cases, seed, max_length=40):
+    """
+    Compare clean_text with legacy_clean_text on random inputs.
+
+    Raises:
+        AssertionError: On the first input whose outputs differ
+    """
+    rng = random.Random(seed)
+    for _ in range(cases):
+        raw = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, max_length)))
+        expected = legacy_clean_text(raw)
+        actual = clean_text(raw)
+        assert actual == expected, f"Output differs for {raw!r}: {actual!r} != {expected!r}"
+
+
+def build_resume_text(lines, seed):
+    """
+    Build raw extracted-text-like input with ragged spacing and blank lines.
+    """
+    rng = random.Random(seed)
+    fragments = ['Developed', 'scalable', 'services', 'Python,', 'Docker', '-', '•',
+                 'Kafka', 'Résumé', '2019 - 2023', 'University']
+    separators = [' ', ' ', ' ', '  ', '   ', '\t']
+    line_ends = ['\n', '\n', '\n', ' \n', '\n\n', '\n \n\n', '\r\n']
+    output = []
+    for _ in range(lines):
+        words = [rng.choice(fragments) for _ in range(rng.randint(1, 14))]
+        line = ''.join(word + rng.choice(separators) for word in words)
+        output.append(line + rng.choice(line_ends))
+    return ''.join(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', type=int, default=50000, help='Random equivalence cases')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--number', type=int, default=50, help='Timed runs per size')
+    args = parser.parse_args()
+
+    check_equivalence(args.cases, args.seed)
+
+    results = {'equivalenceCases': args.cases, 'sizes': []}
+    for lines in (50, 500, 5000):
+        text = build_resume_text(lines, args.seed)
+        assert clean_text(text) == legacy_clean_text(text)
+        legacy = min(timeit.repeat(lambda: legacy_clean_text(text), number=args.number, repeat=3))
+        current = min(timeit.repeat(lambda: clean_text(text), number=args.number, repeat=3))
+        results['sizes'].append({
+            'characters': len(text),
+            'legacyMs': round(legacy / args.number * 1000, 4),
+            'cleanTextMs': round(current / args.number * 1000, 4),
+            'speedup': round(legacy / current, 2),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: ranking stored resumes against a job description.
+
+Builds a synthetic pool of resumeresults documents (random dictionary
+skills and ATS sub-scores) in memory and reports pool build time, job
+description compile time (cold and memoized) and ranking latency
+percentiles for each pool size. No Mongo or spaCy needed.
+
+Before timing, each pool's rankings are checked against a full sort of
+scores computed per document in plain Python.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.bench_job_match
+    python -m benchmarks.bench_job_match --sizes 1000,10000,100000 --top-k 50
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import argparse
+
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from benchmarks.bench_pipeline import _percentile
+from utils.skills_data import SKILLS, SKILL_IDS, CANONICAL_SKILLS
+from utils.job_matcher import SKILL_POINTS, CandidatePool, compile_job_description, rank_candidates
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer to build data services in Python and Go. "
+    "You will design REST APIs with FastAPI or Django, run them on Kubernetes and "
+    "Docker in AWS, and store data in PostgreSQL, Redis and Kafka. Experience with "
+    "Terraform, CI/CD and Git is required; React is a plus."
+)
+
+
+def build_documents(size, seed):
+    """
+    Build resumeresults documents with random skills and sub-scores.
+    """
+    rng = random.Random(seed)
+    return [{
+        '_id': f"{index:024x}",
+        'userId': f"{rng.randrange(size // 3 + 1):024x}",
+        'skills': rng.sample(SKILLS, rng.randint(3, 40)),
+        'scoringBreakdown': {
+            'experienceScore': rng.randint(0, 25),
+            'educationScore': rng.randint(0, 15),
+            'formatScore': rng.randint(0, 20),
+        },
+    } for index in range(size)]
+
+
+def reference_ranking(job, documents, top_k):
+    """
+    Rank documents by scoring each one in plain Python and sorting them all.
+
+    Returns:
+        list: (resumeId, score, matched skills) of the top_k documents
+    """
+    scored = []
+    for index, document in enumerate(documents):
+        skills = {CANONICAL_SKILLS[SKILL_IDS[skill]] for skill in document['skills'] if skill in SKILL_IDS}
+        matched = [skill for skill in job.skills if skill in skills]
+        breakdown = document['scoringBreakdown']
+        base = breakdown['experienceScore'] + breakdown['educationScore'] + breakdown['formatScore']
+        score = len(matched) * (SKILL_POINTS / len(job.skills)) + base
+        scored.append((-score, index, document['_id'], matched))
+    scored.sort()
+    return [(resume_id, round(-score, 2), matched) for score, _, resume_id, matched in scored[:top_k]]
+
+
+def check_equivalence(job, documents, pool, top_k):
+    """
+    Compare rank_candidates with reference_ranking for a few top_k values.
+
+    Raises:
+        AssertionError: On the first ranking that differs
+    """
+    for k in sorted({1, top_k, len(documents)}):
+        expected = reference_ranking(job, documents, k)
+        actual = [(entry['resumeId'], entry['score'], entry['matchedSkills'])
+                  for entry in rank_candidates(job, pool, k)]
+        assert actual == expected, f"Ranking differs from the full sort for {len(documents)} resumes, top_k={k}"
+
+
+def measure(size, top_k, repeat, seed):
+    """
+    Pool build, compile and ranking timings for one pool size.
+    """
+    documents = build_documents(size, seed)
+
+    start = time.perf_counter()
+    pool = CandidatePool.from_documents(documents)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    description = f"{JOB_DESCRIPTION} ({size})"
+    start = time.perf_counter()
+    job = compile_job_description(description)
+    compile_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    compile_job_description(description)
+    compile_cached_ms = (time.perf_counter() - start) * 1000
+
+    check_equivalence(job, documents, pool, top_k)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rank_candidates(job, pool, top_k)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'resumes': size,
+        'jobSkills': len(job.skills),
+        'poolBuildMs': round(build_ms, 2),
+        'poolMatrixBytes': pool.skills.nbytes,
+        'compileMs': round(compile_ms, 3),
+        'compileCachedMs': round(compile_cached_ms, 4),
+        'rankMs': {
+            'p50': round(_percentile(timings, 50), 3),
+            'p95': round(_percentile(timings, 95), 3),
+            'p99': round(_percentile(timings, 99), 3),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help='Comma-separated pool sizes')
+    parser.add_argument('--top-k', type=int, default=20, help='Resumes returned per ranking')
+    parser.add_argument('--repeat', type=int, default=50, help='Rankings per pool size')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    report = [measure(int(size), args.top_k, args.repeat, args.seed) for size in args.sizes.split(',')]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+Benchmark: MinHash signatures and LSH near-duplicate lookups.
+
+Builds an LshIndex over synthetic resumes (random words from a shared
+vocabulary, so unrelated resumes still overlap a little) of which a share
+has near-copies: one changed line and a changed date. Reports signature
+time, lookup latency percentiles, recall of the near-copies at the reuse
+threshold, false matches and cluster time. No Mongo needed.
+
+Before timing, LSH is checked against exact Jaccard similarity on a
+smaller sample: every indexed resume whose shingle-set Jaccard with a
+query reaches the reuse threshold must be an LSH candidate, and the
+MinHash estimates must stay within a few standard errors of the exact
+values.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.bench_near_duplicates
+    python -m benchmarks.bench_near_duplicates --resumes 200000 --lookups 2000
+"""
+
+import os
+import json
+import math
+import time
+import random
+import logging
+import argparse
+
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from bson import ObjectId
+
+from benchmarks.bench_pipeline import _percentile
+from utils.skills_data import SKILLS
+from utils.near_duplicates import (
+    _TOKEN_RE, LshIndex, minhash_signature, signature_similarity, NEAR_DUP_REUSE_THRESHOLD, NEAR_DUP_SHINGLE_SIZE,
+)
+
+# Rewritten lines per checked near-copy, spreading exact Jaccard from
+# identical down to well under the reuse threshold
+CHECK_EDITS = (0, 1, 2, 4, 8)
+
+
+def synthetic_resume(rng, vocabulary, lines=40, words_per_line=12):
+    """
+    Random resume text: lines of vocabulary words with a year range each.
+    """
+    return [
+        ' '.join(rng.choices(vocabulary, k=words_per_line)) + f" {rng.randint(2000, 2020)} - {rng.randint(2020, 2025)}"
+        for _ in range(lines)
+    ]
+
+
+def near_copy(rng, vocabulary, lines, edits=1):
+    """
+    The same resume with edits rewritten lines and one changed date.
+    """
+    lines = list(lines)
+    for _ in range(edits):
+        lines[rng.randrange(len(lines))] = ' '.join(rng.choices(vocabulary, k=12))
+    position = rng.randrange(len(lines))
+    lines[position] = lines[position].rsplit(' ', 1)[0] + ' present'
+    return lines
+
+
+def shingle_set(text, shingle_size=NEAR_DUP_SHINGLE_SIZE):
+    """
+    Exact word shingles of a text, tokenized as minhash_signature does.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    return {tuple(tokens[offset:offset + shingle_size]) for offset in range(len(tokens) - shingle_size + 1)}
+
+
+def check_equivalence(resumes, queries, seed, vocabulary, threshold=NEAR_DUP_REUSE_THRESHOLD):
+    """
+    Compare LSH candidates and MinHash estimates with exact Jaccard over
+    every (query, indexed resume) pair of a small sample.
+
+    Raises:
+        AssertionError: If a pair at or above threshold is not a
+            candidate, or an estimate is more than 5 standard errors off
+
+    Returns:
+        dict: Pairs checked, pairs at or above threshold and the mean
+            absolute estimate error of the candidates
+    """
+    rng = random.Random(seed + 1)
+    index = LshIndex()
+    corpus = []
+    for number in range(resumes):
+        lines = synthetic_resume(rng, vocabulary)
+        text = '\n'.join(lines)
+        index.add(str(number), minhash_signature(text))
+        corpus.append((lines, shingle_set(text)))
+
+    stats = {'pairs': 0, 'pairsAtThreshold': 0, 'candidates': 0, 'meanAbsEstimateError': 0.0}
+    for query in range(queries):
+        lines, _ = corpus[rng.randrange(resumes)]
+        text = '\n'.join(near_copy(rng, vocabulary, lines, CHECK_EDITS[query % len(CHECK_EDITS)]))
+        signature = minhash_signature(text)
+        shingles = shingle_set(text)
+        candidates = set(index.candidates(signature).tolist())
+
+        for row, (_, row_shingles) in enumerate(corpus):
+            shared = len(shingles & row_shingles)
+            exact = shared / (len(shingles) + len(row_shingles) - shared)
+            stats['pairs'] += 1
+            if exact >= threshold:
+                stats['pairsAtThreshold'] += 1
+                assert row in candidates, f"Pair with Jaccard {exact:.3f} is not an LSH candidate"
+            if row in candidates:
+                estimate = signature_similarity(signature, index.signatures[row])
+                error = abs(estimate - exact)
+                assert error <= 5 * math.sqrt(exact * (1 - exact) / index.num_perm) + 2 / index.num_perm, \
+                    f"MinHash estimate {estimate:.3f} is far from Jaccard {exact:.3f}"
+                stats['candidates'] += 1
+                stats['meanAbsEstimateError'] += error
+
+    stats['meanAbsEstimateError'] = round(stats['meanAbsEstimateError'] / max(stats['candidates'], 1), 4)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--resumes', type=int, default=50000, help='Indexed resumes')
+    parser.add_argument('--lookups', type=int, default=1000, help='Near-copies looked up')
+    parser.add_argument('--check-resumes', type=int, default=1000, help='Resumes in the exact Jaccard check')
+    parser.add_argument('--check-queries', type=int, default=200, help='Near-copies in the exact Jaccard check')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(args.seed)
+    vocabulary = SKILLS + [f"word{number}" for number in range(5000)]
+
+    check = check_equivalence(args.check_resumes, args.check_queries, args.seed, vocabulary)
+
+    index = LshIndex()
+    originals = []
+    signature_seconds = 0.0
+    start = time.perf_counter()
+    for _ in range(args.resumes):
+        lines = synthetic_resume(rng, vocabulary)
+        resume_id = str(ObjectId())
+        sign_start = time.perf_counter()
+        signature = minhash_signature('\n'.join(lines))
+        signature_seconds += time.perf_counter() - sign_start
+        index.add(resume_id, signature)
+        if len(originals) < args.lookups:
+            originals.append((resume_id, lines))
+    build_seconds = time.perf_counter() - start
+
+    copies = [(resume_id, minhash_signature('\n'.join(near_copy(rng, vocabulary, lines))))
+              for resume_id, lines in originals]
+    unrelated = [minhash_signature('\n'.join(synthetic_resume(rng, vocabulary))) for _ in range(args.lookups)]
+
+    timings = []
+    found = 0
+    similarities = []
+    for resume_id, signature in copies:
+        start = time.perf_counter()
+        matches = index.lookup(signature, NEAR_DUP_REUSE_THRESHOLD)
+        timings.append((time.perf_counter() - start) * 1000)
+        similarities.append(next((similarity for match_id, similarity in matches if match_id == resume_id), 0.0))
+        found += any(match_id == resume_id for match_id, _ in matches)
+    false_matches = sum(bool(index.lookup(signature, NEAR_DUP_REUSE_THRESHOLD)) for signature in unrelated)
+
+    for _, signature in copies:
+        index.add(str(ObjectId()), signature)
+    start = time.perf_counter()
+    clusters = index.clusters(0.8)
+    cluster_seconds = time.perf_counter() - start
+
+    report = {
+        'resumes': args.resumes,
+        'numPerm': index.num_perm,
+        'bands': index.bands,
+        'reuseThreshold': NEAR_DUP_REUSE_THRESHOLD,
+        'signatureMsMean': round(signature_seconds / args.resumes * 1000, 3),
+        'buildSeconds': round(build_seconds, 2),
+        'signatureBytes': int(index.signatures[:index.size].nbytes),
+        'lookupP50Ms': round(_percentile(timings, 50), 3),
+        'lookupP95Ms': round(_percentile(timings, 95), 3),
+        'lookupP99Ms': round(_percentile(timings, 99), 3),
+        'nearCopyRecall': round(found / len(copies), 4),
+        'nearCopySimilarityP5': round(_percentile(similarities, 5), 3),
+        'unrelatedFalseMatches': false_matches,
+        'clusters': len(clusters),
+        'clusterSeconds': round(cluster_seconds, 2),
+        'exactJaccardCheck': check,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Benchmark: text extraction, cleaning, skill matching and ATS scoring.
+
+Runs extract_text, clean_text, extract_skills, extract_skills_simple and
+calculate_ats_score over a synthetic (or supplied) resume corpus and
+reports throughput, per-document latency percentiles and peak Python
+memory. Results are written as JSON so runs on different versions can be
+compared with --compare. Needs no Mongo, RabbitMQ or network access.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --count 300 --pages 1,5,20 --repeat 3
+    python -m benchmarks.bench_pipeline --corpus /tmp/resume-corpus --output run.json
+    python -m benchmarks.bench_pipeline --compare benchmarks/results/baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import resource
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+
+# Measure the functions themselves, not the metrics exporter around them
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from benchmarks.corpus import add_corpus_arguments, generate_from_args
+
+BENCHMARKS = ('extract_text', 'clean_text', 'extract_skills', 'extract_skills_simple', 'calculate_ats_score')
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _extract_raw_text(path):
+    from utils.text_extractor import extract_text_from_pdf, extract_text_from_docx
+
+    if path.lower().endswith('.pdf'):
+        return extract_text_from_pdf(path)
+    return extract_text_from_docx(path)
+
+
+def prepare_inputs(corpus_dir):
+    """
+    Load the corpus and precompute every benchmark's inputs, so each
+    benchmark times only its own function.
+
+    Returns:
+        dict: Benchmark name -> (function, argument tuples, input characters)
+    """
+    from utils.text_extractor import extract_text, clean_text
+    from utils.skill_matcher import find_skills
+    from utils.skills_extractor import extract_skills, extract_skills_simple
+    from utils.ats_engine import calculate_ats_score
+
+    paths = [os.path.join(corpus_dir, name) for name in sorted(os.listdir(corpus_dir))
+             if name.lower().endswith(('.pdf', '.docx'))]
+    raw_texts = [_extract_raw_text(path) for path in paths]
+    texts = [clean_text(raw_text) for raw_text in raw_texts]
+    skills = [find_skills(text.lower()) for text in texts]
+    text_chars = sum(map(len, texts))
+
+    inputs = {
+        'extract_text': (extract_text, [(path,) for path in paths], text_chars),
+        'clean_text': (clean_text, [(raw_text,) for raw_text in raw_texts], sum(map(len, raw_texts))),
+        'extract_skills': (extract_skills, [(text,) for text in texts], text_chars),
+        'extract_skills_simple': (extract_skills_simple, [(text,) for text in texts], text_chars),
+        'calculate_ats_score': (calculate_ats_score, list(zip(texts, skills)), text_chars),
+    }
+
+    return inputs
+
+
+def run_benchmark(function, arguments, input_chars, repeat, measure_memory=True):
+    """
+    Time one function over every input.
+
+    Returns:
+        dict: Throughput, latency percentiles and peak traced memory
+    """
+    # Warm caches (compiled patterns, lazily loaded models) before timing
+    function(*arguments[0])
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in arguments:
+            call_start = time.perf_counter()
+            function(*args)
+            latencies.append((time.perf_counter() - call_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'documents': len(latencies),
+        'seconds': round(elapsed, 4),
+        'docsPerSecond': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'charsPerSecond': round(input_chars * repeat / elapsed) if elapsed else None,
+        'latencyMs': {
+            'mean': round(statistics.mean(latencies), 4),
+            'p50': round(_percentile(latencies, 50), 4),
+            'p90': round(_percentile(latencies, 90), 4),
+            'p95': round(_percentile(latencies, 95), 4),
+            'p99': round(_percentile(latencies, 99), 4),
+            'max': round(max(latencies), 4),
+        },
+    }
+
+    # Separate pass: tracemalloc slows allocation-heavy code too much to time with it on
+    if measure_memory:
+        tracemalloc.start()
+        for args in arguments:
+            function(*args)
+        result['peakTracedMb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3)
+        tracemalloc.stop()
+
+    return result
+
+
+def compare_results(current, baseline, threshold):
+    """
+    Compare two result files benchmark by benchmark.
+
+    A benchmark regresses when its p50 or p95 latency grows, or its
+    throughput drops, by more than threshold (a fraction).
+
+    Returns:
+        tuple: (report lines, names of regressed benchmarks)
+    """
+    lines = [f"{'benchmark':<24}{'p50':>10}{'p95':>10}{'docs/s':>10}"]
+    regressed = []
+    for name in BENCHMARKS:
+        now = current['results'].get(name, {})
+        before = baseline['results'].get(name, {})
+        if 'latencyMs' not in now or 'latencyMs' not in before:
+            continue
+
+        p50 = now['latencyMs']['p50'] / before['latencyMs']['p50'] if before['latencyMs']['p50'] else 1.0
+        p95 = now['latencyMs']['p95'] / before['latencyMs']['p95'] if before['latencyMs']['p95'] else 1.0
+        throughput = now['docsPerSecond'] / before['docsPerSecond'] if before['docsPerSecond'] else 1.0
+
+        flag = ''
+        if p50 > 1 + threshold or p95 > 1 + threshold or throughput < 1 / (1 + threshold):
+            regressed.append(name)
+            flag = '  REGRESSED'
+        lines.append(f"{name:<24}{p50:>9.2f}x{p95:>9.2f}x{throughput:>9.2f}x{flag}")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--corpus', help='Directory of .pdf/.docx resumes; generated if omitted')
+    add_corpus_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=1, help='Timed passes over the corpus')
+    parser.add_argument('--only', help='Comma-separated benchmarks to run')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<commit>-<time>.json)')
+    parser.add_argument('--compare', help='Baseline result file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed slowdown fraction before --compare fails (default 0.10)')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    selected = [name.strip() for name in args.only.split(',')] if args.only else list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix='resume-bench-') as scratch:
+        if args.corpus:
+            corpus_dir = args.corpus
+            manifest_path = os.path.join(corpus_dir, 'manifest.json')
+            corpus = {'path': os.path.abspath(corpus_dir)}
+            if os.path.exists(manifest_path):
+                with open(manifest_path, encoding='utf-8') as handle:
+                    manifest = json.load(handle)
+                corpus.update({key: value for key, value in manifest.items() if key != 'documents'})
+        else:
+            corpus_dir = scratch
+            manifest = generate_from_args(corpus_dir, args)
+            corpus = {key: value for key, value in manifest.items() if key != 'documents'}
+        corpus['bytes'] = sum(os.path.getsize(os.path.join(corpus_dir, name))
+                              for name in os.listdir(corpus_dir) if name.lower().endswith(('.pdf', '.docx')))
+
+        inputs = prepare_inputs(corpus_dir)
+
+        results = {}
+        for name in selected:
+            function, arguments, input_chars = inputs[name]
+            results[name] = run_benchmark(function, arguments, input_chars, args.repeat, not args.no_memory)
+
+    from utils.result_cache import PIPELINE_VERSION
+    from utils.skills_data import SKILLS_VERSION
+    from utils.ats_engine import RUBRIC_VERSION
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'versions': {'pipeline': PIPELINE_VERSION, 'skills': SKILLS_VERSION, 'rubric': RUBRIC_VERSION},
+            # ru_maxrss is KiB on Linux
+            'peakRssMb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+        'corpus': corpus,
+        'results': results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{report['meta']['commit'] or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        lines, regressed = compare_results(report, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} ({baseline['meta'].get('commit')}), current / baseline:")
+        print('\n'.join(lines))
+        if regressed:
+            print(f"Regressions beyond {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
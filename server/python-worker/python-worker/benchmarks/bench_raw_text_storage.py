@@ -0,0 +1,189 @@
+"""
+Benchmark: inline vs offloaded (compressed) rawText storage.
+
+Offline, builds resumeresults documents from the synthetic corpus and
+reports hot document BSON size, compression ratio and compress /
+decompress latency for each codec. With --mongo-uri it also writes both
+layouts to scratch collections and measures read latency for a
+dashboard read (hot document only) and a detail read (hot document plus
+side document, decompressed); the scratch collections are dropped after.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.bench_raw_text_storage
+    python -m benchmarks.bench_raw_text_storage --count 500 --pages 1,3,10
+    python -m benchmarks.bench_raw_text_storage --mongo-uri mongodb://localhost:27017/bench
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from bson import BSON, Binary, ObjectId
+
+from benchmarks.corpus import add_corpus_arguments, generate_from_args
+from benchmarks.bench_pipeline import _percentile
+from utils.raw_text_store import RAW_TEXT_CODECS, RAW_TEXT_COLLECTION, compress_text, decompress_text
+
+
+def _summary(values):
+    return {
+        'mean': round(statistics.mean(values), 4),
+        'p50': round(_percentile(values, 50), 4),
+        'p95': round(_percentile(values, 95), 4),
+        'p99': round(_percentile(values, 99), 4),
+    }
+
+
+def build_documents(texts):
+    """
+    Build resumeresults documents shaped like the worker's output.
+    """
+    return [{
+        '_id': ObjectId(),
+        'userId': ObjectId(),
+        'status': 'completed',
+        'rawText': text,
+        'skills': ['python', 'docker', 'aws', 'sql', 'git'],
+        'atsScore': 72,
+        'missingSkills': ['java', 'react'],
+        'scoringBreakdown': {'skillScore': 12.5, 'experienceScore': 20, 'educationScore': 15, 'formatScore': 17},
+    } for text in texts]
+
+
+def measure_codec(documents, codec):
+    """
+    Size and CPU cost of offloading every document's text with codec.
+    """
+    compress_ms = []
+    decompress_ms = []
+    hot_bytes = []
+    compressed_bytes = []
+    for document in documents:
+        text = document['rawText']
+
+        start = time.perf_counter()
+        data = compress_text(text, codec)
+        compress_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        decompress_text(data, codec)
+        decompress_ms.append((time.perf_counter() - start) * 1000)
+
+        ref = {'collection': RAW_TEXT_COLLECTION, 'codec': codec, 'length': len(text), 'compressedBytes': len(data)}
+        hot_bytes.append(len(BSON.encode({**document, 'rawText': '', 'rawTextRef': ref})))
+        compressed_bytes.append(len(data))
+
+    text_bytes = sum(len(document['rawText'].encode('utf-8')) for document in documents)
+    return {
+        'hotDocumentBytes': _summary(hot_bytes),
+        'compressionRatio': round(sum(compressed_bytes) / text_bytes, 4),
+        'compressMs': _summary(compress_ms),
+        'decompressMs': _summary(decompress_ms),
+    }
+
+
+def measure_reads(mongo_uri, documents, codec, reads):
+    """
+    Read latency of both layouts against a real MongoDB.
+    """
+    from pymongo import MongoClient
+
+    client = MongoClient(mongo_uri)
+    db = client.get_default_database('resume_bench')
+    inline = db['bench_resumeresults_inline']
+    offloaded = db['bench_resumeresults_offload']
+    side = db['bench_resumerawtexts']
+    try:
+        for collection in (inline, offloaded, side):
+            collection.drop()
+
+        inline.insert_many(documents)
+        side_documents = []
+        hot_documents = []
+        for document in documents:
+            data = compress_text(document['rawText'], codec)
+            side_documents.append({'_id': document['_id'], 'codec': codec, 'data': Binary(data),
+                                   'length': len(document['rawText'])})
+            hot_documents.append({**document, 'rawText': '', 'rawTextRef': {
+                'collection': RAW_TEXT_COLLECTION, 'codec': codec,
+                'length': len(document['rawText']), 'compressedBytes': len(data)}})
+        offloaded.insert_many(hot_documents)
+        side.insert_many(side_documents)
+
+        ids = [document['_id'] for document in documents]
+        timings = {'inlineDashboardMs': [], 'offloadDashboardMs': [], 'offloadDetailMs': []}
+        for index in range(reads):
+            resume_id = ids[index % len(ids)]
+
+            start = time.perf_counter()
+            inline.find_one({'_id': resume_id})
+            timings['inlineDashboardMs'].append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            offloaded.find_one({'_id': resume_id})
+            timings['offloadDashboardMs'].append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            offloaded.find_one({'_id': resume_id})
+            entry = side.find_one({'_id': resume_id})
+            decompress_text(bytes(entry['data']), entry['codec'])
+            timings['offloadDetailMs'].append((time.perf_counter() - start) * 1000)
+
+        # Dashboard-style scan: every user's results, all fields
+        start = time.perf_counter()
+        list(inline.find({}))
+        scan_inline = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        list(offloaded.find({}))
+        scan_offload = (time.perf_counter() - start) * 1000
+
+        result = {name: _summary(values) for name, values in timings.items()}
+        result['fullScanMs'] = {'inline': round(scan_inline, 2), 'offload': round(scan_offload, 2)}
+        return result
+    finally:
+        for collection in (inline, offloaded, side):
+            collection.drop()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    add_corpus_arguments(parser)
+    parser.add_argument('--mongo-uri', help='MongoDB to measure read latency against (scratch collections)')
+    parser.add_argument('--reads', type=int, default=1000, help='Point reads per layout')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    from utils.text_extractor import extract_text
+
+    with tempfile.TemporaryDirectory(prefix='resume-bench-') as corpus_dir:
+        manifest = generate_from_args(corpus_dir, args)
+        texts = [extract_text(os.path.join(corpus_dir, document['file'])) for document in manifest['documents']]
+
+    documents = build_documents(texts)
+    report = {
+        'documents': len(documents),
+        'inlineHotDocumentBytes': _summary([len(BSON.encode(document)) for document in documents]),
+        'codecs': {},
+    }
+    for codec in RAW_TEXT_CODECS:
+        try:
+            report['codecs'][codec] = measure_codec(documents, codec)
+        except ValueError as error:
+            report['codecs'][codec] = {'skipped': str(error)}
+
+    if args.mongo_uri:
+        report['reads'] = measure_reads(args.mongo_uri, documents, 'zlib', args.reads)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark: inverted skill index queries.
+
+Builds a SkillIndex over a synthetic population of resumes (random
+dictionary skills, popular skills weighted up) and reports build time,
+memory, snapshot size / load time and latency percentiles for boolean
+and threshold queries. No Mongo needed.
+
+Before timing, every query's matches (on the built index and on its
+reloaded snapshot) are checked against a linear scan of the resumes'
+skill sets, after re-indexing a sample of resumes with new skills.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.bench_skill_index
+    python -m benchmarks.bench_skill_index --resumes 1000000 --repeat 50
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from bson import ObjectId
+
+from benchmarks.bench_pipeline import _percentile
+from utils.skills_data import SKILLS, canonical_skill
+from utils.skill_index import SkillIndex
+
+QUERIES = {
+    'and': {'all_of': ['kafka', 'python']},
+    'and_not': {'all_of': ['kafka', 'python'], 'none_of': ['php']},
+    'or': {'any_of': ['react', 'vue', 'angular', 'svelte']},
+    'mixed': {'all_of': ['aws'], 'any_of': ['docker', 'kubernetes'], 'none_of': ['java']},
+    'at_least_3_of_5': {'at_least': (3, ['python', 'docker', 'aws', 'sql', 'git'])},
+}
+
+POPULAR = ['python', 'java', 'javascript', 'react', 'aws', 'docker', 'git', 'sql', 'kafka', 'kubernetes']
+
+
+def _random_skills(rng):
+    skills = set(rng.sample(SKILLS, rng.randint(3, 25)))
+    skills.update(skill for skill in POPULAR if rng.random() < 0.3)
+    return sorted(skills)
+
+
+def build_index(resumes, seed, batch_size=50000):
+    """
+    Fold synthetic entries into a fresh index, a batch at a time.
+
+    Returns:
+        tuple: (index, (resume id, skills) per ordinal)
+    """
+    rng = random.Random(seed)
+    index = SkillIndex()
+    entries = []
+    batch = []
+    for ordinal in range(resumes):
+        entry = (ordinal, ObjectId(), _random_skills(rng))
+        batch.append(entry)
+        entries.append(entry[1:])
+        if len(batch) >= batch_size:
+            index.apply(batch)
+            batch = []
+    index.apply(batch)
+    return index, entries
+
+
+def reindex_sample(index, entries, seed, fraction=0.01):
+    """
+    Re-index a random sample of ordinals with new resumes and skills (as
+    catch_up does when a resume is re-processed), updating entries too.
+    """
+    rng = random.Random(seed + 1)
+    batch = []
+    for ordinal in rng.sample(range(len(entries)), max(1, int(len(entries) * fraction))):
+        entry = (ordinal, ObjectId(), _random_skills(rng))
+        batch.append(entry)
+        entries[ordinal] = entry[1:]
+    index.apply(batch)
+
+
+def linear_scan(entries, all_of=(), any_of=(), none_of=(), at_least=None):
+    """
+    Resume ids matching a query, by testing every resume's skill set in order.
+    """
+    all_of = {canonical_skill(skill) for skill in all_of}
+    any_of = {canonical_skill(skill) for skill in any_of}
+    none_of = {canonical_skill(skill) for skill in none_of}
+    if at_least:
+        minimum, threshold_skills = at_least[0], {canonical_skill(skill) for skill in at_least[1]}
+
+    matches = []
+    for resume_id, skills in entries:
+        skills = {canonical_skill(skill) for skill in skills}
+        if (all_of <= skills and (not any_of or any_of & skills) and not none_of & skills
+                and (not at_least or len(threshold_skills & skills) >= minimum)):
+            matches.append(str(resume_id))
+    return matches
+
+
+def check_equivalence(index, entries, queries):
+    """
+    Compare index queries with linear_scan.
+
+    Raises:
+        AssertionError: On the first query whose matches differ
+    """
+    for name, query in queries.items():
+        bits = index.query(**query)
+        expected = linear_scan(entries, **query)
+        assert index.count(bits) == len(expected), f"{name}: count differs from a linear scan"
+        assert index.resume_ids_of(bits) == expected, f"{name}: matches differ from a linear scan"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--resumes', type=int, default=200000, help='Indexed resumes')
+    parser.add_argument('--repeat', type=int, default=100, help='Runs per query')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    start = time.perf_counter()
+    index, entries = build_index(args.resumes, args.seed)
+    build_seconds = time.perf_counter() - start
+
+    reindex_sample(index, entries, args.seed)
+    check_equivalence(index, entries, QUERIES)
+
+    with tempfile.TemporaryDirectory(prefix='skill-index-bench-') as directory:
+        path = os.path.join(directory, 'skill_index.npz')
+        start = time.perf_counter()
+        index.save(path)
+        save_seconds = time.perf_counter() - start
+        snapshot_bytes = os.path.getsize(path)
+        start = time.perf_counter()
+        loaded = SkillIndex.load(path)
+        load_seconds = time.perf_counter() - start
+        check_equivalence(loaded, entries, QUERIES)
+
+    report = {
+        'resumes': len(index),
+        'skills': len(index.bitsets),
+        'buildSeconds': round(build_seconds, 2),
+        'memoryBytes': sum(bits.nbytes for bits in index.bitsets.values()) + index.live.nbytes + index.resume_ids.nbytes,
+        'snapshotBytes': snapshot_bytes,
+        'snapshotSaveSeconds': round(save_seconds, 2),
+        'snapshotLoadSeconds': round(load_seconds, 2),
+        'queries': {},
+    }
+    for name, query in QUERIES.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            bits = index.query(**query)
+            count = index.count(bits)
+            index.resume_ids_of(bits, limit=100)
+            timings.append((time.perf_counter() - start) * 1000)
+        report['queries'][name] = {
+            'matches': count,
+            'p50Ms': round(_percentile(timings, 50), 3),
+            'p95Ms': round(_percentile(timings, 95), 3),
+            'p99Ms': round(_percentile(timings, 99), 3),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
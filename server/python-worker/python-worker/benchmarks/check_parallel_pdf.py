@@ -0,0 +1,97 @@
+"""
+Check: parallel PDF page extraction inside a Celery prefork child.
+
+Celery runs tasks in daemonic billiard pool processes, and the extraction
+sandbox forks from those. This writes a PDF with more pages than the
+parallel threshold, extracts it serially in this process as the
+reference, then extracts it in a billiard pool child, both directly and
+through the sandbox, with the page-extraction pool forced on. The direct
+run must use the pool, the sandboxed one must extract serially (see
+utils.extraction_sandbox), and both must produce exactly the reference
+text.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.check_parallel_pdf
+    python -m benchmarks.check_parallel_pdf --pages 120 --processes 4
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+
+# Check the extraction itself, not the metrics exporter around it
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from billiard import Pool
+
+import utils.text_extractor as text_extractor
+from utils.extraction_sandbox import run_sandboxed
+from benchmarks.corpus import build_resume_lines, write_pdf
+
+
+def _extract_in_child(path, threshold, processes, sandboxed):
+    """
+    Pool child entry point: extract path with the parallel path enabled.
+
+    Returns:
+        tuple: (text, whether the page-extraction pool was used, seconds)
+    """
+    text_extractor.PDF_PARALLEL_PAGE_THRESHOLD = threshold
+    # Forced so the check runs the parallel path on any host
+    text_extractor.get_pdf_pool_size = lambda: processes
+    text_extractor._pdf_pool = None
+
+    def extract(source, ext):
+        text = text_extractor.extract_text(source, ext)
+        return text, text_extractor._pdf_pool is not None
+
+    start = time.perf_counter()
+    if sandboxed:
+        text, used_pool = run_sandboxed(extract, path, '.pdf')
+    else:
+        text, used_pool = extract(path, '.pdf')
+    return text, used_pool, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', type=int, default=60, help='Pages in the test PDF')
+    parser.add_argument('--threshold', type=int, default=40, help='PDF_PARALLEL_PAGE_THRESHOLD to apply')
+    parser.add_argument('--processes', type=int, default=2, help='Page-extraction pool size to force')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    assert args.pages > args.threshold, '--pages must exceed --threshold'
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'long_resume.pdf')
+        lines, _, _ = build_resume_lines(random.Random(args.seed), args.pages, 0.1, False)
+        page_count = write_pdf(path, lines)
+        assert page_count > args.threshold, f"Wrote {page_count} pages, threshold is {args.threshold}"
+
+        text_extractor.PDF_PARALLEL_PAGE_THRESHOLD = None
+        start = time.perf_counter()
+        reference = text_extractor.extract_text(path)
+        results = {'pages': page_count, 'serialSeconds': round(time.perf_counter() - start, 3)}
+
+        # One daemonic child, as in Celery's prefork pool
+        pool = Pool(processes=1)
+        try:
+            for mode, sandboxed in (('preforkChild', False), ('sandbox', True)):
+                text, used_pool, seconds = pool.apply(
+                    _extract_in_child, (path, args.threshold, args.processes, sandboxed))
+                assert used_pool != sandboxed, f"{mode}: page-extraction pool used: {used_pool}"
+                assert text == reference, f"{mode}: parallel text differs from serial extraction"
+                results[f'{mode}Seconds'] = round(seconds, 3)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+Synthetic resume corpus generator for benchmarks.
+
+Writes PDF and DOCX resumes with controlled page counts, skill density and
+table usage, plus a manifest.json describing every document. Output is
+byte-for-byte deterministic for a given seed and parameters: PDFs are
+written directly (no timestamps, no extra dependencies) and DOCX files
+through python-docx with fixed core properties.
+
+Usage (from the python-worker directory):
+    python -m benchmarks.corpus --out /tmp/resume-corpus
+    python -m benchmarks.corpus --out /tmp/resume-corpus --count 200 --pages 1,2,5,20 \\
+        --skill-density 0.05,0.3 --table-ratio 0.5 --formats pdf,docx
+"""
+
+import os
+import json
+import random
+import zipfile
+import argparse
+from datetime import datetime
+
+# Fixed vocabulary so the corpus does not change with the skills dictionary
+SKILL_POOL = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'node.js',
+    'django', 'flask', 'spring boot', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+    'terraform', 'jenkins', 'git', 'sql', 'postgresql', 'mongodb', 'redis', 'kafka',
+    'spark', 'hadoop', 'pandas', 'numpy', 'tensorflow', 'pytorch', 'machine learning',
+    'linux', 'graphql', 'rest api', 'microservices', 'agile', 'scrum', 'c++', 'go',
+]
+FILLER = [
+    'Collaborated with product and design to launch customer facing features',
+    'Improved release cadence and reduced incident count quarter over quarter',
+    'Mentored junior engineers and ran weekly knowledge sharing sessions',
+    'Owned the on-call rotation and wrote runbooks for common failures',
+    'Partnered with stakeholders to define requirements and milestones',
+    'Reduced infrastructure cost by consolidating underused services',
+    'Responsible for code reviews, testing and documentation',
+]
+ACTIONS = ['Developed', 'Built', 'Designed', 'Implemented', 'Led', 'Optimized', 'Migrated']
+SECTIONS = ['SUMMARY', 'EXPERIENCE', 'PROJECTS', 'EDUCATION', 'CERTIFICATIONS']
+
+FORMATS = ('pdf', 'docx')
+
+# PDF page layout: US Letter, 10pt Helvetica, 14pt leading
+_PDF_LINES_PER_PAGE = 48
+_PDF_WRAP_CHARS = 95
+
+# Fixed timestamp for reproducible DOCX packages
+_DOCX_TIMESTAMP = datetime(2024, 1, 1)
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def _float_list(value):
+    return [float(item) for item in value.split(',') if item.strip()]
+
+
+def build_resume_lines(rng, pages, skill_density, with_table):
+    """
+    Build the content of one resume.
+
+    Args:
+        rng (random.Random): Random source
+        pages (int): Target page count (at _PDF_LINES_PER_PAGE lines per page)
+        skill_density (float): Fraction of body lines that mention a skill
+        with_table (bool): Include a skills table
+
+    Returns:
+        tuple: (body lines, table rows or None, skills used)
+    """
+    skills = rng.sample(SKILL_POOL, rng.randint(4, 16))
+    # A table adds a blank line, a title, a header row and one row per skill
+    target_lines = pages * _PDF_LINES_PER_PAGE - (len(skills) + 3 if with_table else 0)
+
+    lines = ['Jordan Example', 'jordan@example.com | +1 555 0100', '']
+    while len(lines) < target_lines:
+        lines.append(rng.choice(SECTIONS))
+        for _ in range(rng.randint(4, 12)):
+            if rng.random() < skill_density:
+                line = f"- {rng.choice(ACTIONS)} services with {rng.choice(skills)} and {rng.choice(skills)}"
+            else:
+                line = f"- {rng.choice(FILLER)}"
+            if rng.random() < 0.3:
+                year = rng.randint(2010, 2022)
+                line += f" ({year} - {year + rng.randint(1, 3)})"
+            lines.append(line)
+        lines.append('')
+    lines = lines[:target_lines]
+
+    table = None
+    if with_table:
+        table = [('Skill', 'Years', 'Level')] + [
+            (skill, str(rng.randint(1, 10)), rng.choice(['Expert', 'Advanced', 'Intermediate']))
+            for skill in skills
+        ]
+    return lines, table, skills
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, lines, table=None):
+    """
+    Write a minimal text PDF (Helvetica, one content stream per page).
+    Table rows are laid out as fixed-width columns.
+
+    Returns:
+        int: Number of pages written
+    """
+    rendered = []
+    for line in lines:
+        while len(line) > _PDF_WRAP_CHARS:
+            rendered.append(line[:_PDF_WRAP_CHARS])
+            line = line[_PDF_WRAP_CHARS:]
+        rendered.append(line)
+    if table:
+        rendered += ['', 'SKILLS'] + ['{:<24}{:<8}{}'.format(*row) for row in table]
+
+    pages = [rendered[i:i + _PDF_LINES_PER_PAGE] for i in range(0, len(rendered), _PDF_LINES_PER_PAGE)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    objects = [None, None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for page_lines in pages:
+        ops = ['BT', '/F1 10 Tf', '14 TL', '50 750 Td']
+        ops += [f'({_pdf_escape(line)}) Tj T*' for line in page_lines]
+        ops.append('ET')
+        stream = '\n'.join(ops).encode('latin-1', 'replace')
+        objects.append(None)
+        page_ids.append(len(objects))
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        objects[page_ids[-1] - 1] = (
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (page_ids[-1] + 1)
+        )
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % page_id for page_id in page_ids), len(page_ids))
+
+    body = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b'%d 0 obj\n' % number + obj + b'\nendobj\n'
+    xref_offset = len(body)
+    body += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    body += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    body += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+
+    with open(path, 'wb') as handle:
+        handle.write(body)
+    return len(pages)
+
+
+def write_docx(path, lines, table=None):
+    """
+    Write a DOCX resume: one paragraph per line and an optional table.
+    """
+    from docx import Document
+
+    document = Document()
+    properties = document.core_properties
+    properties.created = properties.modified = _DOCX_TIMESTAMP
+    properties.last_printed = _DOCX_TIMESTAMP
+    properties.author = properties.last_modified_by = 'benchmarks'
+    properties.revision = 1
+
+    for line in lines:
+        document.add_paragraph(line)
+    if table:
+        grid = document.add_table(rows=len(table), cols=len(table[0]))
+        for row, values in zip(grid.rows, table):
+            for cell, value in zip(row.cells, values):
+                cell.text = value
+    document.save(path)
+
+    # Rewrite the zip with fixed member timestamps so bytes are reproducible
+    with zipfile.ZipFile(path) as source:
+        members = [(info.filename, source.read(info.filename)) for info in source.infolist()]
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for name, data in members:
+            target.writestr(zipfile.ZipInfo(name, _DOCX_TIMESTAMP.timetuple()[:6]), data, zipfile.ZIP_DEFLATED)
+
+
+def generate_corpus(out_dir, count=100, seed=42, formats=FORMATS, pages=(1, 2, 5),
+                    skill_densities=(0.1, 0.4), table_ratio=0.3):
+    """
+    Generate a synthetic resume corpus and its manifest.
+
+    Documents cycle through every formats x pages x skill density
+    combination, so each is represented evenly.
+
+    Args:
+        out_dir (str): Output directory (created if missing)
+        count (int): Number of documents
+        seed (int): Random seed
+        formats (iterable): 'pdf' and/or 'docx'
+        pages (iterable): Target page counts
+        skill_densities (iterable): Fractions of body lines mentioning a skill
+        table_ratio (float): Fraction of documents with a skills table
+
+    Returns:
+        dict: Manifest (parameters and one entry per document)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    combinations = [(fmt, page_count, density)
+                    for fmt in formats for page_count in pages for density in skill_densities]
+
+    documents = []
+    for index in range(count):
+        fmt, page_count, density = combinations[index % len(combinations)]
+        with_table = rng.random() < table_ratio
+        lines, table, skills = build_resume_lines(rng, page_count, density, with_table)
+
+        name = f"resume_{index:05d}.{fmt}"
+        path = os.path.join(out_dir, name)
+        if fmt == 'pdf':
+            written_pages = write_pdf(path, lines, table)
+        else:
+            write_docx(path, lines, table)
+            written_pages = None
+
+        documents.append({
+            'file': name,
+            'format': fmt,
+            'pages': written_pages,
+            'targetPages': page_count,
+            'skillDensity': density,
+            'table': with_table,
+            'skills': sorted(skills),
+            'bytes': os.path.getsize(path),
+        })
+
+    manifest = {
+        'seed': seed,
+        'count': count,
+        'formats': list(formats),
+        'pages': list(pages),
+        'skillDensities': list(skill_densities),
+        'tableRatio': table_ratio,
+        'documents': documents,
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=1)
+    return manifest
+
+
+def add_corpus_arguments(parser):
+    """
+    Register the corpus shape options on an argparse parser.
+    """
+    parser.add_argument('--count', type=int, default=100, help='Number of documents')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--formats', default='pdf,docx', help='Comma-separated formats (pdf,docx)')
+    parser.add_argument('--pages', type=_int_list, default=[1, 2, 5], help='Comma-separated page counts')
+    parser.add_argument('--skill-density', type=_float_list, default=[0.1, 0.4],
+                        help='Comma-separated fractions of lines mentioning a skill')
+    parser.add_argument('--table-ratio', type=float, default=0.3, help='Fraction of documents with a table')
+
+
+def generate_from_args(out_dir, args):
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown corpus formats: {', '.join(sorted(unknown))}")
+    return generate_corpus(out_dir, args.count, args.seed, formats, args.pages,
+                           args.skill_density, args.table_ratio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--out', required=True, help='Output directory')
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    manifest = generate_from_args(args.out, args)
+    total_bytes = sum(document['bytes'] for document in manifest['documents'])
+    print(f"Wrote {manifest['count']} resumes ({total_bytes / 1024:.0f} KiB) to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,12 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown, worker_shutdown
 import os
+import gc
+import logging
 from dotenv import load_dotenv
+from utils.queue_lanes import LANE_QUEUES, route_resume_task, lane_prefetch_multiplier
+from utils.metrics import start_metrics_server, mark_process_dead
+from utils.db import close_db
 
 # Load environment variables
 load_dotenv()
@@ -8,12 +14,23 @@ load_dotenv()
 # Get RabbitMQ URL from environment or use default
 RABBITMQ_URL = os.getenv('RABBITMQ_URL', 'amqp://localhost')
 
+# Worker processes per host (Celery defaults to one per CPU when unset).
+# Also read by utils.text_extractor to size its PDF page-extraction pool.
+WORKER_CONCURRENCY = int(os.getenv('CELERY_WORKER_CONCURRENCY', '0') or 0) or None
+
+# The task modules in include= (compiled skill matcher, ATS regexes) are
+# imported by the parent worker before the pool forks; freeze them so the
+# children share that memory copy-on-write
+WORKER_PREWARM = os.getenv('WORKER_PREWARM', 'true').lower() in ('1', 'true', 'yes')
+
+logger = logging.getLogger(__name__)
+
 # Initialize Celery app
 celery_app = Celery(
     'resume_parser',
     broker=RABBITMQ_URL,
     backend='rpc://',
-    include=['tasks.resume_tasks']
+    include=['tasks.resume_tasks', 'tasks.pipeline_tasks', 'tasks.ocr_tasks', 'tasks.job_tasks']
 )
 
 # Celery configuration
@@ -26,9 +43,19 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     worker_prefetch_multiplier=1,
-    task_routes={
+    worker_concurrency=WORKER_CONCURRENCY,
+    # parse_resume_task is routed to its lane (interactive/small/bulk) at
+    # publish time; see utils.queue_lanes
+    task_routes=(route_resume_task, {
         'tasks.parse_resume_task': {'queue': 'resume_parse_queue'},
-    },
+        'tasks.extract_text_stage': {'queue': 'resume_extract_queue'},
+        'tasks.extract_skills_stage': {'queue': 'resume_skills_queue'},
+        'tasks.score_resume_stage': {'queue': 'resume_score_queue'},
+        'tasks.ocr_resume_task': {'queue': 'resume_ocr_queue'},
+        'tasks.rank_resumes_for_job': {'queue': 'job_match_queue'},
+        'tasks.query_skill_index': {'queue': 'job_match_queue'},
+        'tasks.report_near_duplicates': {'queue': 'job_match_queue'},
+    }),
     task_default_queue='resume_parse_queue',
 )
 
@@ -36,8 +63,67 @@ celery_app.conf.update(
 from kombu import Queue
 
 celery_app.conf.task_queues = (
-    Queue('resume_parse_queue', durable=True),
+    Queue(LANE_QUEUES['interactive'], durable=True),
+    Queue(LANE_QUEUES['small'], durable=True),
+    Queue(LANE_QUEUES['bulk'], durable=True),
+    Queue('resume_extract_queue', durable=True),
+    Queue('resume_skills_queue', durable=True),
+    Queue('resume_score_queue', durable=True),
+    Queue('resume_ocr_queue', durable=True),
+    Queue('job_match_queue', durable=True),
 )
 
+
+@worker_init.connect
+def prepare_worker(sender=None, **kwargs):
+    """
+    Prepare the parent worker process before the prefork pool starts.
+    """
+    consumed = getattr(getattr(sender, 'app', celery_app).amqp.queues, 'consume_from', None)
+    if consumed:
+        # Lane workers (e.g. -Q resume_bulk_queue) use that lane's prefetch;
+        # the consumer reads it after worker_init, when its blueprint starts
+        prefetch = lane_prefetch_multiplier(consumed)
+        if prefetch and sender is not None:
+            sender.prefetch_multiplier = prefetch
+    
+    # Serve the aggregated metrics of all pool children from the parent
+    try:
+        start_metrics_server()
+    except Exception as error:
+        logger.error(f"❌ Failed to start metrics endpoint: {error}")
+    
+    if not WORKER_PREWARM:
+        return
+    
+    # Move everything allocated so far into the GC's permanent generation:
+    # collections in the children never touch these objects, so their
+    # pages stay shared instead of being copied on first GC pass
+    gc.freeze()
+    
+    logger.info(f"🧊 Froze {gc.get_freeze_count()} objects before forking pool children")
+
+
+@worker_process_shutdown.connect
+def release_child_metrics(pid=None, **kwargs):
+    """
+    Drop an exiting pool child's live metric samples.
+    """
+    mark_process_dead(pid or os.getpid())
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_worker_db(**kwargs):
+    """
+    Flush pending writes and close this process's Mongo client on shutdown
+    (pool children and, for the solo/threads pools, the worker itself).
+    """
+    try:
+        close_db()
+    except Exception as error:
+        logger.error(f"❌ Failed to close MongoDB client: {error}")
+
+
 if __name__ == '__main__':
     celery_app.start()
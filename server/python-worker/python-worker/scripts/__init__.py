@@ -0,0 +1 @@
+# Maintenance scripts for the resume worker (run from the worker root)
@@ -0,0 +1,107 @@
+"""
+Backfill: index the skills of existing resumeresults.
+
+Walks completed resumeresults in _id order and, per batch, writes one
+skillindexentries document per resume (ordinals and seqs are reserved a
+batch at a time). Resumes already indexed keep their ordinal. Then folds
+every entry into a fresh snapshot at SKILL_INDEX_PATH, so query workers
+start from it instead of reading all entries. Safe to stop and re-run
+(or continue with --after).
+
+Usage (from the python-worker directory):
+    python -m scripts.build_skill_index
+    python -m scripts.build_skill_index --batch-size 5000
+    python -m scripts.build_skill_index --snapshot-only
+"""
+
+import time
+import argparse
+from pymongo import UpdateOne
+
+from utils.db import get_db, close_db
+from utils.skill_index import (
+    SKILL_INDEX_COLLECTION, SKILL_INDEX_PATH, SkillIndex, _ensure_indexes, catch_up, reserve_counter,
+)
+from utils.skills_data import canonical_skills
+from scripts.offload_raw_text import _batches
+
+
+def backfill(db, batch_size, after=None, limit=None):
+    """
+    Write index entries for completed resumes.
+
+    Returns:
+        dict: Resumes indexed (new and updated) and the last _id
+    """
+    _ensure_indexes(db)
+    entries = db[SKILL_INDEX_COLLECTION]
+    stats = {'indexed': 0, 'new': 0, 'lastId': None}
+
+    for documents in _batches(db['resumeresults'], {'status': 'completed'}, {'skills': 1},
+                              batch_size, after, limit):
+        ids = [document['_id'] for document in documents]
+        ordinals = {entry['_id']: entry['ordinal']
+                    for entry in entries.find({'_id': {'$in': ids}}, {'ordinal': 1})}
+
+        new_ids = [resume_id for resume_id in ids if resume_id not in ordinals]
+        if new_ids:
+            first_ordinal = reserve_counter(db, 'ordinal', len(new_ids))
+            ordinals.update({resume_id: first_ordinal + offset for offset, resume_id in enumerate(new_ids)})
+        first_seq = reserve_counter(db, 'seq', len(documents))
+
+        entries.bulk_write([
+            UpdateOne(
+                {'_id': document['_id']},
+                {'$set': {'skills': canonical_skills(document.get('skills')), 'seq': first_seq + offset},
+                 '$setOnInsert': {'ordinal': ordinals[document['_id']]}},
+                upsert=True
+            )
+            for offset, document in enumerate(documents)
+        ], ordered=False)
+
+        stats['indexed'] += len(documents)
+        stats['new'] += len(new_ids)
+        stats['lastId'] = str(ids[-1])
+        print(f"  indexed {stats['indexed']} (last _id {stats['lastId']})")
+
+    return stats
+
+
+def build_snapshot(db, path=SKILL_INDEX_PATH):
+    """
+    Fold every index entry into a new snapshot.
+
+    Returns:
+        SkillIndex: The written index
+    """
+    index = SkillIndex()
+    catch_up(index, db)
+    index.save(path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--batch-size', type=int, default=2000, help='Documents per batch')
+    parser.add_argument('--after', help='Resume after this resumeresults _id')
+    parser.add_argument('--limit', type=int, help='Stop after this many documents')
+    parser.add_argument('--snapshot-only', action='store_true', help='Only rebuild the snapshot')
+    parser.add_argument('--snapshot-path', default=SKILL_INDEX_PATH, help='Snapshot file to write')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    db = get_db()
+    try:
+        if not args.snapshot_only:
+            stats = backfill(db, args.batch_size, args.after, args.limit)
+            print(f"Indexed {stats['indexed']} resumes ({stats['new']} new, last _id {stats['lastId']})")
+        index = build_snapshot(db, args.snapshot_path)
+    finally:
+        close_db()
+
+    print(f"Snapshot of {len(index)} resumes (seq {index.last_seq}) written to {args.snapshot_path} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Report clusters of near-duplicate resumes.
+
+Prints the clusters of the near-duplicate index (NEAR_DUP_BACKEND 'local'
+or 'mongo') as JSON: totals, clusters owned by a single user, and the
+largest clusters with their resume and user ids.
+
+--backfill first signs completed resumeresults from their stored text, in
+_id order (safe to stop and continue with --after). --rebuild drops
+signatures written with other NEAR_DUP_NUM_PERM / NEAR_DUP_SHINGLE_SIZE
+settings before backfilling.
+
+Usage (from the python-worker directory):
+    python -m scripts.near_duplicate_report
+    python -m scripts.near_duplicate_report --threshold 0.9 --limit 20
+    python -m scripts.near_duplicate_report --backfill --output clusters.json
+"""
+
+import os
+import json
+import time
+import argparse
+
+from utils.db import get_db, close_db
+from utils.near_duplicates import (
+    NEAR_DUP_BACKEND, NEAR_DUP_PATH, NEAR_DUP_COLLECTION, NEAR_DUP_NUM_PERM, NEAR_DUP_SHINGLE_SIZE,
+    NEAR_DUP_CLUSTER_THRESHOLD, get_near_duplicate_index, duplicate_cluster_report,
+)
+from utils.raw_text_store import load_raw_text
+from scripts.offload_raw_text import _batches
+
+
+def drop_stale_signatures(db):
+    """
+    Remove signatures written with other signature settings.
+
+    Returns:
+        int: Signatures removed (-1 when the local log was removed)
+    """
+    if NEAR_DUP_BACKEND == 'local':
+        if os.path.exists(NEAR_DUP_PATH):
+            os.replace(NEAR_DUP_PATH, NEAR_DUP_PATH + '.old')
+            return -1
+        return 0
+    return db[NEAR_DUP_COLLECTION].delete_many({'$or': [
+        {'numPerm': {'$ne': NEAR_DUP_NUM_PERM}},
+        {'shingleSize': {'$ne': NEAR_DUP_SHINGLE_SIZE}},
+    ]}).deleted_count
+
+
+def backfill(db, batch_size, after=None, limit=None):
+    """
+    Sign completed resumes from their stored text.
+
+    Returns:
+        dict: Resumes signed, resumes without stored text and the last _id
+    """
+    index = get_near_duplicate_index()
+    stats = {'signed': 0, 'noText': 0, 'lastId': None}
+
+    for documents in _batches(db['resumeresults'], {'status': 'completed'}, {'rawText': 1, 'rawTextRef': 1},
+                              batch_size, after, limit):
+        for document in documents:
+            signature = index.signature(load_raw_text(document['_id'], document))
+            if signature is None:
+                stats['noText'] += 1
+                continue
+            index.add(document['_id'], signature)
+            stats['signed'] += 1
+
+        stats['lastId'] = str(documents[-1]['_id'])
+        print(f"  signed {stats['signed']} (last _id {stats['lastId']})")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threshold', type=float, default=NEAR_DUP_CLUSTER_THRESHOLD,
+                        help='Minimum estimated similarity of a near-duplicate pair')
+    parser.add_argument('--min-size', type=int, default=2, help='Smallest cluster reported')
+    parser.add_argument('--limit', type=int, default=100, help='Clusters listed, largest first')
+    parser.add_argument('--backfill', action='store_true', help='Sign existing resumes first')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Drop signatures written with other settings before the backfill')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Documents per backfill batch')
+    parser.add_argument('--after', help='Resume the backfill after this resumeresults _id')
+    parser.add_argument('--output', help='Write the report to this file instead of stdout')
+    args = parser.parse_args()
+
+    if NEAR_DUP_BACKEND not in ('local', 'mongo'):
+        parser.error("Set NEAR_DUP_BACKEND to 'local' or 'mongo'")
+
+    start = time.perf_counter()
+    db = get_db()
+    try:
+        if args.rebuild:
+            removed = drop_stale_signatures(db)
+            print(f"Moved {NEAR_DUP_PATH} aside" if removed < 0 else f"Removed {removed} stale signatures")
+        if args.backfill:
+            stats = backfill(db, args.batch_size, args.after)
+            print(f"Signed {stats['signed']} resumes ({stats['noText']} without stored text, "
+                  f"last _id {stats['lastId']})")
+        report = duplicate_cluster_report(args.threshold, args.min_size, args.limit, db)
+    finally:
+        close_db()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(text)
+    else:
+        print(text)
+    print(f"{report['clusters']} clusters ({report['duplicates']} of {report['resumes']} resumes, "
+          f"{report['sameUserClusters']} single-user) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Backfill: move rawText of existing resumeresults into resumerawtexts.
+
+Walks resumeresults in _id order and, per batch, writes compressed side
+documents and then replaces each hot document's rawText with a
+rawTextRef. A hot document is only rewritten if its rawText is still the
+text that was copied, so a resume re-processed during the backfill keeps
+its new text. Safe to stop and re-run (or continue with --after).
+--restore moves offloaded text back inline.
+
+Usage (from the python-worker directory):
+    python -m scripts.offload_raw_text --dry-run
+    python -m scripts.offload_raw_text --batch-size 500
+    python -m scripts.offload_raw_text --restore
+"""
+
+import time
+import argparse
+from datetime import datetime, timezone
+from bson import BSON, Binary, ObjectId
+from pymongo import ReplaceOne, UpdateOne, DeleteOne
+
+from utils.db import get_db, close_db
+from utils.raw_text_store import RAW_TEXT_COLLECTION, RAW_TEXT_CODEC, compress_text, decompress_text
+
+
+def _batches(collection, query, projection, batch_size, after=None, limit=None):
+    """
+    Yield lists of documents matching query in _id order.
+    """
+    last_id = ObjectId(after) if after else None
+    seen = 0
+    while limit is None or seen < limit:
+        page_query = dict(query)
+        if last_id is not None:
+            page_query['_id'] = {'$gt': last_id}
+        size = batch_size if limit is None else min(batch_size, limit - seen)
+        documents = list(collection.find(page_query, projection).sort('_id', 1).limit(size))
+        if not documents:
+            return
+        seen += len(documents)
+        last_id = documents[-1]['_id']
+        yield documents
+
+
+def offload(db, batch_size, codec, dry_run=False, after=None, limit=None):
+    """
+    Offload inline rawText to compressed side documents.
+
+    Returns:
+        dict: Documents moved and hot document bytes before/after
+    """
+    results = db['resumeresults']
+    side = db[RAW_TEXT_COLLECTION]
+    query = {'rawText': {'$type': 'string', '$ne': ''}, 'rawTextRef': {'$in': [None, {}]}}
+    stats = {'documents': 0, 'skipped': 0, 'hotBytesBefore': 0, 'hotBytesAfter': 0,
+             'textBytes': 0, 'compressedBytes': 0, 'lastId': None}
+
+    for documents in _batches(results, query, None, batch_size, after, limit):
+        side_ops = []
+        hot_ops = []
+        for document in documents:
+            text = document['rawText']
+            data = compress_text(text, codec)
+            ref = {'collection': RAW_TEXT_COLLECTION, 'codec': codec,
+                   'length': len(text), 'compressedBytes': len(data)}
+
+            stats['hotBytesBefore'] += len(BSON.encode(document))
+            stats['hotBytesAfter'] += len(BSON.encode({**document, 'rawText': '', 'rawTextRef': ref}))
+            stats['textBytes'] += len(text.encode('utf-8'))
+            stats['compressedBytes'] += len(data)
+
+            side_ops.append(ReplaceOne(
+                {'_id': document['_id']},
+                {'codec': codec, 'data': Binary(data), 'length': len(text), 'createdAt': datetime.now(timezone.utc)},
+                upsert=True
+            ))
+            hot_ops.append(UpdateOne(
+                {'_id': document['_id'], 'rawText': text},
+                {'$set': {'rawText': '', 'rawTextRef': ref}}
+            ))
+
+        stats['lastId'] = str(documents[-1]['_id'])
+        if dry_run:
+            stats['documents'] += len(documents)
+            continue
+
+        # Side documents first, so no hot document ever points at missing text
+        side.bulk_write(side_ops, ordered=False)
+        modified = results.bulk_write(hot_ops, ordered=False).modified_count
+        stats['documents'] += modified
+        stats['skipped'] += len(documents) - modified
+        print(f"  offloaded {stats['documents']} (last _id {stats['lastId']})")
+
+    return stats
+
+
+def restore(db, batch_size, dry_run=False, after=None, limit=None):
+    """
+    Move offloaded text back onto the resumeresults documents.
+
+    Returns:
+        dict: Documents restored
+    """
+    results = db['resumeresults']
+    side = db[RAW_TEXT_COLLECTION]
+    query = {'rawTextRef': {'$type': 'object'}}
+    stats = {'documents': 0, 'missing': 0, 'lastId': None}
+
+    for documents in _batches(results, query, {'_id': 1}, batch_size, after, limit):
+        ids = [document['_id'] for document in documents]
+        texts = {entry['_id']: decompress_text(bytes(entry['data']), entry['codec'])
+                 for entry in side.find({'_id': {'$in': ids}})}
+        stats['missing'] += len(ids) - len(texts)
+        stats['lastId'] = str(ids[-1])
+        if dry_run or not texts:
+            stats['documents'] += len(texts)
+            continue
+
+        results.bulk_write([
+            UpdateOne({'_id': resume_id, 'rawTextRef': {'$type': 'object'}},
+                      {'$set': {'rawText': text, 'rawTextRef': None}})
+            for resume_id, text in texts.items()
+        ], ordered=False)
+        side.bulk_write([DeleteOne({'_id': resume_id}) for resume_id in texts], ordered=False)
+        stats['documents'] += len(texts)
+        print(f"  restored {stats['documents']} (last _id {stats['lastId']})")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--batch-size', type=int, default=500, help='Documents per batch')
+    parser.add_argument('--codec', default=RAW_TEXT_CODEC, help='Compression codec (zlib or zstd)')
+    parser.add_argument('--after', help='Resume after this resumeresults _id')
+    parser.add_argument('--limit', type=int, help='Stop after this many documents')
+    parser.add_argument('--dry-run', action='store_true', help='Report sizes without writing')
+    parser.add_argument('--restore', action='store_true', help='Move offloaded text back inline')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    db = get_db()
+    try:
+        if args.restore:
+            stats = restore(db, args.batch_size, args.dry_run, args.after, args.limit)
+        else:
+            stats = offload(db, args.batch_size, args.codec, args.dry_run, args.after, args.limit)
+    finally:
+        close_db()
+    elapsed = time.perf_counter() - start
+
+    prefix = 'Would move' if args.dry_run else ('Restored' if args.restore else 'Offloaded')
+    print(f"{prefix} {stats['documents']} documents in {elapsed:.1f}s (last _id {stats['lastId']})")
+    if not args.restore and stats['hotBytesBefore']:
+        print(f"  hot document bytes: {stats['hotBytesBefore']} -> {stats['hotBytesAfter']} "
+              f"({stats['hotBytesAfter'] / stats['hotBytesBefore']:.1%})")
+        print(f"  text bytes: {stats['textBytes']} -> {stats['compressedBytes']} compressed "
+              f"({stats['compressedBytes'] / max(stats['textBytes'], 1):.1%})")
+        if stats['skipped']:
+            print(f"  skipped {stats['skipped']} documents whose text changed during the backfill")
+    if args.restore and stats['missing']:
+        print(f"  {stats['missing']} documents had no side document")
+
+
+if __name__ == '__main__':
+    main()
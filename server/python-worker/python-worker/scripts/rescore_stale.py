@@ -0,0 +1,146 @@
+"""
+Re-score resumeresults whose scores predate the current skills
+dictionary or ATS rubric, from their stored feature vectors.
+
+Only documents with a stale skillsVersion / rubricVersion are read, and
+only their features (no uploaded files, no spaCy). A document is only
+rewritten if its versions are still the ones that were read, so a resume
+re-processed meanwhile keeps its new result. Changed skills are pushed
+to the skill index.
+
+--backfill first computes feature vectors for completed documents from
+before they were stored, from their stored text.
+
+Usage (from the python-worker directory):
+    python -m scripts.rescore_stale --dry-run
+    python -m scripts.rescore_stale --batch-size 1000
+    python -m scripts.rescore_stale --rematch-text   # dictionary gained new keywords
+    python -m scripts.rescore_stale --backfill
+"""
+
+import time
+import argparse
+from pymongo import UpdateOne
+
+from utils.db import get_db, close_db
+from utils.feature_store import (
+    STALE_QUERY, MISSING_QUERY, rescore_documents, features_from_text, feature_fields,
+)
+from utils.raw_text_store import load_raw_text
+from utils.skills_data import SKILLS_VERSION
+from utils.ats_engine import RUBRIC_VERSION
+from utils.skill_index import index_resume_skills
+from scripts.offload_raw_text import _batches
+
+_RESCORE_PROJECTION = {'skills': 1, 'features': 1, 'skillsVersion': 1, 'rubricVersion': 1, 'atsScore': 1}
+
+
+def rescore(db, batch_size, rematch_text=False, dry_run=False, after=None, limit=None):
+    """
+    Re-score stale documents from their features.
+
+    Returns:
+        dict: Documents re-scored, skipped (changed meanwhile) and score changes
+    """
+    results = db['resumeresults']
+    stats = {'documents': 0, 'skipped': 0, 'scoreChanged': 0, 'skillsChanged': 0, 'lastId': None}
+
+    for documents in _batches(results, STALE_QUERY, _RESCORE_PROJECTION, batch_size, after, limit):
+        updates = rescore_documents(documents, rematch_text)
+        stats['lastId'] = str(documents[-1]['_id'])
+        stats['scoreChanged'] += sum(1 for document, fields in updates
+                                     if fields['atsScore'] != document.get('atsScore'))
+        changed_skills = [(document['_id'], fields['skills']) for document, fields in updates
+                          if fields['skills'] != document.get('skills')]
+        stats['skillsChanged'] += len(changed_skills)
+
+        if dry_run:
+            stats['documents'] += len(updates)
+            continue
+
+        modified = results.bulk_write([
+            UpdateOne(
+                {'_id': document['_id'],
+                 'skillsVersion': document.get('skillsVersion'),
+                 'rubricVersion': document.get('rubricVersion')},
+                {'$set': fields}
+            )
+            for document, fields in updates
+        ], ordered=False).modified_count
+        stats['documents'] += modified
+        stats['skipped'] += len(updates) - modified
+
+        for resume_id, skills in changed_skills:
+            index_resume_skills(resume_id, skills)
+        print(f"  re-scored {stats['documents']} (last _id {stats['lastId']})")
+
+    return stats
+
+
+def backfill(db, batch_size, dry_run=False, after=None, limit=None):
+    """
+    Store feature vectors for completed documents that have none, from
+    their stored text and skills. Scores are left as they are; documents
+    are stamped with the versions their stored skills and scores came
+    from ('unknown'), so the next re-score refreshes them.
+
+    Returns:
+        dict: Documents backfilled and documents without stored text
+    """
+    results = db['resumeresults']
+    stats = {'documents': 0, 'noText': 0, 'lastId': None}
+
+    for documents in _batches(results, MISSING_QUERY, {'rawText': 1, 'rawTextRef': 1, 'skills': 1},
+                              batch_size, after, limit):
+        operations = []
+        for document in documents:
+            text = load_raw_text(document['_id'], document)
+            if not text:
+                stats['noText'] += 1
+                continue
+            fields = feature_fields(features_from_text(text, document.get('skills')))
+            fields['skillsVersion'] = fields['rubricVersion'] = 'unknown'
+            operations.append(UpdateOne({**MISSING_QUERY, '_id': document['_id']}, {'$set': fields}))
+
+        stats['lastId'] = str(documents[-1]['_id'])
+        if not dry_run and operations:
+            results.bulk_write(operations, ordered=False)
+        stats['documents'] += len(operations)
+        print(f"  backfilled {stats['documents']} (last _id {stats['lastId']})")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--batch-size', type=int, default=1000, help='Documents per batch')
+    parser.add_argument('--rematch-text', action='store_true',
+                        help='Rematch skills from stored text on a dictionary change')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Store features for documents from before they were stored, then re-score')
+    parser.add_argument('--after', help='Resume after this resumeresults _id')
+    parser.add_argument('--limit', type=int, help='Stop after this many documents')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    db = get_db()
+    try:
+        if args.backfill:
+            stats = backfill(db, args.batch_size, args.dry_run, args.after, args.limit)
+            print(f"Backfilled features of {stats['documents']} documents "
+                  f"({stats['noText']} without stored text)")
+        stats = rescore(db, args.batch_size, args.rematch_text, args.dry_run, args.after, args.limit)
+    finally:
+        close_db()
+
+    prefix = 'Would re-score' if args.dry_run else 'Re-scored'
+    print(f"{prefix} {stats['documents']} documents to skills {SKILLS_VERSION} / rubric {RUBRIC_VERSION} "
+          f"in {time.perf_counter() - start:.1f}s (last _id {stats['lastId']})")
+    print(f"  {stats['scoreChanged']} score changes, {stats['skillsChanged']} skill list changes")
+    if stats['skipped']:
+        print(f"  skipped {stats['skipped']} documents re-processed during the run")
+
+
+if __name__ == '__main__':
+    main()
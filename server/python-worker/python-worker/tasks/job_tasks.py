@@ -0,0 +1,129 @@
+from celery_app import celery_app
+from utils.job_matcher import match_job_description, JOB_MATCH_DEFAULT_TOP_K
+from utils.skill_index import query_skill_index
+from utils.near_duplicates import duplicate_cluster_report, NEAR_DUP_CLUSTER_THRESHOLD
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='tasks.rank_resumes_for_job')
+def rank_resumes_for_job_task(message):
+    """
+    Celery task ranking stored resumes against a job description.
+    Runs on job_match_queue, so rankings never wait behind resume parsing.
+
+    Args:
+        message (dict): Message containing:
+            - jobDescription: Job description text
+            - requiredSkills (optional): Extra dictionary skills to require
+            - topK (optional): Number of resumes to return (default 20)
+            - minScore (optional): Drop resumes scoring below this
+            - userIds (optional): Only rank these users' resumes
+
+    Returns:
+        dict: Status dictionary with requiredSkills, candidates and matches
+    """
+    task_start = time.perf_counter()
+
+    try:
+        query = None
+        if message.get('userIds'):
+            from bson import ObjectId
+            query = {'userId': {'$in': [ObjectId(user_id) for user_id in message['userIds']]}}
+
+        result = match_job_description(
+            message.get('jobDescription') or '',
+            required_skills=message.get('requiredSkills'),
+            top_k=int(message.get('topK') or JOB_MATCH_DEFAULT_TOP_K),
+            min_score=message.get('minScore'),
+            query=query
+        )
+
+        logger.info(
+            "✅ Job match: %d of %d resumes returned in %.2fs",
+            len(result['matches']), result['candidates'], time.perf_counter() - task_start
+        )
+        return {"status": "completed", **result}
+
+    except Exception as error:
+        logger.error(f"❌ Job match failed: {error}")
+        return {
+            "status": "failed",
+            "error": str(error)
+        }
+
+
+@celery_app.task(name='tasks.query_skill_index')
+def query_skill_index_task(message):
+    """
+    Celery task answering a boolean / threshold skill query from the
+    inverted skill index (no resumeresults scan).
+
+    Args:
+        message (dict): Message containing any of:
+            - allOf: Skills a resume must have
+            - anyOf: Skills of which a resume must have at least one
+            - noneOf: Skills a resume must not have
+            - atLeast: {"k": int, "skills": [...]} - at least k of skills
+            - limit (optional): Resume ids returned (default 100)
+            - offset (optional): Resume ids skipped (default 0)
+
+    Returns:
+        dict: Status dictionary with count, resumeIds and tookMs
+    """
+    try:
+        at_least = message.get('atLeast')
+        result = query_skill_index(
+            all_of=message.get('allOf'),
+            any_of=message.get('anyOf'),
+            none_of=message.get('noneOf'),
+            at_least=(at_least['k'], at_least['skills']) if at_least else None,
+            limit=int(message.get('limit') or 100),
+            offset=int(message.get('offset') or 0)
+        )
+        logger.info("✅ Skill query: %d resumes in %.2fms", result['count'], result['tookMs'])
+        return {"status": "completed", **result}
+
+    except Exception as error:
+        logger.error(f"❌ Skill query failed: {error}")
+        return {
+            "status": "failed",
+            "error": str(error)
+        }
+
+
+@celery_app.task(name='tasks.report_near_duplicates')
+def report_near_duplicates_task(message=None):
+    """
+    Celery task reporting clusters of near-duplicate resumes from the
+    near-duplicate index (see utils.near_duplicates).
+
+    Args:
+        message (dict, optional): Message containing any of:
+            - threshold: Minimum estimated similarity (default
+              NEAR_DUP_CLUSTER_THRESHOLD)
+            - minSize: Smallest cluster reported (default 2)
+            - limit: Clusters listed, largest first (default 100)
+
+    Returns:
+        dict: Status dictionary with cluster totals and topClusters
+    """
+    message = message or {}
+    try:
+        result = duplicate_cluster_report(
+            threshold=float(message.get('threshold') or NEAR_DUP_CLUSTER_THRESHOLD),
+            min_size=int(message.get('minSize') or 2),
+            limit=int(message.get('limit') or 100)
+        )
+        logger.info("✅ Near-duplicate report: %d clusters over %d resumes in %.2fms",
+                    result['clusters'], result['resumes'], result['tookMs'])
+        return {"status": "completed", **result}
+
+    except Exception as error:
+        logger.error(f"❌ Near-duplicate report failed: {error}")
+        return {
+            "status": "failed",
+            "error": str(error)
+        }
@@ -0,0 +1,109 @@
+from celery_app import celery_app
+from celery import chain
+from utils.db import get_bulk_writer
+from utils.blob_store import get_blob_store
+from utils.text_extractor import clean_text
+from utils.metrics import time_stage, observe_document
+from utils.ocr import ocr_document
+from tasks.resume_tasks import RESUME_PIPELINE_MODE, match_near_duplicate, remember_near_duplicate
+from tasks.pipeline_tasks import extract_skills_stage, score_resume_stage, _fail_stage
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# OCR lane. Resumes whose extraction raised OcrRequired (image uploads and
+# PDFs left without a usable text layer by image-only pages, see
+# utils.ocr.needs_ocr) are handed to
+# resume_ocr_queue by parse_resume_task or extract_text_stage, so a worker
+# pool of their own absorbs the slow OCR. After OCR the resume joins the
+# regular stages: chained onto the skills and score queues in 'staged'
+# mode, run inline (as parse_resume_task would) in 'single' mode.
+
+
+def start_ocr(message, ocr_required, cache_key=None):
+    """
+    Hand a resume to the OCR queue.
+
+    Args:
+        message (dict): parse_resume_task message or pipeline payload
+            (resumeId, userId, filePath, optional blobKey)
+        ocr_required (OcrRequired): What extraction found
+        cache_key (str, optional): Result cache key to store the final result under
+
+    Returns:
+        AsyncResult: Result of the OCR task
+    """
+    payload = {
+        'resumeId': message.get('resumeId'),
+        'userId': message.get('userId'),
+        'filePath': message.get('filePath'),
+        'blobKey': message.get('blobKey'),
+        'cacheKey': cache_key,
+        'ocrPages': ocr_required.pages,
+        'pageTexts': ocr_required.page_texts
+    }
+
+    get_bulk_writer('resumeresults').update(payload['resumeId'], {'status': 'ocr_queued'})
+    return ocr_resume_task.apply_async(args=[payload])
+
+
+@celery_app.task(name='tasks.ocr_resume_task')
+def ocr_resume_task(payload):
+    """
+    OCR a resume, then run skill extraction and scoring on its text.
+
+    Args:
+        payload (dict): Output of start_ocr
+
+    Returns:
+        dict: Status dictionary like parse_resume_task's ('queued' when the
+            staged pipeline continues), or a failure payload
+    """
+    resume_id = payload.get('resumeId')
+    task_start = time.perf_counter()
+
+    try:
+        file_path = payload.get('filePath')
+        blob_key = payload.get('blobKey')
+        _, ext = os.path.splitext(blob_key or file_path)
+        ext = ext.lower()
+
+        get_bulk_writer('resumeresults').update(resume_id, {'status': 'processing'})
+
+        if blob_key:
+            with get_blob_store().open(blob_key) as buffer:
+                raw_text = ocr_document(buffer, ext, payload.get('ocrPages'), payload.get('pageTexts'))
+        else:
+            raw_text = ocr_document(file_path, ext, payload.get('ocrPages'), payload.get('pageTexts'))
+
+        with time_stage('clean_text'):
+            extracted_text = clean_text(raw_text)
+        if not extracted_text:
+            raise ValueError("No text could be extracted from the resume (OCR found no readable text)")
+        observe_document(chars=len(extracted_text))
+        logger.info("🔎 Resume %s OCRed: %d characters in %.2fs",
+                    resume_id, len(extracted_text), time.perf_counter() - task_start)
+
+        signature, reused = match_near_duplicate(extracted_text, resume_id)
+        remember_near_duplicate(resume_id, signature)
+        get_bulk_writer('resumeresults').update(resume_id, {'status': 'text_extracted'})
+
+        stage_payload = {
+            'resumeId': resume_id,
+            'userId': payload.get('userId'),
+            'filePath': file_path,
+            'blobKey': blob_key,
+            'cacheKey': payload.get('cacheKey'),
+            'rawText': extracted_text,
+            **({'reused': reused} if reused else {})
+        }
+
+        if RESUME_PIPELINE_MODE == 'staged':
+            chain(extract_skills_stage.s(stage_payload), score_resume_stage.s()).apply_async()
+            return {"status": "queued", "resumeId": resume_id}
+
+        return score_resume_stage(extract_skills_stage(stage_payload))
+    except Exception as error:
+        return _fail_stage(payload, error)
@@ -0,0 +1,205 @@
+from celery_app import celery_app
+from celery import chain
+from utils.db import get_bulk_writer
+from utils.result_cache import get_result_cache
+from utils.metrics import record_task, record_failure
+from utils.raw_text_store import raw_text_fields
+from utils.skill_index import index_resume_skills
+from utils.feature_store import feature_fields
+from utils.ocr import OcrRequired
+from tasks.resume_tasks import (
+    extract_resume_text, detect_resume_skills, score_resume, match_near_duplicate, remember_near_duplicate,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Staged resume pipeline. Each stage runs on its own queue so workers can
+# be sized to that stage's bottleneck:
+#   resume_extract_queue - PDF/DOCX extraction (I/O and CPU heavy)
+#   resume_skills_queue  - skill matching (CPU, light)
+#   resume_score_queue   - ATS scoring and persistence (light)
+# Every stage records its intermediate status on the ResumeResult document.
+# A failed stage marks the resume 'failed' and later stages pass it through.
+# A near-duplicate of an analyzed resume carries that resume's result from
+# the extract stage ('reused') and skips skill extraction and scoring.
+# A scan or image goes from the extract stage to the OCR queue, which
+# chains the skills and score stages itself (see tasks.ocr_tasks).
+
+
+def start_resume_pipeline(message, cache_key=None):
+    """
+    Start the staged pipeline for a resume.
+
+    Args:
+        message (dict): parse_resume_task message (resumeId, userId, filePath,
+            optional blobKey)
+        cache_key (str, optional): Result cache key to store the final result under
+
+    Returns:
+        AsyncResult: Result of the last stage
+    """
+    payload = {
+        'resumeId': message.get('resumeId'),
+        'userId': message.get('userId'),
+        'filePath': message.get('filePath'),
+        'blobKey': message.get('blobKey'),
+        'cacheKey': cache_key
+    }
+
+    return chain(
+        extract_text_stage.s(payload),
+        extract_skills_stage.s(),
+        score_resume_stage.s()
+    ).apply_async()
+
+
+def _fail_stage(payload, error):
+    """
+    Record a stage failure and build the payload passed to later stages.
+    """
+    if isinstance(error, FileNotFoundError):
+        message = f"File not found: {str(error)}"
+    elif isinstance(error, NotImplementedError):
+        message = f"Unsupported file format: {str(error)}"
+    else:
+        message = str(error)
+
+    record_failure(error)
+    logger.error(f"❌ Resume pipeline stage failed: {message}")
+
+    try:
+        get_bulk_writer('resumeresults').update(payload['resumeId'], {
+            'status': 'failed',
+            'error': message
+        })
+    except Exception as db_error:
+        logger.error(f"❌ Failed to update database with error status: {db_error}")
+
+    return {
+        'status': 'failed',
+        'resumeId': payload.get('resumeId'),
+        'error': message
+    }
+
+
+@celery_app.task(name='tasks.extract_text_stage')
+def extract_text_stage(payload):
+    """
+    Stage 1: extract and clean the resume text.
+
+    Args:
+        payload (dict): resumeId, userId, filePath, blobKey, cacheKey
+
+    Returns:
+        dict: payload plus rawText (and reused, for a near-duplicate), an
+            'ocr_queued' payload, or a failure payload
+    """
+    try:
+        extracted_text = extract_resume_text(payload.get('filePath'), payload.get('blobKey'))
+        signature, reused = match_near_duplicate(extracted_text, payload['resumeId'])
+        remember_near_duplicate(payload['resumeId'], signature)
+        get_bulk_writer('resumeresults').update(payload['resumeId'], {'status': 'text_extracted'})
+        if reused:
+            return {**payload, 'rawText': extracted_text, 'reused': reused}
+        return {**payload, 'rawText': extracted_text}
+    except OcrRequired as ocr_required:
+        try:
+            from tasks.ocr_tasks import start_ocr
+            start_ocr(payload, ocr_required, payload.get('cacheKey'))
+        except Exception as error:
+            return _fail_stage(payload, error)
+        logger.info("📨 Resume %s handed off to OCR queue: %s", payload['resumeId'], ocr_required)
+        return {'status': 'ocr_queued', 'resumeId': payload['resumeId']}
+    except Exception as error:
+        return _fail_stage(payload, error)
+
+
+@celery_app.task(name='tasks.extract_skills_stage')
+def extract_skills_stage(payload):
+    """
+    Stage 2: detect skills in the extracted text.
+
+    Args:
+        payload (dict): Output of extract_text_stage
+
+    Returns:
+        dict: payload plus skills, or a failure payload
+    """
+    if payload.get('status') in ('failed', 'ocr_queued') or payload.get('reused'):
+        return payload
+
+    try:
+        detected_skills = detect_resume_skills(payload['rawText'])
+        get_bulk_writer('resumeresults').update(payload['resumeId'], {'status': 'skills_extracted'})
+        return {**payload, 'skills': detected_skills}
+    except Exception as error:
+        return _fail_stage(payload, error)
+
+
+@celery_app.task(name='tasks.score_resume_stage')
+def score_resume_stage(payload):
+    """
+    Stage 3: calculate the ATS score and persist the complete result.
+
+    Args:
+        payload (dict): Output of extract_skills_stage
+
+    Returns:
+        dict: Status dictionary like parse_resume_task's
+    """
+    if payload.get('status') in ('failed', 'ocr_queued'):
+        return payload
+
+    try:
+        extracted_text = payload['rawText']
+        if payload.get('reused'):
+            analysis = {'rawText': extracted_text, **payload['reused']}
+            detected_skills = analysis['skills']
+        else:
+            detected_skills = payload['skills']
+            ats_result = score_resume(extracted_text, detected_skills)
+
+            analysis = {
+                'rawText': extracted_text,
+                'skills': detected_skills,
+                'atsScore': ats_result['atsScore'],
+                'missingSkills': ats_result['missingSkills'],
+                'scoringBreakdown': ats_result['scoringBreakdown'],
+                'features': ats_result['features']
+            }
+
+        get_bulk_writer('resumeresults').update(payload['resumeId'], {
+            'status': 'completed',
+            **analysis,
+            **raw_text_fields(payload['resumeId'], extracted_text),
+            **feature_fields(analysis['features'])
+        })
+
+        if payload.get('cacheKey'):
+            try:
+                get_result_cache().set(payload['cacheKey'], analysis)
+            except Exception as cache_error:
+                logger.error(f"❌ Failed to store cached result: {cache_error}")
+
+        try:
+            index_resume_skills(payload['resumeId'], detected_skills)
+        except Exception as index_error:
+            logger.error(f"❌ Failed to index resume skills: {index_error}")
+
+        record_task('near_duplicate' if analysis.get('duplicateOf') else 'completed')
+        logger.info("✅ Resume %s completed by staged pipeline: ATS %s/100", payload['resumeId'], analysis['atsScore'])
+
+        return {
+            "status": "completed",
+            "resumeId": payload['resumeId'],
+            "textLength": len(extracted_text),
+            "wordCount": len(extracted_text.split()),
+            "skillsCount": len(detected_skills),
+            "skills": detected_skills,
+            "atsScore": analysis['atsScore'],
+            "scoringBreakdown": analysis['scoringBreakdown'],
+            "duplicateOf": analysis.get('duplicateOf')
+        }
+    except Exception as error:
+        return _fail_stage(payload, error)
@@ -1,160 +1,356 @@
 from celery_app import celery_app
-from utils.db import get_db
-from utils.text_extractor import extract_text
-from bson import ObjectId
+from celery.signals import task_postrun
+from utils.db import get_bulk_writer, flush_bulk_writers
+from utils.extraction_sandbox import sandboxed_extract_text
+from utils.ocr import OcrRequired
+from utils.result_cache import get_result_cache, build_cache_key, cache_key_from_digest
+from utils.blob_store import get_blob_store, parse_blob_key
+from utils.metrics import time_stage, observe_document, record_task, record_failure
+from utils.raw_text_store import raw_text_fields
+from utils.skill_index import index_resume_skills
+from utils.feature_store import build_feature_vector, feature_fields
+from utils.near_duplicates import get_near_duplicate_index, find_reusable_result, remember_signature
 import logging
+import time
 import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 'single': parse_resume_task runs extraction, skills and scoring itself
+# 'staged': parse_resume_task chains one task per stage on its own queue
+# (see tasks.pipeline_tasks) so each worker pool can be sized separately
+RESUME_PIPELINE_MODE = os.getenv('RESUME_PIPELINE_MODE', 'single').lower()
+
+
+def extract_resume_text(file_path, blob_key=None):
+    """
+    Extract and clean the text of a resume file, in the extraction sandbox
+    (see utils.extraction_sandbox) when enabled.
+    
+    Args:
+        file_path (str): Path to the resume file (ignored when blob_key is given)
+        blob_key (str, optional): Blob store key; the blob is parsed from
+            memory without a temporary file
+    
+    Returns:
+        str: Cleaned resume text
+    
+    Raises:
+        ValueError: If no text could be extracted
+        ExtractionLimitExceeded: If extraction broke a sandbox limit
+        OcrRequired: If the resume must go through the OCR queue
+    """
+    # Detect file extension
+    _, ext = os.path.splitext(blob_key or file_path)
+    ext = ext.lower()
+    logger.debug("🔍 File type detected: %s", ext)
+    
+    # Extract text from resume
+    logger.debug("📝 Starting text extraction...")
+    if blob_key:
+        with get_blob_store().open(blob_key) as buffer:
+            size_bytes = len(buffer)
+            extracted_text = sandboxed_extract_text(buffer, ext)
+    else:
+        size_bytes = os.path.getsize(file_path)
+        extracted_text = sandboxed_extract_text(file_path)
+    
+    if not extracted_text or len(extracted_text.strip()) == 0:
+        raise ValueError("No text could be extracted from the resume")
+    
+    observe_document(ext.lstrip('.'), size_bytes=size_bytes, chars=len(extracted_text))
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("✅ Text extraction successful!")
+        logger.debug(f"📊 Extracted {len(extracted_text)} characters")
+        logger.debug(f"📊 Extracted {len(extracted_text.split())} words")
+    
+    return extracted_text
+
+
+def detect_resume_skills(extracted_text):
+    """
+    Detect dictionary skills in resume text.
+    
+    Args:
+        extracted_text (str): Cleaned resume text
+    
+    Returns:
+        list: Detected skills
+    """
+    # =====================================================
+    # SKILL EXTRACTION (STEP 5)
+    # =====================================================
+    logger.debug("🔍 STARTING SKILL EXTRACTION")
+    
+    from utils.skills_extractor import extract_skills
+    
+    # Extract skills from text
+    detected_skills = extract_skills(extracted_text)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"📊 Detected {len(detected_skills)} skills")
+        if detected_skills:
+            logger.debug(f"🎯 Skills: {', '.join(detected_skills[:15])}{'...' if len(detected_skills) > 15 else ''}")
+        else:
+            logger.debug("ℹ️  No skills detected in resume")
+    
+    return detected_skills
+
+
+def score_resume(extracted_text, detected_skills):
+    """
+    Calculate the ATS score for a resume.
+    
+    Args:
+        extracted_text (str): Cleaned resume text
+        detected_skills (list): Detected skills
+    
+    Returns:
+        dict: calculate_ats_score result plus the resume's feature vector
+            ("features", see utils.feature_store)
+    """
+    # =====================================================
+    # ATS SCORING (STEP 6)
+    # =====================================================
+    logger.debug("🎯 STARTING ATS SCORING")
+    
+    from utils.ats_engine import calculate_ats_score, extract_ats_features
+    
+    # Calculate ATS score, keeping the features it was computed from
+    with time_stage('ats_score'):
+        features = extract_ats_features(extracted_text)
+        ats_result = calculate_ats_score(extracted_text, detected_skills, features)
+        ats_result['features'] = build_feature_vector(detected_skills, features)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        scoring_breakdown = ats_result['scoringBreakdown']
+        missing_skills = ats_result['missingSkills']
+        logger.debug(f"✅ ATS scoring completed: {ats_result['atsScore']}/100")
+        logger.debug(f"   - Skills: {scoring_breakdown['skillScore']}/40")
+        logger.debug(f"   - Experience: {scoring_breakdown['experienceScore']}/25")
+        logger.debug(f"   - Education: {scoring_breakdown['educationScore']}/15")
+        logger.debug(f"   - Formatting: {scoring_breakdown['formatScore']}/20")
+        if missing_skills:
+            logger.debug(f"⚠️  Missing common skills: {', '.join(missing_skills[:5])}{'...' if len(missing_skills) > 5 else ''}")
+    
+    return ats_result
+
+
+def match_near_duplicate(extracted_text, resume_id=None):
+    """
+    Sign a resume text and look for a near-duplicate whose result can be
+    reused (see utils.near_duplicates). Never fails the analysis.
+    
+    Args:
+        extracted_text (str): Cleaned resume text
+        resume_id (str, optional): The resume being analyzed
+    
+    Returns:
+        tuple: (signature or None, reusable result or None)
+    """
+    signature = None
+    try:
+        with time_stage('minhash'):
+            signature = get_near_duplicate_index().signature(extracted_text)
+        with time_stage('near_dup_lookup'):
+            return signature, find_reusable_result(signature, resume_id)
+    except Exception as error:
+        logger.error(f"❌ Near-duplicate lookup failed: {error}")
+        return signature, None
+
+
+def remember_near_duplicate(resume_id, signature=None, extracted_text=None):
+    """
+    Add a resume to the near-duplicate index, signing extracted_text if no
+    signature is given. Never fails the task.
+    """
+    try:
+        if signature is None and extracted_text:
+            signature = get_near_duplicate_index().signature(extracted_text)
+        remember_signature(resume_id, signature)
+    except Exception as error:
+        logger.error(f"❌ Failed to index resume signature: {error}")
+
+
+def analyze_resume(file_path, blob_key=None, resume_id=None):
+    """
+    Extract text, detect skills and calculate the ATS score for a resume file.
+    A near-duplicate of an analyzed resume reuses that resume's result.
+    
+    Args:
+        file_path (str): Path to the resume file
+        blob_key (str, optional): Blob store key read instead of file_path
+        resume_id (str, optional): ResumeResult _id, for near-duplicate detection
+    
+    Returns:
+        dict: rawText, skills, atsScore, missingSkills, scoringBreakdown and
+            features (plus duplicateOf when a result was reused)
+    
+    Raises:
+        ValueError: If no text could be extracted
+    """
+    extracted_text = extract_resume_text(file_path, blob_key)
+    signature, reused = match_near_duplicate(extracted_text, resume_id)
+    
+    if reused:
+        logger.info("♻️  Near-duplicate of %s (similarity %.2f): reusing its result",
+                    reused['duplicateOf']['resumeId'], reused['duplicateOf']['similarity'])
+        analysis = {'rawText': extracted_text, **reused}
+    else:
+        detected_skills = detect_resume_skills(extracted_text)
+        ats_result = score_resume(extracted_text, detected_skills)
+        analysis = {
+            'rawText': extracted_text,
+            'skills': detected_skills,
+            'atsScore': ats_result['atsScore'],
+            'missingSkills': ats_result['missingSkills'],
+            'scoringBreakdown': ats_result['scoringBreakdown'],
+            'features': ats_result['features']
+        }
+    
+    remember_near_duplicate(resume_id, signature)
+    return analysis
+
 
 @celery_app.task(name='tasks.parse_resume_task', bind=True)
 def parse_resume_task(self, message):
     """
-    Celery task to extract text from resume files (PDF/DOCX).
-    Extracts raw text and updates MongoDB with results.
+    Celery task to analyze an uploaded resume (PDF/DOCX) and store the result.
     
-    NO SKILLS EXTRACTION
-    NO NLP ANALYSIS
-    NO ATS SCORING
+    In 'single' mode the task runs analyze_resume itself:
+    extract_resume_text -> match_near_duplicate -> detect_resume_skills ->
+    score_resume (skipped when a near-duplicate's result is reused), then
+    queues the result on the bulk writer. In 'staged' mode it hands the
+    resume to the per-stage queues instead (see tasks.pipeline_tasks).
+    Byte-identical uploads reuse the result cache; scans and images are
+    handed to the OCR queue.
     
     Args:
         message (dict): Message containing:
             - resumeId: MongoDB ObjectId of ResumeResult document
             - userId: MongoDB ObjectId of User
             - filePath: Path to uploaded resume file
+            - blobKey (optional): Blob store key, used instead of filePath
+              so the worker needs no access to the upload filesystem
+            - lane (optional): 'interactive', 'small' or 'bulk' queue lane
     
     Returns:
-        dict: Status dictionary with extraction results
+        dict: Status dictionary with the analysis results ('queued' when
+            handed to the staged pipeline or the OCR queue)
     """
     resume_id = None
-    db = None
-    resume_results_collection = None
+    resume_results_writer = None
+    task_start = time.perf_counter()
     
     try:
-        # Log received message
-        logger.info("="*60)
-        logger.info(f"📩 RECEIVED RESUME PARSING TASK")
-        logger.info(f"Task ID: {self.request.id}")
-        logger.info("="*60)
-        
         # Extract message fields
         resume_id = message.get('resumeId')
         user_id = message.get('userId')
         file_path = message.get('filePath')
+        blob_key = message.get('blobKey')
         
-        logger.info(f"📋 Resume ID: {resume_id}")
-        logger.info(f"👤 User ID: {user_id}")
-        logger.info(f"📁 File Path: {file_path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📩 RECEIVED RESUME PARSING TASK {self.request.id}")
+            logger.debug(f"📋 Resume ID: {resume_id}")
+            logger.debug(f"👤 User ID: {user_id}")
+            logger.debug(f"📁 File Path: {file_path}")
+            logger.debug(f"🗃️  Blob Key: {blob_key}")
         
         # Validate inputs
-        if not resume_id or not file_path:
-            raise ValueError("Missing required fields: resumeId or filePath")
+        if not resume_id or not (file_path or blob_key):
+            raise ValueError("Missing required fields: resumeId or filePath/blobKey")
+        if blob_key:
+            digest, _ = parse_blob_key(blob_key)
         
-        # Connect to MongoDB
-        db = get_db()
-        resume_results_collection = db['resumeresults']
+        # Status and result updates are written behind and flushed in bulk;
+        # everything queued by this task is flushed when it finishes
+        resume_results_writer = get_bulk_writer('resumeresults')
         
         # Update status to 'processing'
-        logger.info("🔄 Updating status to 'processing'...")
-        resume_results_collection.update_one(
-            {'_id': ObjectId(resume_id)},
-            {'$set': {'status': 'processing'}}
-        )
+        logger.debug("🔄 Updating status to 'processing'...")
+        resume_results_writer.update(resume_id, {'status': 'processing'})
         
         # Check if file exists
-        if not os.path.exists(file_path):
+        if blob_key:
+            if not get_blob_store().exists(blob_key):
+                raise FileNotFoundError(f"Resume blob not found: {blob_key}")
+        elif not os.path.exists(file_path):
             raise FileNotFoundError(f"Resume file not found: {file_path}")
         
-        # Detect file extension
-        _, ext = os.path.splitext(file_path)
-        ext = ext.lower()
-        logger.info(f"🔍 File type detected: {ext}")
-        
-        # Extract text from resume
-        logger.info("📝 Starting text extraction...")
-        extracted_text = extract_text(file_path)
-        
-        if not extracted_text or len(extracted_text.strip()) == 0:
-            raise ValueError("No text could be extracted from the resume")
-        
-        logger.info(f"✅ Text extraction successful!")
-        logger.info(f"📊 Extracted {len(extracted_text)} characters")
-        logger.info(f"📊 Extracted {len(extracted_text.split())} words")
-        
-        # =====================================================
-        # SKILL EXTRACTION (STEP 5)
-        # =====================================================
-        logger.info("="*60)
-        logger.info("🔍 STARTING SKILL EXTRACTION")
-        logger.info("="*60)
-        
-        from utils.skills_extractor import extract_skills
-        
-        # Extract skills from text
-        detected_skills = extract_skills(extracted_text)
-        
-        logger.info(f"✅ Skill extraction completed")
-        logger.info(f"📊 Detected {len(detected_skills)} skills")
-        
-        if detected_skills:
-            logger.info(f"🎯 Skills: {', '.join(detected_skills[:15])}{'...' if len(detected_skills) > 15 else ''}")
+        # Reuse results for byte-identical uploads; concurrent identical
+        # uploads are coalesced so only one worker analyzes the file.
+        # Blob keys already carry the content hash
+        result_cache = get_result_cache()
+        if result_cache.name == 'none':
+            cache_key = None
+        elif blob_key:
+            cache_key = cache_key_from_digest(digest)
         else:
-            logger.info("ℹ️  No skills detected in resume")
-        
-        # =====================================================
-        # ATS SCORING (STEP 6)
-        # =====================================================
-        logger.info("="*60)
-        logger.info("🎯 STARTING ATS SCORING")
-        logger.info("="*60)
-        
-        from utils.ats_engine import calculate_ats_score
-        
-        # Calculate ATS score
-        ats_result = calculate_ats_score(extracted_text, detected_skills)
-        
-        ats_score = ats_result['atsScore']
-        missing_skills = ats_result['missingSkills']
-        scoring_breakdown = ats_result['scoringBreakdown']
-        
-        logger.info(f"✅ ATS scoring completed: {ats_score}/100")
-        logger.info(f"📊 Scoring breakdown:")
-        logger.info(f"   - Skills: {scoring_breakdown['skillScore']}/40")
-        logger.info(f"   - Experience: {scoring_breakdown['experienceScore']}/25")
-        logger.info(f"   - Education: {scoring_breakdown['educationScore']}/15")
-        logger.info(f"   - Formatting: {scoring_breakdown['formatScore']}/20")
-        
-        if missing_skills:
-            logger.info(f"⚠️  Missing common skills: {', '.join(missing_skills[:5])}{'...' if len(missing_skills) > 5 else ''}")
-        
-        # Update MongoDB with complete results
-        logger.info("💾 Updating database with complete results...")
-        update_result = resume_results_collection.update_one(
-            {'_id': ObjectId(resume_id)},
-            {
-                '$set': {
-                    'status': 'completed',
-                    'rawText': extracted_text,
-                    'skills': detected_skills,
-                    'atsScore': ats_score,
-                    'missingSkills': missing_skills,
-                    'scoringBreakdown': scoring_breakdown
+            cache_key = build_cache_key(file_path)
+        
+        if RESUME_PIPELINE_MODE == 'staged':
+            analysis = result_cache.get(cache_key) if cache_key else None
+            
+            if analysis is None:
+                # Hand the resume to the extract -> skills -> score stage queues
+                from tasks.pipeline_tasks import start_resume_pipeline
+                start_resume_pipeline(message, cache_key)
+                logger.info("📨 Resume %s handed off to staged pipeline", resume_id)
+                record_task('queued')
+                return {
+                    "status": "queued",
+                    "resumeId": resume_id,
+                    "taskId": self.request.id
                 }
-            }
-        )
-        
-        if update_result.modified_count > 0:
-            logger.info("✅ Database updated successfully")
+            
+            logger.info("♻️  Result cache hit (%s): skipping analysis", result_cache.name)
+            cache_hit = True
+        elif cache_key:
+            analysis, cache_hit = result_cache.get_or_compute(cache_key, lambda: analyze_resume(file_path, blob_key, resume_id))
+            if cache_hit:
+                logger.info("♻️  Result cache hit (%s): skipping analysis", result_cache.name)
         else:
-            logger.warning("⚠️  Database update returned 0 modified count")
-        
-        # Log success
-        logger.info("="*60)
-        logger.info("✅ RESUME PROCESSING COMPLETED")
-        logger.info("="*60)
+            analysis = analyze_resume(file_path, blob_key, resume_id)
+            cache_hit = False
+        
+        extracted_text = analysis['rawText']
+        detected_skills = analysis['skills']
+        ats_score = analysis['atsScore']
+        missing_skills = analysis['missingSkills']
+        scoring_breakdown = analysis['scoringBreakdown']
+        
+        # Update MongoDB with complete results (the text itself may be
+        # offloaded to a compressed side document, see utils.raw_text_store)
+        # and the versioned features they were scored from
+        logger.debug("💾 Updating database with complete results...")
+        resume_results_writer.update(resume_id, {
+            'status': 'completed',
+            **raw_text_fields(resume_id, extracted_text),
+            'skills': detected_skills,
+            'atsScore': ats_score,
+            'missingSkills': missing_skills,
+            'scoringBreakdown': scoring_breakdown,
+            **(feature_fields(analysis['features']) if analysis.get('features') else {}),
+            **({'duplicateOf': analysis['duplicateOf']} if analysis.get('duplicateOf') else {})
+        })
+        
+        # Make the resume findable by skill queries (see utils.skill_index)
+        try:
+            index_resume_skills(resume_id, detected_skills)
+        except Exception as index_error:
+            logger.error(f"❌ Failed to index resume skills: {index_error}")
+        
+        if cache_hit:
+            # Byte-identical copies still belong to the original's duplicate cluster
+            remember_near_duplicate(resume_id, extracted_text=extracted_text)
+            record_task('cached')
+        else:
+            record_task('near_duplicate' if analysis.get('duplicateOf') else 'completed')
+        logger.info("✅ Resume %s completed: ATS %s/100, %d skills in %.2fs",
+                    resume_id, ats_score, len(detected_skills), time.perf_counter() - task_start)
         
         return {
             "status": "completed",
@@ -165,25 +361,42 @@ def parse_resume_task(self, message):
             "skillsCount": len(detected_skills),
             "skills": detected_skills,
             "atsScore": ats_score,
-            "scoringBreakdown": scoring_breakdown
+            "scoringBreakdown": scoring_breakdown,
+            "duplicateOf": analysis.get('duplicateOf')
         }
 
 
         
+    except OcrRequired as ocr_required:
+        # Scans and images continue on the OCR queue (see tasks.ocr_tasks)
+        try:
+            from tasks.ocr_tasks import start_ocr
+            start_ocr(message, ocr_required, cache_key)
+        except Exception as error:
+            record_failure(error)
+            logger.error(f"❌ Failed to queue resume for OCR: {error}")
+            if resume_id and resume_results_writer is not None:
+                resume_results_writer.update(resume_id, {'status': 'failed', 'error': str(error)})
+            return {"status": "failed", "resumeId": resume_id, "error": str(error)}
+        
+        logger.info("📨 Resume %s handed off to OCR queue: %s", resume_id, ocr_required)
+        record_task('queued')
+        return {
+            "status": "queued",
+            "resumeId": resume_id,
+            "taskId": self.request.id
+        }
+        
     except FileNotFoundError as error:
+        record_failure(error)
         logger.error(f"❌ File not found: {error}")
         
         # Update status to failed
-        if resume_id and resume_results_collection is not None:
-            resume_results_collection.update_one(
-                {'_id': ObjectId(resume_id)},
-                {
-                    '$set': {
-                        'status': 'failed',
-                        'error': f"File not found: {str(error)}"
-                    }
-                }
-            )
+        if resume_id and resume_results_writer is not None:
+            resume_results_writer.update(resume_id, {
+                'status': 'failed',
+                'error': f"File not found: {str(error)}"
+            })
         
         return {
             "status": "failed",
@@ -192,19 +405,15 @@ def parse_resume_task(self, message):
         }
         
     except ValueError as error:
+        record_failure(error)
         logger.error(f"❌ Validation error: {error}")
         
         # Update status to failed
-        if resume_id and resume_results_collection is not None:
-            resume_results_collection.update_one(
-                {'_id': ObjectId(resume_id)},
-                {
-                    '$set': {
-                        'status': 'failed',
-                        'error': str(error)
-                    }
-                }
-            )
+        if resume_id and resume_results_writer is not None:
+            resume_results_writer.update(resume_id, {
+                'status': 'failed',
+                'error': str(error)
+            })
         
         return {
             "status": "failed",
@@ -213,19 +422,15 @@ def parse_resume_task(self, message):
         }
         
     except NotImplementedError as error:
+        record_failure(error)
         logger.error(f"❌ Unsupported file format: {error}")
         
         # Update status to failed
-        if resume_id and resume_results_collection is not None:
-            resume_results_collection.update_one(
-                {'_id': ObjectId(resume_id)},
-                {
-                    '$set': {
-                        'status': 'failed',
-                        'error': f"Unsupported file format: {str(error)}"
-                    }
-                }
-            )
+        if resume_id and resume_results_writer is not None:
+            resume_results_writer.update(resume_id, {
+                'status': 'failed',
+                'error': f"Unsupported file format: {str(error)}"
+            })
         
         return {
             "status": "failed",
@@ -234,21 +439,17 @@ def parse_resume_task(self, message):
         }
         
     except Exception as error:
+        record_failure(error)
         logger.error(f"❌ Unexpected error during text extraction: {error}")
         logger.exception("Full traceback:")
         
         # Update status to failed
-        if resume_id and resume_results_collection is not None:
+        if resume_id and resume_results_writer is not None:
             try:
-                resume_results_collection.update_one(
-                    {'_id': ObjectId(resume_id)},
-                    {
-                        '$set': {
-                            'status': 'failed',
-                            'error': str(error)
-                        }
-                    }
-                )
+                resume_results_writer.update(resume_id, {
+                    'status': 'failed',
+                    'error': str(error)
+                })
             except Exception as db_error:
                 logger.error(f"❌ Failed to update database with error status: {db_error}")
         
@@ -260,6 +461,14 @@ def parse_resume_task(self, message):
 
 
 
+@task_postrun.connect
+def flush_resume_results(**kwargs):
+    """
+    Flush write-behind Mongo updates once a task finishes, whatever its outcome.
+    """
+    flush_bulk_writers()
+
+
 @celery_app.task(name='tasks.calculate_ats_score')
 def calculate_ats_score_task(resume_data):
     """
@@ -7,10 +7,23 @@ NO AI, NO ML - 100% deterministic rule-based scoring.
 
 import re
 import logging
-from utils.skills_data import SKILLS
+from collections import namedtuple
+import numpy as np
+from utils.skills_data import CANONICAL_SKILLS
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever scoring rules or weights change so cached and stored
+# scores produced by an older rubric can be recognised as stale
+RUBRIC_VERSION = "1"
+
+# Bump whenever ResumeFeatures or extract_ats_features changes, so stored
+# feature vectors (see utils.feature_store) are not re-scored as if current
+FEATURES_VERSION = "1"
+
+# Cap on the skill count a resume is scored against (see calculate_skill_score)
+SKILL_SCORE_CAP = 50
+
 
 def calculate_skill_score(raw_text, detected_skills):
     """
@@ -27,7 +40,7 @@ def calculate_skill_score(raw_text, detected_skills):
     """
     # Use a reasonable cap for total possible skills (50)
     # This prevents penalizing candidates for not having ALL 200+ skills
-    total_possible_skills = min(len(SKILLS), 50)
+    total_possible_skills = min(len(CANONICAL_SKILLS), SKILL_SCORE_CAP)
     detected_count = len(detected_skills)
     
     # Calculate score
@@ -44,7 +57,7 @@ def calculate_skill_score(raw_text, detected_skills):
     
     missing_skills = [skill for skill in common_skills if skill not in detected_skills]
     
-    logger.debug(f"Skill Score: {skill_score:.2f}/40 (detected {detected_count} skills)")
+    logger.debug("Skill Score: %.2f/40 (detected %d skills)", skill_score, detected_count)
     
     return {
         'score': skill_score,
@@ -53,7 +66,103 @@ def calculate_skill_score(raw_text, detected_skills):
     }
 
 
-def calculate_experience_score(raw_text):
+# =====================================================
+# KEYWORD TABLES AND PATTERNS (compiled once at import)
+# =====================================================
+
+EXPERIENCE_KEYWORDS = ('experience', 'work history', 'employment', 'professional background')
+
+YEAR_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\d+\+?\s*years?',  # "2 years", "3+ years"
+    r'years?\s*of\s*experience',  # "years of experience"
+    r'\d{4}\s*-\s*\d{4}',  # "2020-2023"
+    r'\d{4}\s*-\s*present',  # "2020-present"
+))
+
+ACTION_VERBS = (
+    'developed', 'built', 'created', 'designed', 'implemented',
+    'managed', 'led', 'coordinated', 'achieved', 'improved',
+    'optimized', 'deployed', 'maintained', 'collaborated',
+    'engineered', 'architected', 'delivered', 'launched'
+)
+
+DEGREE_KEYWORDS = (
+    'bachelor', 'master', 'phd', 'doctorate', 'b.tech', 'b.e.',
+    'm.tech', 'm.s.', 'mba', 'degree', 'university', 'college',
+    'graduate', 'undergraduate', 'diploma'
+)
+
+GRADUATION_YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+
+HEADINGS = ('skills', 'experience', 'education', 'projects', 'summary', 'objective')
+
+BULLET_PATTERNS = ('-', '•', '∙', '▪', '*')
+
+# Every keyword any scorer looks for, each checked once per resume
+_ALL_KEYWORDS = tuple(dict.fromkeys(EXPERIENCE_KEYWORDS + ACTION_VERBS + DEGREE_KEYWORDS + HEADINGS))
+
+# Compact per-resume feature record shared by the scorers
+ResumeFeatures = namedtuple('ResumeFeatures', [
+    'experience_section',        # 1 if any experience keyword is present
+    'year_patterns',             # number of year patterns that matched
+    'action_verbs',              # number of action verbs present
+    'degree_keywords',           # number of degree keywords present
+    'graduation_year',           # 1 if a 19xx/20xx year is present
+    'headings',                  # number of section headings present
+    'bullets',                   # number of lines starting with a bullet
+    'paragraphs',                # number of non-blank paragraphs
+    'reasonable_paragraphs',     # paragraphs shorter than 300 characters
+    'max_consecutive_empty',     # longest run of empty lines
+])
+
+
+def extract_ats_features(raw_text):
+    """
+    Scan resume text once and collect every feature the ATS scorers need.
+    
+    Lowercases and splits the text a single time, checks each distinct
+    keyword once and walks the lines once for bullets and empty-line runs.
+    
+    Args:
+        raw_text (str): Resume text
+        
+    Returns:
+        ResumeFeatures: Feature record
+    """
+    text_lower = raw_text.lower()
+    found = {keyword for keyword in _ALL_KEYWORDS if keyword in text_lower}
+    
+    bullets = 0
+    consecutive_empty = 0
+    max_consecutive = 0
+    for line in raw_text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            consecutive_empty += 1
+            if consecutive_empty > max_consecutive:
+                max_consecutive = consecutive_empty
+            continue
+        consecutive_empty = 0
+        if stripped.startswith(BULLET_PATTERNS):
+            bullets += 1
+    
+    paragraph_lengths = [len(p) for p in raw_text.split('\n\n') if p.strip()]
+    
+    return ResumeFeatures(
+        experience_section=int(any(keyword in found for keyword in EXPERIENCE_KEYWORDS)),
+        year_patterns=sum(1 for pattern in YEAR_PATTERNS if pattern.search(text_lower)),
+        action_verbs=sum(1 for verb in ACTION_VERBS if verb in found),
+        degree_keywords=sum(1 for keyword in DEGREE_KEYWORDS if keyword in found),
+        graduation_year=int(GRADUATION_YEAR_PATTERN.search(raw_text) is not None),
+        headings=sum(1 for heading in HEADINGS if heading in found),
+        bullets=bullets,
+        paragraphs=len(paragraph_lengths),
+        reasonable_paragraphs=sum(1 for length in paragraph_lengths if length < 300),
+        max_consecutive_empty=max_consecutive,
+    )
+
+
+def calculate_experience_score(raw_text, features=None):
     """
     Calculate experience clarity score (25 points max).
     
@@ -64,54 +173,36 @@ def calculate_experience_score(raw_text):
     
     Args:
         raw_text (str): Resume text
+        features (ResumeFeatures, optional): Precomputed features for raw_text
         
     Returns:
         dict: Score and details
     """
-    text_lower = raw_text.lower()
+    features = features or extract_ats_features(raw_text)
     score = 0
     
     # Check for experience section (5 points)
-    experience_keywords = ['experience', 'work history', 'employment', 'professional background']
-    if any(keyword in text_lower for keyword in experience_keywords):
+    if features.experience_section:
         score += 5
         logger.debug("✓ Experience section found (+5)")
     
     # Check for years of experience patterns (8 points)
-    year_patterns = [
-        r'\d+\+?\s*years?',  # "2 years", "3+ years"
-        r'years?\s*of\s*experience',  # "years of experience"
-        r'\d{4}\s*-\s*\d{4}',  # "2020-2023"
-        r'\d{4}\s*-\s*present',  # "2020-present"
-    ]
-    
-    years_found = 0
-    for pattern in year_patterns:
-        if re.search(pattern, text_lower):
-            years_found += 1
-    
+    years_found = features.year_patterns
     year_score = min(years_found * 2, 8)
     score += year_score
-    logger.debug(f"✓ Year patterns found: {years_found} (+{year_score})")
+    logger.debug("✓ Year patterns found: %s (+%s)", years_found, year_score)
     
     # Check for action verbs (12 points)
-    action_verbs = [
-        'developed', 'built', 'created', 'designed', 'implemented',
-        'managed', 'led', 'coordinated', 'achieved', 'improved',
-        'optimized', 'deployed', 'maintained', 'collaborated',
-        'engineered', 'architected', 'delivered', 'launched'
-    ]
-    
-    verbs_found = sum(1 for verb in action_verbs if verb in text_lower)
+    verbs_found = features.action_verbs
     verb_score = min(verbs_found * 2, 12)
     score += verb_score
-    logger.debug(f"✓ Action verbs found: {verbs_found} (+{verb_score})")
+    logger.debug("✓ Action verbs found: %s (+%s)", verbs_found, verb_score)
     
-    logger.debug(f"Experience Score: {score}/25")
+    logger.debug("Experience Score: %s/25", score)
     return {'score': score}
 
 
-def calculate_education_score(raw_text):
+def calculate_education_score(raw_text, features=None):
     """
     Calculate education presence score (15 points max).
     
@@ -121,38 +212,30 @@ def calculate_education_score(raw_text):
     
     Args:
         raw_text (str): Resume text
+        features (ResumeFeatures, optional): Precomputed features for raw_text
         
     Returns:
         dict: Score and details
     """
-    text_lower = raw_text.lower()
+    features = features or extract_ats_features(raw_text)
     score = 0
     
     # Check for degree keywords (10 points)
-    degree_keywords = [
-        'bachelor', 'master', 'phd', 'doctorate', 'b.tech', 'b.e.',
-        'm.tech', 'm.s.', 'mba', 'degree', 'university', 'college',
-        'graduate', 'undergraduate', 'diploma'
-    ]
-    
-    degrees_found = sum(1 for keyword in degree_keywords if keyword in text_lower)
+    degrees_found = features.degree_keywords
     degree_score = min(degrees_found * 3, 10)
     score += degree_score
-    logger.debug(f"✓ Degree keywords found: {degrees_found} (+{degree_score})")
+    logger.debug("✓ Degree keywords found: %s (+%s)", degrees_found, degree_score)
     
     # Check for graduation year (5 points)
-    year_pattern = r'\b(19|20)\d{2}\b'
-    years_found = len(re.findall(year_pattern, raw_text))
-    
-    if years_found > 0:
+    if features.graduation_year:
         score += 5
-        logger.debug(f"✓ Graduation years found (+5)")
+        logger.debug("✓ Graduation years found (+5)")
     
-    logger.debug(f"Education Score: {score}/15")
+    logger.debug("Education Score: %s/15", score)
     return {'score': score}
 
 
-def calculate_format_score(raw_text):
+def calculate_format_score(raw_text, features=None):
     """
     Calculate formatting and structure score (20 points max).
     
@@ -164,59 +247,44 @@ def calculate_format_score(raw_text):
     
     Args:
         raw_text (str): Resume text
+        features (ResumeFeatures, optional): Precomputed features for raw_text
         
     Returns:
         dict: Score and details
     """
-    text_lower = raw_text.lower()
-    lines = raw_text.split('\n')
+    features = features or extract_ats_features(raw_text)
     score = 0
     
     # Check for proper headings (8 points)
-    headings = ['skills', 'experience', 'education', 'projects', 'summary', 'objective']
-    headings_found = sum(1 for heading in headings if heading in text_lower)
+    headings_found = features.headings
     heading_score = min(headings_found * 2, 8)
     score += heading_score
-    logger.debug(f"✓ Headings found: {headings_found} (+{heading_score})")
+    logger.debug("✓ Headings found: %s (+%s)", headings_found, heading_score)
     
     # Check for bullet points (6 points)
-    bullet_patterns = ['-', '•', '∙', '▪', '*']
-    bullet_count = sum(1 for line in lines if any(line.strip().startswith(bp) for bp in bullet_patterns))
-    
+    bullet_count = features.bullets
     if bullet_count > 0:
         bullet_score = min(bullet_count // 2, 6)
         score += bullet_score
-        logger.debug(f"✓ Bullet points found: {bullet_count} (+{bullet_score})")
+        logger.debug("✓ Bullet points found: %s (+%s)", bullet_count, bullet_score)
     
     # Check paragraph length (3 points)
     # Good resumes have concise paragraphs
-    paragraphs = [p for p in raw_text.split('\n\n') if p.strip()]
-    reasonable_paragraphs = sum(1 for p in paragraphs if len(p) < 300)
-    
-    if paragraphs and (reasonable_paragraphs / len(paragraphs)) > 0.7:
+    if features.paragraphs and (features.reasonable_paragraphs / features.paragraphs) > 0.7:
         score += 3
         logger.debug("✓ Good paragraph length (+3)")
     
     # Check for excessive empty lines (3 points)
     # Penalize if more than 4 consecutive empty lines
-    consecutive_empty = 0
-    max_consecutive = 0
-    for line in lines:
-        if not line.strip():
-            consecutive_empty += 1
-            max_consecutive = max(max_consecutive, consecutive_empty)
-        else:
-            consecutive_empty = 0
-    
-    if max_consecutive <= 4:
+    if features.max_consecutive_empty <= 4:
         score += 3
         logger.debug("✓ No excessive empty lines (+3)")
     
-    logger.debug(f"Format Score: {score}/20")
+    logger.debug("Format Score: %s/20", score)
     return {'score': score}
 
 
-def calculate_ats_score(raw_text, detected_skills):
+def calculate_ats_score(raw_text, detected_skills, features=None):
     """
     Calculate complete ATS score based on rule-based criteria.
     
@@ -231,6 +299,7 @@ def calculate_ats_score(raw_text, detected_skills):
     Args:
         raw_text (str): Resume text
         detected_skills (list): List of detected skills
+        features (ResumeFeatures, optional): Precomputed features for raw_text
         
     Returns:
         dict: {
@@ -244,7 +313,7 @@ def calculate_ats_score(raw_text, detected_skills):
             }
         }
     """
-    logger.info("🎯 Starting ATS score calculation...")
+    logger.debug("🎯 Starting ATS score calculation...")
     
     if not raw_text or len(raw_text.strip()) == 0:
         logger.warning("⚠️  Empty text provided for ATS scoring")
@@ -259,11 +328,12 @@ def calculate_ats_score(raw_text, detected_skills):
             }
         }
     
-    # Calculate individual scores
+    # Scan the text once, then calculate individual scores from the features
+    features = features or extract_ats_features(raw_text)
     skill_result = calculate_skill_score(raw_text, detected_skills)
-    experience_result = calculate_experience_score(raw_text)
-    education_result = calculate_education_score(raw_text)
-    format_result = calculate_format_score(raw_text)
+    experience_result = calculate_experience_score(raw_text, features)
+    education_result = calculate_education_score(raw_text, features)
+    format_result = calculate_format_score(raw_text, features)
     
     # Extract scores
     skill_score = skill_result['score']
@@ -278,11 +348,12 @@ def calculate_ats_score(raw_text, detected_skills):
     # Ensure score is within bounds
     ats_score = max(0, min(100, ats_score))
     
-    logger.info(f"✅ ATS score calculation completed: {ats_score}/100")
-    logger.info(f"   - Skill Score: {skill_score:.2f}/40")
-    logger.info(f"   - Experience Score: {experience_score}/25")
-    logger.info(f"   - Education Score: {education_score}/15")
-    logger.info(f"   - Format Score: {format_score}/20")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"✅ ATS score calculation completed: {ats_score}/100")
+        logger.debug(f"   - Skill Score: {skill_score:.2f}/40")
+        logger.debug(f"   - Experience Score: {experience_score}/25")
+        logger.debug(f"   - Education Score: {education_score}/15")
+        logger.debug(f"   - Format Score: {format_score}/20")
     
     return {
         "atsScore": ats_score,
@@ -294,3 +365,136 @@ def calculate_ats_score(raw_text, detected_skills):
             "formatScore": format_score
         }
     }
+
+
+# =====================================================
+# BATCH SCORING (vectorized over many resumes)
+# =====================================================
+
+def build_feature_matrix(features_list):
+    """
+    Stack per-resume feature records into an integer matrix.
+    
+    Args:
+        features_list (list): ResumeFeatures (or equivalent sequences in
+            ResumeFeatures field order); None marks a resume with empty text
+        
+    Returns:
+        tuple: (matrix of shape (N, len(ResumeFeatures._fields)), boolean
+            mask of shape (N,) that is False for empty resumes)
+    """
+    width = len(ResumeFeatures._fields)
+    present = np.array([features is not None for features in features_list], dtype=bool)
+    matrix = np.zeros((len(features_list), width), dtype=np.int64)
+    
+    rows = [features for features in features_list if features is not None]
+    if rows:
+        matrix[present] = np.asarray(rows, dtype=np.int64)
+    
+    return matrix, present
+
+
+def calculate_ats_scores_batch(features_list, skill_counts):
+    """
+    Calculate ATS scores for many resumes at once with array operations.
+    
+    Applies exactly the rules of calculate_ats_score to every row, so each
+    resume gets the same sub-scores and total it would get when scored
+    individually. Missing skills are not computed here as they need the
+    full skill lists rather than counts.
+    
+    Args:
+        features_list (list): One ResumeFeatures per resume (see
+            extract_ats_features); None for resumes with empty text
+        skill_counts (sequence): Number of detected skills per resume
+        
+    Returns:
+        dict: NumPy arrays of length N:
+            "atsScore" (int), "skillScore" (float, unrounded),
+            "experienceScore", "educationScore", "formatScore" (int)
+    """
+    matrix, present = build_feature_matrix(features_list)
+    columns = {name: matrix[:, index] for index, name in enumerate(ResumeFeatures._fields)}
+    skill_counts = np.asarray(skill_counts, dtype=np.float64)
+    
+    # Skill match (40 points)
+    total_possible_skills = min(len(CANONICAL_SKILLS), SKILL_SCORE_CAP)
+    if total_possible_skills > 0:
+        skill_score = (skill_counts / total_possible_skills) * 40
+    else:
+        skill_score = np.zeros(len(matrix), dtype=np.float64)
+    
+    # Experience clarity (25 points)
+    experience_score = (
+        5 * columns['experience_section']
+        + np.minimum(columns['year_patterns'] * 2, 8)
+        + np.minimum(columns['action_verbs'] * 2, 12)
+    )
+    
+    # Education presence (15 points)
+    education_score = (
+        np.minimum(columns['degree_keywords'] * 3, 10)
+        + 5 * columns['graduation_year']
+    )
+    
+    # Formatting & structure (20 points)
+    paragraphs = columns['paragraphs']
+    reasonable_ratio = np.divide(
+        columns['reasonable_paragraphs'], paragraphs,
+        out=np.zeros(len(matrix), dtype=np.float64), where=paragraphs > 0
+    )
+    format_score = (
+        np.minimum(columns['headings'] * 2, 8)
+        + np.minimum(columns['bullets'] // 2, 6)
+        + 3 * ((paragraphs > 0) & (reasonable_ratio > 0.7))
+        + 3 * (columns['max_consecutive_empty'] <= 4)
+    )
+    
+    # Empty resumes score zero across the board
+    skill_score = np.where(present, skill_score, 0.0)
+    experience_score = np.where(present, experience_score, 0)
+    education_score = np.where(present, education_score, 0)
+    format_score = np.where(present, format_score, 0)
+    
+    # Total rounded half-to-even like round(), then clamped to 0-100
+    total_score = skill_score + experience_score + education_score + format_score
+    ats_score = np.clip(np.rint(total_score), 0, 100).astype(np.int64)
+    
+    return {
+        "atsScore": ats_score,
+        "skillScore": skill_score,
+        "experienceScore": experience_score,
+        "educationScore": education_score,
+        "formatScore": format_score,
+    }
+
+
+def batch_scores_to_results(batch_scores):
+    """
+    Convert calculate_ats_scores_batch output into per-resume dicts shaped
+    like calculate_ats_score's "atsScore" and "scoringBreakdown" fields.
+    
+    Args:
+        batch_scores (dict): Output of calculate_ats_scores_batch
+        
+    Returns:
+        list: {"atsScore": int, "scoringBreakdown": dict} per resume
+    """
+    return [
+        {
+            "atsScore": int(ats_score),
+            "scoringBreakdown": {
+                "skillScore": round(float(skill_score), 2),
+                "experienceScore": int(experience_score),
+                "educationScore": int(education_score),
+                "formatScore": int(format_score)
+            }
+        }
+        for ats_score, skill_score, experience_score, education_score, format_score in zip(
+            batch_scores["atsScore"].tolist(),
+            batch_scores["skillScore"].tolist(),
+            batch_scores["experienceScore"].tolist(),
+            batch_scores["educationScore"].tolist(),
+            batch_scores["formatScore"].tolist(),
+        )
+    ]
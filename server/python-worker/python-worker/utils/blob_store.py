@@ -0,0 +1,309 @@
+"""
+Blob sources for uploaded resumes.
+
+Workers read uploads through a blob store instead of a shared filesystem
+path, so they no longer have to run on the upload host or an NFS mount.
+Blobs are content addressed: the key is the SHA-256 of the file bytes
+plus its extension, sharded by the first two byte pairs of the digest:
+
+    ab/cd/abcd1234....pdf
+
+Backends (BLOB_BACKEND):
+- 'local': BLOB_LOCAL_ROOT directory; reads are memory-mapped
+- 's3':    S3-compatible bucket (AWS, MinIO, ...) via boto3; objects are
+           read into memory
+
+Readers get a bytes-like buffer (mmap or bytes) that the text extractor
+parses directly, without a temporary file.
+"""
+
+import io
+import os
+import mmap
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BLOB_BACKEND = os.getenv('BLOB_BACKEND', 'local').lower()
+BLOB_LOCAL_ROOT = os.getenv('BLOB_LOCAL_ROOT') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'blobs'
+)
+BLOB_S3_BUCKET = os.getenv('BLOB_S3_BUCKET', 'resumes')
+BLOB_S3_PREFIX = os.getenv('BLOB_S3_PREFIX', 'resumes/')
+BLOB_S3_ENDPOINT_URL = os.getenv('BLOB_S3_ENDPOINT_URL') or None
+BLOB_S3_REGION = os.getenv('BLOB_S3_REGION', 'us-east-1')
+
+# Blob store instance (created once per process)
+_store = None
+
+
+def blob_key(digest, ext):
+    """
+    Build the sharded key for a SHA-256 hex digest and file extension.
+
+    Args:
+        digest (str): SHA-256 hex digest of the file bytes
+        ext (str): Extension including the dot (e.g. '.pdf')
+
+    Returns:
+        str: Key such as 'ab/cd/abcd....pdf'
+    """
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{ext.lower()}"
+
+
+def parse_blob_key(key):
+    """
+    Split a blob key into its digest and extension.
+
+    Returns:
+        tuple: (digest, ext)
+
+    Raises:
+        ValueError: If key is not a well-formed blob key
+    """
+    name = key.rsplit('/', 1)[-1]
+    digest, ext = os.path.splitext(name)
+    if len(digest) != 64 or key != blob_key(digest, ext):
+        raise ValueError(f"Invalid blob key: {key}")
+    return digest, ext
+
+
+class BufferStream(io.RawIOBase):
+    """
+    Read-only, seekable stream over a bytes-like buffer (bytes, mmap,
+    memoryview). Lets file-based parsers such as zipfile (DOCX) read a
+    buffer without copying it into a BytesIO.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        chunk = self._view[self._position:self._position + len(target)]
+        target[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+class BlobStore:
+    """
+    Base blob store. Subclasses implement the storage primitives.
+    """
+
+    name = 'none'
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def size(self, key):
+        raise NotImplementedError
+
+    def _write(self, key, data):
+        raise NotImplementedError
+
+    def open(self, key):
+        """
+        Context manager yielding the blob's bytes as a buffer, valid
+        inside the with block.
+        """
+        raise NotImplementedError
+
+    def put(self, data, ext):
+        """
+        Store bytes under their content address (a no-op if already stored).
+
+        Args:
+            data (bytes): File contents
+            ext (str): Extension including the dot
+
+        Returns:
+            str: Blob key
+        """
+        key = blob_key(hashlib.sha256(data).hexdigest(), ext)
+        if not self.exists(key):
+            self._write(key, data)
+        return key
+
+    def put_file(self, file_path):
+        """
+        Store a local file under its content address.
+
+        Returns:
+            str: Blob key
+        """
+        with open(file_path, 'rb') as handle:
+            data = handle.read()
+        return self.put(data, os.path.splitext(file_path)[1])
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Content-addressed, hash-sharded directory tree. Writes go to a temp
+    file in the target directory and are renamed into place, so readers
+    never see a partial blob.
+    """
+
+    name = 'local'
+
+    def __init__(self, root=BLOB_LOCAL_ROOT):
+        self.root = root
+
+    def _path(self, key):
+        parse_blob_key(key)
+        return os.path.join(self.root, *key.split('/'))
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def size(self, key):
+        return os.path.getsize(self._path(key))
+
+    def _write(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @contextmanager
+    def open(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Blob not found: {key}")
+
+        with open(path, 'rb') as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                yield b''
+                return
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield buffer
+            finally:
+                buffer.close()
+
+
+class S3BlobStore(BlobStore):
+    """
+    S3-compatible bucket. BLOB_S3_ENDPOINT_URL points it at MinIO or any
+    other S3 API; credentials come from the usual AWS environment.
+    """
+
+    name = 's3'
+
+    def __init__(self, bucket=BLOB_S3_BUCKET, prefix=BLOB_S3_PREFIX,
+                 endpoint_url=BLOB_S3_ENDPOINT_URL, region=BLOB_S3_REGION):
+        import boto3
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region)
+
+    def _object_key(self, key):
+        parse_blob_key(key)
+        return self.prefix + key
+
+    def _head(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def exists(self, key):
+        return self._head(key) is not None
+
+    def size(self, key):
+        head = self._head(key)
+        if head is None:
+            raise FileNotFoundError(f"Blob not found: {key}")
+        return head['ContentLength']
+
+    def _write(self, key, data):
+        self.client.put_object(Bucket=self.bucket, Key=self._object_key(key), Body=data)
+
+    @contextmanager
+    def open(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                raise FileNotFoundError(f"Blob not found: {key}")
+            raise
+        yield response['Body'].read()
+
+
+_BACKENDS = {
+    'local': LocalBlobStore,
+    's3': S3BlobStore,
+}
+
+
+def get_blob_store():
+    """
+    Get the configured blob store (created once per process).
+
+    Returns:
+        BlobStore: Backend instance
+
+    Raises:
+        ValueError: If BLOB_BACKEND is not a known backend
+    """
+    global _store
+
+    if _store is not None:
+        return _store
+
+    if BLOB_BACKEND not in _BACKENDS:
+        raise ValueError(
+            f"Unknown BLOB_BACKEND: {BLOB_BACKEND}. Expected one of {', '.join(_BACKENDS)}"
+        )
+
+    _store = _BACKENDS[BLOB_BACKEND]()
+    logger.info(f"🗃️  Blob store backend: {_store.name}")
+    return _store
+
+
+def _reset_after_fork():
+    # boto3 clients (and their connection pools) must not be shared with the parent
+    global _store
+    _store = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
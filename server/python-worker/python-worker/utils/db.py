@@ -1,13 +1,121 @@
 import os
-from pymongo import MongoClient
+import time
+import threading
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
+from utils.metrics import time_stage, observe_mongo_checkout, record_mongo_checkout_failure
 
 # Load environment variables
 load_dotenv()
 
-# MongoDB client instance
+# MongoDB client instance, owned by the process that created it.
+# MongoClient is not fork-safe: a prefork pool child must never use a
+# client inherited from its parent, so each process builds its own
 _client = None
 _db = None
+_client_pid = None
+
+# Connection pool settings (per worker process). The Mongo server is
+# shared with the Node backend, so pools stay small and new connections
+# are opened a few at a time to avoid storms when workers restart
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '10'))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_MAX_CONNECTING = int(os.getenv('MONGO_MAX_CONNECTING', '2'))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '10000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '30000'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000'))
+MONGO_RETRY_WRITES = os.getenv('MONGO_RETRY_WRITES', 'true').lower() in ('1', 'true', 'yes')
+
+# Write-behind flush policy: flush when this many documents are pending
+# or the oldest pending update is this old, whichever comes first
+MONGO_BULK_MAX_BATCH = int(os.getenv('MONGO_BULK_MAX_BATCH', '100'))
+MONGO_BULK_MAX_DELAY_SECONDS = float(os.getenv('MONGO_BULK_MAX_DELAY_SECONDS', '1.0'))
+
+# Failed flushes a pending update is retried on before it is dropped
+MONGO_BULK_MAX_RETRIES = int(os.getenv('MONGO_BULK_MAX_RETRIES', '5'))
+
+# Per-document bulk write error codes worth retrying (network, failover,
+# shutdown, timeouts, write conflicts). Anything else (validation, document
+# too large, ...) fails the same way every time
+_TRANSIENT_WRITE_ERROR_CODES = frozenset({
+    6, 7, 50, 89, 91, 112, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436,
+})
+
+# Write-behind writers, one per collection (created lazily per process)
+_writers = {}
+
+
+class PoolCheckoutListener(monitoring.ConnectionPoolListener):
+    """
+    Records how long operations wait to check a connection out of the pool.
+    Pool events are published on the thread doing the checkout, so the
+    start time is kept per thread.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        started = getattr(self._local, 'started', None)
+        if started is not None:
+            observe_mongo_checkout(time.perf_counter() - started)
+            self._local.started = None
+    
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        record_mongo_checkout_failure(event.reason)
+    
+    # Remaining pool events are not needed (ConnectionPoolListener requires them)
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        pass
+    
+    def connection_checked_in(self, event):
+        pass
+
+
+def _create_client(mongodb_uri):
+    """
+    Create this process's pooled MongoDB client. Connections are opened
+    lazily by the first operation rather than with an up-front ping.
+    """
+    return MongoClient(
+        mongodb_uri,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxConnecting=MONGO_MAX_CONNECTING,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        retryWrites=MONGO_RETRY_WRITES,
+        event_listeners=[PoolCheckoutListener()],
+    )
 
 
 def get_db():
@@ -15,20 +123,27 @@ def get_db():
     Get MongoDB database instance.
     Connects to the same MongoDB used by Node.js backend.
     
+    The client is created on first use in each process, so prefork pool
+    children never share (or inherit) their parent's connections.
+    
     Returns:
         Database: MongoDB database instance
     """
-    global _client, _db
+    global _client, _db, _client_pid
     
-    if _db is not None:
+    if _db is not None and _client_pid == os.getpid():
         return _db
     
+    if _client_pid is not None and _client_pid != os.getpid():
+        _reset_after_fork()
+    
     try:
         # Get MongoDB URI from environment
         mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/resume_parser')
         
         # Create MongoDB client
-        _client = MongoClient(mongodb_uri)
+        _client = _create_client(mongodb_uri)
+        _client_pid = os.getpid()
         
         # Get database name from URI or use default
         # Extract database name from URI (last part after /)
@@ -38,9 +153,7 @@ def get_db():
         
         _db = _client[db_name]
         
-        # Test connection
-        _client.admin.command('ping')
-        print(f'MongoDB Connected: {db_name}')
+        print(f'MongoDB client created: {db_name} (pid {_client_pid}, maxPoolSize {MONGO_MAX_POOL_SIZE})')
         
         return _db
     except Exception as error:
@@ -52,10 +165,206 @@ def close_db():
     """
     Close MongoDB connection gracefully.
     """
-    global _client, _db
+    global _client, _db, _client_pid
     
-    if _client is not None:
+    if _client is not None and _client_pid == os.getpid():
+        flush_bulk_writers()
         _client.close()
-        _client = None
-        _db = None
         print('MongoDB connection closed')
+    
+    _client = None
+    _db = None
+    _client_pid = None
+
+
+def _reset_after_fork():
+    """
+    Drop state inherited from the parent process without touching it:
+    the parent still owns those sockets, and writer threads and locks do
+    not survive a fork.
+    """
+    global _client, _db, _client_pid
+    
+    _client = None
+    _db = None
+    _client_pid = None
+    _writers.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class BulkWriter:
+    """
+    Write-behind writer that coalesces $set updates per document and
+    flushes them as unordered bulk_write batches.
+    
+    Successive updates to the same document (e.g. 'processing' followed by
+    'completed') are merged into a single UpdateOne, later fields winning.
+    Pending updates are flushed when max_batch documents are pending, when
+    the oldest one is max_delay seconds old (checked by a background
+    thread), or when flush() is called explicitly. Updates that fail with
+    a transient error are retried on later flushes, at most max_retries
+    times; other failures are logged and dropped.
+    """
+    
+    def __init__(self, collection_name, max_batch=MONGO_BULK_MAX_BATCH, max_delay=MONGO_BULK_MAX_DELAY_SECONDS,
+                 max_retries=MONGO_BULK_MAX_RETRIES):
+        self.collection_name = collection_name
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self._pending = {}
+        self._attempts = {}
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+    
+    def update(self, document_id, fields):
+        """
+        Queue a $set of fields on a document.
+        
+        Args:
+            document_id (str | ObjectId): Document _id
+            fields (dict): Fields to set
+        """
+        if not isinstance(document_id, ObjectId):
+            document_id = ObjectId(document_id)
+        
+        with self._lock:
+            if self._pending:
+                self._pending.setdefault(document_id, {}).update(fields)
+            else:
+                self._pending[document_id] = dict(fields)
+                self._oldest = time.monotonic()
+            pending_count = len(self._pending)
+        
+        self._ensure_timer()
+        
+        if pending_count >= self.max_batch:
+            self.flush()
+    
+    def flush(self):
+        """
+        Write all pending updates in one unordered bulk_write.
+        Updates that fail with a transient error (or with the whole write,
+        e.g. on a network error) are re-queued behind any newer values and
+        retried on the next flush, until they have failed max_retries
+        times. Updates failing with any other error are dropped.
+        
+        Returns:
+            BulkWriteResult: Result of the write, or None if nothing was pending
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                self._oldest = None
+            
+            if not pending:
+                return None
+            
+            document_ids = list(pending)
+            
+            try:
+                with time_stage('mongo_write'):
+                    db = get_db()
+                    operations = self._operations(db, document_ids, pending)
+                    result = db[self.collection_name].bulk_write(operations, ordered=False)
+            except BulkWriteError as error:
+                write_errors = error.details.get('writeErrors', [])
+                print(f'MongoDB bulk write failed for {len(write_errors)} documents: {error}')
+                retry_ids = set()
+                for write_error in write_errors:
+                    document_id = document_ids[write_error['index']]
+                    if write_error.get('code') in _TRANSIENT_WRITE_ERROR_CODES:
+                        retry_ids.add(document_id)
+                    else:
+                        print(f'MongoDB update of {document_id} dropped: {write_error.get("errmsg")}')
+                self._forget(set(document_ids) - retry_ids)
+                self._requeue({document_id: pending[document_id] for document_id in retry_ids})
+                return None
+            except Exception as error:
+                print(f'MongoDB bulk write error: {error}')
+                self._requeue(pending)
+                raise
+            
+            self._forget(document_ids)
+            return result
+    
+    def _operations(self, db, document_ids, pending):
+        """
+        Bulk write operations for pending updates, in document_ids order.
+        Subclasses override this to write something other than a $set.
+        """
+        return [
+            UpdateOne({'_id': document_id}, {'$set': pending[document_id]})
+            for document_id in document_ids
+        ]
+    
+    def _forget(self, document_ids):
+        with self._lock:
+            for document_id in document_ids:
+                self._attempts.pop(document_id, None)
+    
+    def _requeue(self, failed):
+        with self._lock:
+            for document_id, fields in failed.items():
+                attempts = self._attempts.get(document_id, 0) + 1
+                if attempts > self.max_retries:
+                    self._attempts.pop(document_id, None)
+                    print(f'MongoDB update of {document_id} dropped after {self.max_retries} retries (fields: {sorted(fields)})')
+                    continue
+                self._attempts[document_id] = attempts
+                newer = self._pending.get(document_id, {})
+                self._pending[document_id] = {**fields, **newer}
+            if self._pending and self._oldest is None:
+                self._oldest = time.monotonic()
+    
+    def _ensure_timer(self):
+        # Started lazily so each forked worker process gets its own thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run_timer, name=f'bulk-writer-{self.collection_name}', daemon=True)
+        self._thread.start()
+    
+    def _run_timer(self):
+        while True:
+            time.sleep(self.max_delay)
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay
+            if due:
+                try:
+                    self.flush()
+                except Exception:
+                    pass
+
+
+def get_bulk_writer(collection_name='resumeresults', writer_class=BulkWriter):
+    """
+    Get this process's write-behind writer for a collection.
+    
+    Args:
+        collection_name (str): Collection to write to
+        writer_class (type): BulkWriter subclass to create on first use
+    
+    Returns:
+        BulkWriter: Shared writer instance
+    """
+    writer = _writers.get(collection_name)
+    if writer is None:
+        writer = writer_class(collection_name)
+        _writers[collection_name] = writer
+    return writer
+
+
+def flush_bulk_writers():
+    """
+    Flush every write-behind writer in this process.
+    """
+    for writer in list(_writers.values()):
+        try:
+            writer.flush()
+        except Exception as error:
+            print(f'MongoDB flush failed for {writer.collection_name}: {error}')
@@ -0,0 +1,291 @@
+"""
+Sandboxed text extraction with per-document limits.
+
+A malformed or adversarial PDF can keep PyPDF2 spinning or allocating for
+as long as Celery's task_time_limit, holding a worker slot. With
+EXTRACT_SANDBOX enabled every document is extracted in a child process
+forked from the worker (copy-on-write, so the file buffer and warm
+modules are shared without pickling), in its own process group:
+
+- EXTRACT_CPU_SECONDS: RLIMIT_CPU; SIGXCPU stops the extraction, the
+  kernel kills it a second later if it does not stop
+- EXTRACT_SOFT_SECONDS: wall-clock alarm inside the child; the extraction
+  is interrupted and reports the limit itself
+- EXTRACT_WALL_SECONDS: hard wall-clock limit; the worker kills the
+  process group (this also covers code stuck in C, where the alarm
+  cannot interrupt it)
+- EXTRACT_MAX_MEMORY_MB: resident memory the extraction may add on top
+  of the worker it was forked from, polled by the worker; RLIMIT_AS at
+  twice that stops single huge allocations between polls. The poll only
+  reads the child's own RSS: processes the child starts are bounded by
+  the RLIMIT_AS they inherit alone
+
+PDFs are extracted serially in the sandbox: PDF_PARALLEL_PAGE_THRESHOLD
+only applies with EXTRACT_SANDBOX disabled.
+
+A document breaking a limit raises ExtractionLimitExceeded with a precise
+reason, and its resume is marked 'failed'. Ordinary extraction errors
+(unsupported format, missing file, ...) are re-raised as they were in the
+child. The child enforces its CPU and soft limits itself, so it also ends
+if the worker process is killed. Its stage timings and document sizes are
+sent back with the outcome and recorded by the worker, so sandbox
+processes leave no metrics files behind.
+"""
+
+import os
+import math
+import time
+import pickle
+import select
+import signal
+import struct
+import logging
+import resource
+from dotenv import load_dotenv
+import utils.text_extractor as text_extractor
+from utils.metrics import hold_observations, record_observations
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_SANDBOX = os.getenv('EXTRACT_SANDBOX', 'true').lower() in ('1', 'true', 'yes')
+EXTRACT_CPU_SECONDS = float(os.getenv('EXTRACT_CPU_SECONDS', '30'))
+EXTRACT_SOFT_SECONDS = float(os.getenv('EXTRACT_SOFT_SECONDS', '45'))
+EXTRACT_WALL_SECONDS = float(os.getenv('EXTRACT_WALL_SECONDS', '60'))
+EXTRACT_MAX_MEMORY_MB = int(os.getenv('EXTRACT_MAX_MEMORY_MB', '512'))
+
+# How often the worker checks the child's wall time and memory
+_POLL_SECONDS = 0.05
+
+_PAGE_BYTES = os.sysconf('SC_PAGE_SIZE')
+_LENGTH = struct.Struct('!Q')
+
+
+class ExtractionLimitExceeded(Exception):
+    """
+    Extraction stopped by a sandbox limit.
+
+    Attributes:
+        limit (str): 'cpu_time', 'soft_time', 'wall_time', 'memory' or 'crash'
+        failure_reason (str): Metrics failure reason label
+    """
+
+    def __init__(self, limit, message):
+        super().__init__(message)
+        self.limit = limit
+        self.failure_reason = 'extractor_crash' if limit == 'crash' else f"{limit}_limit"
+
+
+def _memory_pages(pid='self'):
+    """
+    (virtual, resident) size of a process in pages, or None without /proc.
+    """
+    try:
+        with open(f"/proc/{pid}/statm", 'rb') as statm:
+            size, resident = statm.read().split()[:2]
+        return int(size), int(resident)
+    except (OSError, ValueError):
+        return None
+
+
+def _cpu_limit_message():
+    return f"Extraction exceeded the CPU time limit ({EXTRACT_CPU_SECONDS:g}s)"
+
+
+def _raise_limit(limit, message):
+    def handler(signum, frame):
+        raise ExtractionLimitExceeded(limit, message)
+    return handler
+
+
+def _run_child(write_fd, extract, source, ext, memory_pages):
+    """
+    Child side: apply the limits, extract, send the outcome and the
+    metric observations made meanwhile, and exit. Never returns.
+    """
+    outcome = None
+    observations = hold_observations()
+    try:
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGXCPU, _raise_limit('cpu_time', _cpu_limit_message()))
+        signal.signal(signal.SIGALRM, _raise_limit(
+            'soft_time', f"Extraction exceeded the soft time limit ({EXTRACT_SOFT_SECONDS:g}s)"
+        ))
+
+        cpu_seconds = max(1, math.ceil(EXTRACT_CPU_SECONDS))
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        if memory_pages:
+            address_space = (memory_pages[0] + 2 * EXTRACT_MAX_MEMORY_MB * 1024 * 1024 // _PAGE_BYTES) * _PAGE_BYTES
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            if hard != resource.RLIM_INFINITY:
+                address_space = min(address_space, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (address_space, hard))
+        signal.setitimer(signal.ITIMER_REAL, EXTRACT_SOFT_SECONDS)
+
+        # Extract serially: the worker's page-extraction pool cannot be
+        # used from a fork, and a fresh pool per document would cost a
+        # fork of its processes for every large PDF and escape the
+        # memory poll below
+        text_extractor.PDF_PARALLEL_PAGE_THRESHOLD = None
+
+        outcome = ('ok', extract(source, ext))
+    except ExtractionLimitExceeded as error:
+        outcome = ('limit', error.limit, str(error))
+    except MemoryError:
+        outcome = ('limit', 'memory', f"Extraction exceeded the memory limit ({EXTRACT_MAX_MEMORY_MB} MB)")
+    except BaseException as error:
+        try:
+            outcome = ('error', pickle.dumps(error))
+        except Exception:
+            outcome = ('error', pickle.dumps(RuntimeError(f"{type(error).__name__}: {error}")))
+    finally:
+        try:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            data = pickle.dumps((outcome, observations))
+            data = _LENGTH.pack(len(data)) + data
+            while data:
+                data = data[os.write(write_fd, data):]
+        finally:
+            os._exit(0)
+
+
+def _kill_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _describe_exit(status, usage):
+    """
+    Limit and message for a child that exited without an outcome.
+    """
+    if os.WIFSIGNALED(status):
+        signum = os.WTERMSIG(status)
+        # RLIMIT_CPU: SIGXCPU at the soft limit, SIGKILL at the hard limit
+        cpu_seconds = usage.ru_utime + usage.ru_stime
+        if signum in (signal.SIGXCPU, signal.SIGKILL) and cpu_seconds >= EXTRACT_CPU_SECONDS:
+            return 'cpu_time', _cpu_limit_message()
+        return 'crash', f"Extraction process crashed ({signal.Signals(signum).name})"
+    return 'crash', f"Extraction process exited with code {os.WEXITSTATUS(status)} without a result"
+
+
+def _collect(pid, read_fd, parent_pages):
+    """
+    Worker side: read the child's outcome while enforcing the wall-clock
+    and memory limits.
+
+    Returns:
+        tuple: The child's outcome and its metric observations (none when
+            the child was stopped or exited without an outcome)
+    """
+    start = time.monotonic()
+    max_growth = EXTRACT_MAX_MEMORY_MB * 1024 * 1024 // _PAGE_BYTES
+    buffer = bytearray()
+
+    def complete():
+        return (len(buffer) >= _LENGTH.size
+                and len(buffer) >= _LENGTH.size + _LENGTH.unpack_from(buffer)[0])
+
+    while not complete():
+        elapsed = time.monotonic() - start
+        if elapsed >= EXTRACT_WALL_SECONDS:
+            _kill_group(pid)
+            return ('limit', 'wall_time', f"Extraction exceeded the wall-clock limit ({EXTRACT_WALL_SECONDS:g}s)"), []
+
+        if parent_pages:
+            child_pages = _memory_pages(pid)
+            if child_pages and child_pages[1] - parent_pages[1] > max_growth:
+                _kill_group(pid)
+                grown_mb = (child_pages[1] - parent_pages[1]) * _PAGE_BYTES // (1024 * 1024)
+                return ('limit', 'memory',
+                        f"Extraction exceeded the memory limit ({EXTRACT_MAX_MEMORY_MB} MB, reached {grown_mb} MB)"), []
+
+        ready, _, _ = select.select([read_fd], [], [], min(_POLL_SECONDS, EXTRACT_WALL_SECONDS - elapsed))
+        if ready:
+            chunk = os.read(read_fd, 1 << 20)
+            if chunk:
+                buffer += chunk
+                continue
+
+        # Nothing to read: stop once the child has exited, after draining
+        # what it wrote before exiting
+        exited, status, usage = os.wait4(pid, os.WNOHANG)
+        if exited:
+            while select.select([read_fd], [], [], 0)[0]:
+                chunk = os.read(read_fd, 1 << 20)
+                if not chunk:
+                    break
+                buffer += chunk
+            if complete():
+                break
+            return ('limit', *_describe_exit(status, usage)), []
+
+    return pickle.loads(bytes(buffer[_LENGTH.size:]))
+
+
+def run_sandboxed(extract, source, ext=None):
+    """
+    Run extract(source, ext) in a limited child process.
+
+    Args:
+        extract (callable): Extraction function, e.g. extract_text
+        source (str | bytes | mmap): File path or contents
+        ext (str, optional): File extension
+
+    Returns:
+        The extraction function's result
+
+    Raises:
+        ExtractionLimitExceeded: If the extraction broke a limit or crashed
+        Exception: Whatever the extraction raised
+    """
+    parent_pages = _memory_pages()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        _run_child(write_fd, extract, source, ext, parent_pages)
+    os.close(write_fd)
+    # Set on both sides, so the group exists before either one uses it
+    try:
+        os.setpgid(pid, pid)
+    except (PermissionError, ProcessLookupError):
+        pass
+
+    try:
+        outcome, observations = _collect(pid, read_fd, parent_pages)
+    finally:
+        os.close(read_fd)
+        # Also ends page-extraction processes the child started
+        _kill_group(pid)
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+
+    record_observations(observations)
+    if outcome[0] == 'ok':
+        return outcome[1]
+    if outcome[0] == 'limit':
+        raise ExtractionLimitExceeded(outcome[1], outcome[2])
+    raise pickle.loads(outcome[1])
+
+
+def sandboxed_extract_text(file_path, ext=None):
+    """
+    extract_text in the extraction sandbox (or directly when EXTRACT_SANDBOX
+    is disabled). Same arguments, result and errors as extract_text, plus
+    ExtractionLimitExceeded.
+    """
+    if not EXTRACT_SANDBOX:
+        return text_extractor.extract_text(file_path, ext)
+
+    try:
+        return run_sandboxed(text_extractor.extract_text, file_path, ext)
+    except ExtractionLimitExceeded as error:
+        logger.warning(f"⛔ {error}: {text_extractor._describe_source(file_path)}")
+        raise
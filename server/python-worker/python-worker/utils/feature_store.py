@@ -0,0 +1,163 @@
+"""
+Persisted per-resume feature vectors for re-scoring without re-parsing.
+
+Every completed resumeresults document carries the inputs of the ATS
+rubric next to its scores, stamped with the versions that produced them:
+
+    'features': {
+        'v': FEATURES_VERSION,            # layout of this subdocument
+        'skillIds': Binary(uint16 LE),    # canonical skill IDs, ascending
+        'ats': [int, ...],                # ResumeFeatures, in field order
+    },
+    'skillsVersion': SKILLS_VERSION,
+    'rubricVersion': RUBRIC_VERSION,
+
+When the rubric changes, rescore_documents recomputes scores from 'ats'
+and the skill count alone. When the skills dictionary changes, skill IDs
+are re-derived from the stored canonical skill names, because IDs are
+positions in the dictionary that produced them. Keywords that are new to
+the dictionary can only be found by rematching the stored text
+(rematch_text=True); that uses the compiled skill matcher and never the
+uploaded file or spaCy.
+"""
+
+import logging
+import numpy as np
+from bson import Binary
+from utils.ats_engine import (
+    RUBRIC_VERSION, FEATURES_VERSION, ResumeFeatures, extract_ats_features,
+    calculate_skill_score, calculate_ats_scores_batch, batch_scores_to_results,
+)
+from utils.skills_data import SKILLS_VERSION, skill_ids_of, skill_names
+
+logger = logging.getLogger(__name__)
+
+# resumeresults documents whose stored scores predate the current
+# dictionary or rubric (and whose features can be re-scored)
+STALE_QUERY = {
+    'status': 'completed',
+    'features.v': FEATURES_VERSION,
+    '$or': [
+        {'skillsVersion': {'$ne': SKILLS_VERSION}},
+        {'rubricVersion': {'$ne': RUBRIC_VERSION}},
+    ],
+}
+
+# Completed documents from before feature vectors were stored
+MISSING_QUERY = {
+    'status': 'completed',
+    'features.v': {'$ne': FEATURES_VERSION},
+}
+
+
+def build_feature_vector(skills, features):
+    """
+    Build the JSON-safe feature vector of an analyzed resume (as kept in
+    the result cache).
+
+    Args:
+        skills (list): Detected skills (canonical names)
+        features (ResumeFeatures): Output of extract_ats_features
+
+    Returns:
+        dict: {'v', 'skillIds', 'ats'}
+    """
+    return {
+        'v': FEATURES_VERSION,
+        'skillIds': skill_ids_of(skills),
+        'ats': list(features),
+    }
+
+
+def feature_fields(vector):
+    """
+    Fields to $set on a resumeresults document to store a feature vector.
+
+    Args:
+        vector (dict): Output of build_feature_vector
+
+    Returns:
+        dict: features (skill IDs packed as uint16), skillsVersion, rubricVersion
+    """
+    return {
+        'features': {
+            'v': vector['v'],
+            'skillIds': Binary(np.asarray(vector['skillIds'], dtype='<u2').tobytes()),
+            'ats': [int(value) for value in vector['ats']],
+        },
+        'skillsVersion': SKILLS_VERSION,
+        'rubricVersion': RUBRIC_VERSION,
+    }
+
+
+def decode_skill_ids(stored):
+    """
+    Unpack stored skill IDs.
+
+    Returns:
+        list: Skill IDs
+    """
+    return np.frombuffer(bytes(stored), dtype='<u2').tolist()
+
+
+def rescore_documents(documents, rematch_text=False):
+    """
+    Recompute skills and scores of stale documents from their features.
+
+    Args:
+        documents (list): resumeresults documents with _id, skills,
+            features and skillsVersion
+        rematch_text (bool): On a dictionary change, rematch the stored
+            text instead of folding the stored skill names
+
+    Returns:
+        list: (document, fields to $set) per document
+    """
+    skills_per_document = []
+    features_list = []
+    for document in documents:
+        stored = document['features']
+        if document.get('skillsVersion') == SKILLS_VERSION:
+            skill_ids = decode_skill_ids(stored['skillIds'])
+        elif rematch_text:
+            from utils.raw_text_store import load_raw_text
+            from utils.skill_matcher import find_skill_ids
+            skill_ids = find_skill_ids(load_raw_text(document['_id']).lower())
+        else:
+            skill_ids = skill_ids_of(document.get('skills') or ())
+        skills_per_document.append(skill_ids)
+        features_list.append(ResumeFeatures(*stored['ats']))
+
+    results = batch_scores_to_results(calculate_ats_scores_batch(
+        features_list, [len(skill_ids) for skill_ids in skills_per_document]
+    ))
+
+    updates = []
+    for document, skill_ids, features, result in zip(documents, skills_per_document, features_list, results):
+        skills = sorted(skill_names(skill_ids))
+        updates.append((document, {
+            'skills': skills,
+            'atsScore': result['atsScore'],
+            'missingSkills': calculate_skill_score(None, skills)['missing_skills'],
+            'scoringBreakdown': result['scoringBreakdown'],
+            **feature_fields(build_feature_vector(skills, features)),
+        }))
+    return updates
+
+
+def features_from_text(text, skills=None):
+    """
+    Feature vector of a stored resume text (backfill of documents from
+    before feature vectors were stored).
+
+    Args:
+        text (str): Stored resume text
+        skills (list, optional): Stored skills; rematched from text if None
+
+    Returns:
+        dict: Output of build_feature_vector
+    """
+    if skills is None:
+        from utils.skill_matcher import find_skills
+        skills = find_skills(text.lower())
+    return build_feature_vector(skills, extract_ats_features(text))
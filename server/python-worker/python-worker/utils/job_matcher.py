@@ -0,0 +1,271 @@
+"""
+Job-description-aware scoring and ranking of stored resumes.
+
+calculate_skill_score rates every resume against the same generic skill
+cap; here a job description is compiled once into the dictionary skills
+it asks for and every stored resume is scored against those:
+
+    score = skillMatch (40 * required skills present / required skills)
+          + experienceScore + educationScore + formatScore (stored ATS breakdown)
+
+Both sides are precompiled so a ranking is a handful of array operations:
+- compile_job_description runs the skill matcher over the description
+  once and keeps the required skill columns (memoized per description)
+- CandidatePool holds the completed resumes as a boolean resume x skill
+  matrix plus their non-skill sub-scores, loaded from Mongo with a
+  projection and reused for JOB_MATCH_POOL_TTL_SECONDS
+"""
+
+import os
+import json
+import time
+import logging
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+from dotenv import load_dotenv
+from utils.skill_matcher import SKILL_MATCHER
+from utils.skills_data import CANONICAL_SKILLS, SKILL_IDS
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# How long a loaded candidate pool is reused before Mongo is read again
+JOB_MATCH_POOL_TTL_SECONDS = int(os.getenv('JOB_MATCH_POOL_TTL_SECONDS', '300'))
+
+# Compiled job descriptions kept per process
+JOB_MATCH_COMPILED_CACHE_SIZE = int(os.getenv('JOB_MATCH_COMPILED_CACHE_SIZE', '256'))
+
+JOB_MATCH_DEFAULT_TOP_K = 20
+
+# Points of the ATS score that come from skills (see calculate_skill_score)
+SKILL_POINTS = 40
+
+# Skills a job asks for, as matrix columns (skill IDs) and their names (same order)
+CompiledJob = namedtuple('CompiledJob', ['columns', 'skills'])
+
+# Loaded candidate pools, keyed by the JSON of their Mongo filter
+_pools = {}
+
+
+def _compile(description, required_skills):
+    columns = set(SKILL_MATCHER.find_ids((description or '').lower()))
+
+    for skill in required_skills:
+        column = SKILL_IDS.get(skill.strip().lower())
+        if column is None:
+            raise ValueError(f"Unknown skill: {skill}")
+        columns.add(column)
+
+    if not columns:
+        raise ValueError("The job description does not mention any known skill")
+
+    columns = sorted(columns, key=lambda column: CANONICAL_SKILLS[column])
+    return CompiledJob(
+        columns=np.array(columns, dtype=np.intp),
+        skills=tuple(CANONICAL_SKILLS[column] for column in columns)
+    )
+
+
+_compile_cached = lru_cache(maxsize=JOB_MATCH_COMPILED_CACHE_SIZE)(_compile)
+
+
+def compile_job_description(description, required_skills=None):
+    """
+    Compile a job description into the dictionary skills it requires.
+    Repeated calls with the same description are served from memory.
+
+    Args:
+        description (str): Job description text
+        required_skills (list, optional): Dictionary skills to require in
+            addition to those found in the description
+
+    Returns:
+        CompiledJob: Required skill columns and names
+
+    Raises:
+        ValueError: If a required skill is not in the dictionary or no
+            skill is required at all
+    """
+    return _compile_cached(description, tuple(required_skills or ()))
+
+
+class CandidatePool:
+    """
+    Completed resumes in matrix form: one row per resume, one boolean
+    column per skill ID, plus each resume's non-skill ATS points.
+    """
+
+    def __init__(self, resume_ids, user_ids, skills, base_scores):
+        self.resume_ids = resume_ids
+        self.user_ids = user_ids
+        self.skills = skills
+        self.base_scores = base_scores
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    @classmethod
+    def from_documents(cls, documents):
+        """
+        Build a pool from resumeresults documents (skills and
+        scoringBreakdown are the only fields read besides the ids).
+        """
+        resume_ids = []
+        user_ids = []
+        rows = []
+        columns = []
+        base_scores = []
+
+        for row, document in enumerate(documents):
+            resume_ids.append(str(document['_id']))
+            user_ids.append(str(document['userId']) if document.get('userId') else None)
+
+            for skill in document.get('skills') or ():
+                column = SKILL_IDS.get(skill)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+
+            breakdown = document.get('scoringBreakdown') or {}
+            base_scores.append(
+                (breakdown.get('experienceScore') or 0)
+                + (breakdown.get('educationScore') or 0)
+                + (breakdown.get('formatScore') or 0)
+            )
+
+        skills = np.zeros((len(resume_ids), len(CANONICAL_SKILLS)), dtype=bool)
+        skills[rows, columns] = True
+
+        return cls(resume_ids, user_ids, skills, np.array(base_scores, dtype=np.float64))
+
+
+def load_candidate_pool(query=None, refresh=False):
+    """
+    Load completed resumes matching query, reusing a recent load.
+
+    Args:
+        query (dict, optional): Extra resumeresults filter (e.g. {'userId': ...})
+        refresh (bool): Ignore a cached pool
+
+    Returns:
+        CandidatePool: Loaded pool
+    """
+    filter_ = {'status': 'completed', **(query or {})}
+    cache_key = json.dumps(filter_, sort_keys=True, default=str)
+
+    pool = _pools.get(cache_key)
+    if pool is not None and not refresh and time.monotonic() - pool.loaded_at < JOB_MATCH_POOL_TTL_SECONDS:
+        return pool
+
+    from utils.db import get_db
+
+    start = time.perf_counter()
+    cursor = get_db()['resumeresults'].find(
+        filter_, {'userId': 1, 'skills': 1, 'scoringBreakdown': 1}, batch_size=5000
+    )
+    pool = CandidatePool.from_documents(cursor)
+    _pools[cache_key] = pool
+
+    logger.info(f"📚 Loaded {len(pool)} candidate resumes in {time.perf_counter() - start:.2f}s")
+    return pool
+
+
+def score_candidates(job, pool):
+    """
+    Score every resume in pool against a compiled job.
+
+    Args:
+        job (CompiledJob): Output of compile_job_description
+        pool (CandidatePool): Candidate resumes
+
+    Returns:
+        tuple: (total scores, skill scores, matched skill counts), arrays of len(pool)
+    """
+    matched = pool.skills[:, job.columns].sum(axis=1)
+    skill_scores = matched * (SKILL_POINTS / len(job.columns))
+    return skill_scores + pool.base_scores, skill_scores, matched
+
+
+def rank_candidates(job, pool, top_k=JOB_MATCH_DEFAULT_TOP_K, min_score=None):
+    """
+    Rank pool against a compiled job and describe the top_k resumes.
+
+    Ties keep pool order, so rankings are deterministic.
+
+    Args:
+        job (CompiledJob): Output of compile_job_description
+        pool (CandidatePool): Candidate resumes
+        top_k (int): Number of resumes to return
+        min_score (float, optional): Drop resumes scoring below this
+
+    Returns:
+        list: One dict per ranked resume (resumeId, userId, score,
+            skillScore, matchedSkills, missingSkills)
+    """
+    if not len(pool) or top_k <= 0:
+        return []
+
+    scores, skill_scores, _ = score_candidates(job, pool)
+
+    # Partition out the top_k first so only those are sorted
+    if top_k < len(pool):
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        # Rows tied with the k-th score may sit past the partition; take
+        # them all so the stable order below decides between them
+        threshold = scores[candidates].min()
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(pool))
+
+    order = candidates[np.lexsort((candidates, -scores[candidates]))][:top_k]
+    if min_score is not None:
+        order = order[scores[order] >= min_score]
+
+    present = pool.skills[np.ix_(order, job.columns)]
+    ranked = []
+    for index, row in enumerate(order.tolist()):
+        ranked.append({
+            'resumeId': pool.resume_ids[row],
+            'userId': pool.user_ids[row],
+            'score': round(float(scores[row]), 2),
+            'skillScore': round(float(skill_scores[row]), 2),
+            'matchedSkills': [skill for skill, has in zip(job.skills, present[index]) if has],
+            'missingSkills': [skill for skill, has in zip(job.skills, present[index]) if not has],
+        })
+    return ranked
+
+
+def match_job_description(description, required_skills=None, top_k=JOB_MATCH_DEFAULT_TOP_K,
+                          min_score=None, query=None):
+    """
+    Rank stored resumes against a job description.
+
+    Args:
+        description (str): Job description text
+        required_skills (list, optional): Extra dictionary skills to require
+        top_k (int): Number of resumes to return
+        min_score (float, optional): Drop resumes scoring below this
+        query (dict, optional): Extra resumeresults filter
+
+    Returns:
+        dict: requiredSkills, candidates (pool size) and ranked matches
+    """
+    job = compile_job_description(description, required_skills)
+    pool = load_candidate_pool(query)
+
+    start = time.perf_counter()
+    matches = rank_candidates(job, pool, top_k, min_score)
+    logger.info(
+        "🎯 Ranked %d resumes against %d job skills in %.1fms",
+        len(pool), len(job.columns), (time.perf_counter() - start) * 1000
+    )
+
+    return {
+        'requiredSkills': list(job.skills),
+        'candidates': len(pool),
+        'matches': matches,
+    }
@@ -0,0 +1,268 @@
+"""
+Prometheus metrics for the resume worker.
+
+Per-stage latency histograms, document size histograms, task outcome /
+failure reason counters and Mongo pool checkout waits. Celery's prefork pool runs tasks in child
+processes, so metrics use prometheus_client's multiprocess mode: every
+process writes its samples under PROMETHEUS_MULTIPROC_DIR and the parent
+worker serves the aggregate on METRICS_PORT (text exposition format at
+/metrics). render_metrics() returns the same text for tools that write
+it to a file instead.
+
+With METRICS_ENABLED=false prometheus_client is never imported and every
+helper here is a no-op.
+"""
+
+import os
+import time
+import shutil
+import logging
+import tempfile
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+# Port of the /metrics endpoint served by the parent worker (0 = no endpoint)
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9808') or 0)
+
+# Pipeline stages timed by resume_stage_seconds
+STAGES = (
+    'file_read', 'pdf_parse', 'docx_parse', 'pdf_rasterize', 'ocr', 'clean_text', 'minhash', 'near_dup_lookup',
+    'skill_match', 'ats_score', 'mongo_write',
+)
+
+_STAGE_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+_BYTES_BUCKETS = (4096, 16384, 65536, 262144, 1048576, 2097152, 5242880, 10485760)
+_CHARS_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+_PAGES_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200)
+_CHECKOUT_BUCKETS = (.0001, .0005, .001, .005, .01, .05, .1, .5, 1, 5, 10)
+
+if METRICS_ENABLED:
+    # Must be set before prometheus_client is imported for multiprocess mode
+    if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = os.path.join(tempfile.gettempdir(), 'resume-worker-metrics')
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+    from prometheus_client import (
+        CollectorRegistry, Counter, Histogram, generate_latest, multiprocess, start_http_server,
+    )
+
+    STAGE_SECONDS = Histogram(
+        'resume_stage_seconds', 'Time spent in each resume processing stage',
+        ['stage'], buckets=_STAGE_BUCKETS,
+    )
+    DOCUMENT_BYTES = Histogram(
+        'resume_document_bytes', 'Size of processed resume files in bytes',
+        ['format'], buckets=_BYTES_BUCKETS,
+    )
+    DOCUMENT_CHARS = Histogram(
+        'resume_document_chars', 'Length of cleaned resume text in characters',
+        buckets=_CHARS_BUCKETS,
+    )
+    DOCUMENT_PAGES = Histogram(
+        'resume_document_pages', 'Pages per processed PDF resume',
+        buckets=_PAGES_BUCKETS,
+    )
+    TASKS = Counter(
+        'resume_tasks', 'Resume tasks by outcome (completed, cached, near_duplicate, queued, failed)',
+        ['status'],
+    )
+    FAILURES = Counter(
+        'resume_failures', 'Failed resumes by reason',
+        ['reason'],
+    )
+    MONGO_CHECKOUT_SECONDS = Histogram(
+        'mongo_pool_checkout_seconds', 'Time spent waiting to check a connection out of the Mongo pool',
+        buckets=_CHECKOUT_BUCKETS,
+    )
+    MONGO_CHECKOUT_FAILURES = Counter(
+        'mongo_pool_checkout_failures', 'Failed Mongo pool checkouts by reason',
+        ['reason'],
+    )
+
+# Observations this process holds back for its parent (see hold_observations)
+_held = None
+
+
+@contextmanager
+def time_stage(stage):
+    """
+    Time a block and record it under resume_stage_seconds{stage}.
+    Recorded even when the block raises or a generator is closed early.
+    """
+    if not METRICS_ENABLED:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def observe_stage(stage, seconds):
+    """
+    Record an already measured stage duration.
+    """
+    if not METRICS_ENABLED:
+        return
+
+    if _held is not None:
+        _held.append(('stage', stage, seconds))
+    else:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def observe_document(file_format=None, size_bytes=None, chars=None, pages=None):
+    """
+    Record the size of a processed document. Omitted values are skipped.
+    """
+    if not METRICS_ENABLED:
+        return
+
+    if _held is not None:
+        _held.append(('document', file_format, size_bytes, chars, pages))
+        return
+
+    if size_bytes is not None:
+        DOCUMENT_BYTES.labels(file_format or 'unknown').observe(size_bytes)
+    if chars is not None:
+        DOCUMENT_CHARS.observe(chars)
+    if pages is not None:
+        DOCUMENT_PAGES.observe(pages)
+
+
+def hold_observations():
+    """
+    Keep this process's stage and document observations in memory instead
+    of recording them. For short-lived children such as the extraction
+    sandbox: every process that records writes its own samples file under
+    PROMETHEUS_MULTIPROC_DIR, and those files are never removed, so the
+    child sends the list back and its parent records it with
+    record_observations().
+
+    Returns:
+        list: Filled with the observations made from now on
+    """
+    global _held
+
+    _held = []
+    return _held
+
+
+def record_observations(observations):
+    """
+    Record observations held back by a child process (see hold_observations).
+    """
+    for kind, *values in observations:
+        if kind == 'stage':
+            observe_stage(*values)
+        else:
+            observe_document(*values)
+
+
+def record_task(status):
+    """
+    Count a finished task by outcome.
+    """
+    if METRICS_ENABLED:
+        TASKS.labels(status).inc()
+
+
+def failure_reason(error):
+    """
+    Map an exception to a low-cardinality failure reason label.
+    """
+    # Errors may carry their own label (e.g. extraction sandbox limits)
+    reason = getattr(error, 'failure_reason', None)
+    if reason:
+        return reason
+    if isinstance(error, FileNotFoundError):
+        return 'file_not_found'
+    if isinstance(error, NotImplementedError):
+        return 'unsupported_format'
+    if isinstance(error, ValueError):
+        return 'validation'
+    if isinstance(error, TimeoutError):
+        return 'timeout'
+    return type(error).__name__.lower()
+
+
+def record_failure(error):
+    """
+    Count a failed resume under its failure reason.
+    """
+    if METRICS_ENABLED:
+        TASKS.labels('failed').inc()
+        FAILURES.labels(failure_reason(error)).inc()
+
+
+def observe_mongo_checkout(seconds):
+    """
+    Record the wait for a Mongo connection pool checkout.
+    """
+    if METRICS_ENABLED:
+        MONGO_CHECKOUT_SECONDS.observe(seconds)
+
+
+def record_mongo_checkout_failure(reason):
+    """
+    Count a failed Mongo pool checkout ('timeout', 'connectionError', 'poolClosed').
+    """
+    if METRICS_ENABLED:
+        MONGO_CHECKOUT_FAILURES.labels(str(reason)).inc()
+
+
+def _multiprocess_registry():
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics():
+    """
+    Aggregate metrics of every worker process in Prometheus text format.
+
+    Returns:
+        str: Exposition text ('' when metrics are disabled)
+    """
+    if not METRICS_ENABLED:
+        return ''
+    return generate_latest(_multiprocess_registry()).decode('utf-8')
+
+
+def start_metrics_server():
+    """
+    Reset the multiprocess directory and serve /metrics from this process.
+    Called once in the parent worker before pool children start.
+    """
+    if not METRICS_ENABLED:
+        return
+
+    # Samples left by a previous run would be added to this run's totals
+    multiproc_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    for name in os.listdir(multiproc_dir):
+        path = os.path.join(multiproc_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT, registry=_multiprocess_registry())
+        logger.info(f"📈 Metrics endpoint listening on :{METRICS_PORT}/metrics")
+
+
+def mark_process_dead(pid):
+    """
+    Drop a finished pool child's live-only samples.
+    """
+    if METRICS_ENABLED:
+        multiprocess.mark_process_dead(pid)
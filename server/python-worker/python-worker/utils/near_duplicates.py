@@ -0,0 +1,680 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH.
+
+The result cache only catches byte-identical uploads. Re-uploads with one
+edited line or a changed date, and resumes filled into the same template,
+produce different bytes but almost the same text. After clean_text every
+resume gets a MinHash signature: NEAR_DUP_NUM_PERM minimums of seeded
+hashes over its word shingles (NEAR_DUP_SHINGLE_SIZE words). The share of
+equal positions in two signatures estimates the Jaccard similarity of
+their shingle sets.
+
+Signatures are split into NEAR_DUP_BANDS bands; resumes sharing any band
+are candidates and are verified against their full signatures. Each
+process keeps the band hashes in one sorted array (plus a dict of recent
+additions), so a lookup is one binary search per band and stays well
+under a millisecond. One edited line of a 40-line resume
+leaves an estimated similarity around 0.93; unrelated resumes from the
+same template rarely pass 0.5.
+
+Storage (NEAR_DUP_BACKEND):
+- 'none': detection disabled (default)
+- 'local': append-only signature log at NEAR_DUP_PATH, shared by the
+  worker processes of one host; each process reads the records appended
+  since its last lookup
+- 'mongo': 'resumesignatures' collection, shared by all workers; each
+  process folds in signatures written since its last refresh at most
+  every NEAR_DUP_REFRESH_SECONDS
+
+A resume whose best completed match reaches NEAR_DUP_REUSE_THRESHOLD
+reuses that resume's skills and scores instead of being analyzed, when
+they were produced by the current skills dictionary and rubric. Changing
+NEAR_DUP_NUM_PERM or NEAR_DUP_SHINGLE_SIZE invalidates stored signatures
+(python -m scripts.near_duplicate_report --backfill --rebuild).
+"""
+
+import os
+import re
+import time
+import zlib
+import logging
+import tempfile
+from datetime import datetime, timedelta, timezone
+from bson import Binary, ObjectId
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUP_BACKEND = os.getenv('NEAR_DUP_BACKEND', 'none').lower()
+NEAR_DUP_PATH = os.getenv('NEAR_DUP_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'near_duplicates.sig'
+)
+NEAR_DUP_NUM_PERM = int(os.getenv('NEAR_DUP_NUM_PERM', '128'))
+NEAR_DUP_BANDS = int(os.getenv('NEAR_DUP_BANDS', '16'))
+NEAR_DUP_SHINGLE_SIZE = int(os.getenv('NEAR_DUP_SHINGLE_SIZE', '3'))
+
+# Estimated similarity at which a prior result is reused (above 1 disables reuse)
+NEAR_DUP_REUSE_THRESHOLD = float(os.getenv('NEAR_DUP_REUSE_THRESHOLD', '0.9'))
+
+# Similarity at which two resumes belong to the same reported cluster
+NEAR_DUP_CLUSTER_THRESHOLD = float(os.getenv('NEAR_DUP_CLUSTER_THRESHOLD', '0.8'))
+
+# How often a process folds in signatures written by others ('mongo')
+NEAR_DUP_REFRESH_SECONDS = float(os.getenv('NEAR_DUP_REFRESH_SECONDS', '5'))
+
+NEAR_DUP_COLLECTION = 'resumesignatures'
+
+if NEAR_DUP_NUM_PERM % NEAR_DUP_BANDS:
+    raise ValueError(
+        f"NEAR_DUP_NUM_PERM ({NEAR_DUP_NUM_PERM}) must be a multiple of NEAR_DUP_BANDS ({NEAR_DUP_BANDS})"
+    )
+
+# Permutations are seeded so every process computes the same signatures
+_SEED = 0x5EED
+_MAX_PERM = 1024
+_rng = np.random.default_rng(_SEED)
+_PERM_A = _rng.integers(1, 2 ** 63, size=_MAX_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 63, size=_MAX_PERM, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 2 ** 63, size=_MAX_PERM, dtype=np.uint64) | np.uint64(1)
+_BAND_SALT = _rng.integers(0, 2 ** 63, size=_MAX_PERM, dtype=np.uint64)
+_SHINGLE_MIX = _rng.integers(1, 2 ** 63, size=64, dtype=np.uint64) | np.uint64(1)
+del _rng
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Shingles hashed per step of minhash_signature
+_SIGN_BLOCK = 4096
+
+# Recent additions are kept in a dict until this many, then merged into the sorted array
+_MERGE_EVERY = 4096
+
+# Signature log: header (magic, num_perm, shingle size), then fixed-size
+# records of a 12-byte resume id and num_perm little-endian uint32
+_LOG_MAGIC = b'MINHASH1'
+_LOG_HEADER_BYTES = 16
+
+# Writers stamp updatedAt with their own clock; catch-up re-reads this far back
+_CATCH_UP_OVERLAP = timedelta(seconds=60)
+
+# Near-duplicate index (loaded once per process)
+_index = None
+
+
+def minhash_signature(text, num_perm=NEAR_DUP_NUM_PERM, shingle_size=NEAR_DUP_SHINGLE_SIZE):
+    """
+    MinHash signature of a cleaned resume text.
+
+    Args:
+        text (str): Output of clean_text
+        num_perm (int): Signature length
+        shingle_size (int): Words per shingle
+
+    Returns:
+        np.ndarray | None: uint32 signature, or None for text without words
+    """
+    tokens = _TOKEN_RE.findall(text.lower()) if text else []
+    if not tokens:
+        return None
+
+    token_hashes = np.fromiter(
+        (zlib.crc32(token.encode('utf-8')) for token in tokens), dtype=np.uint64, count=len(tokens)
+    )
+    width = min(shingle_size, len(tokens))
+    count = len(tokens) - width + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        shingles += token_hashes[offset:offset + count] * _SHINGLE_MIX[offset]
+    shingles = np.unique(shingles)
+
+    # Multiply-shift hash per permutation, minimum over the shingles. A
+    # block of shingles at a time bounds memory to _SIGN_BLOCK x num_perm
+    # however long the text is
+    perm_a, perm_b = _PERM_A[:num_perm], _PERM_B[:num_perm]
+    signature = np.full(num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+    hashed = np.empty((min(len(shingles), _SIGN_BLOCK), num_perm), dtype=np.uint64)
+    for start in range(0, len(shingles), _SIGN_BLOCK):
+        block = shingles[start:start + _SIGN_BLOCK, None]
+        out = hashed[:len(block)]
+        np.multiply(block, perm_a, out=out)
+        out += perm_b
+        out >>= np.uint64(32)
+        np.minimum(signature, out.min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def signature_similarity(first, second):
+    """
+    Estimated Jaccard similarity of two signatures.
+    """
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+def band_hashes(signatures, bands=NEAR_DUP_BANDS):
+    """
+    One 64-bit hash per band of each signature, salted per band so all
+    bands can share one sorted array.
+
+    Args:
+        signatures (np.ndarray): (n, num_perm) uint32
+
+    Returns:
+        np.ndarray: (n, bands) uint64
+    """
+    rows = signatures.shape[1] // bands
+    grouped = signatures.reshape(len(signatures), bands, rows).astype(np.uint64)
+    return (grouped * _BAND_MIX[:rows]).sum(axis=2, dtype=np.uint64) + _BAND_SALT[:bands]
+
+
+class LshIndex:
+    """
+    In-memory MinHash LSH index. Row i holds one resume's signature; a
+    re-signed resume gets a new row and its old row is marked dead.
+    """
+
+    def __init__(self, num_perm=NEAR_DUP_NUM_PERM, bands=NEAR_DUP_BANDS):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.size = 0
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self.live = np.zeros(0, dtype=bool)
+        self.resume_ids = []
+        self.rows = {}
+        # Band hashes of all merged rows, sorted, and the rows they belong to
+        self.keys = np.zeros(0, dtype=np.uint64)
+        self.key_rows = np.zeros(0, dtype=np.int64)
+        # Band hash -> rows, for rows added since the last merge
+        self.pending = {}
+        self.pending_count = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _grow(self, needed):
+        if needed <= len(self.signatures):
+            return
+        capacity = max(needed, 2 * len(self.signatures), 1024)
+        signatures = np.zeros((capacity, self.num_perm), dtype=np.uint32)
+        signatures[:self.size] = self.signatures[:self.size]
+        live = np.zeros(capacity, dtype=bool)
+        live[:self.size] = self.live[:self.size]
+        self.signatures, self.live = signatures, live
+
+    def add(self, resume_id, signature):
+        """
+        Add or replace a resume's signature (no-op if unchanged).
+
+        Args:
+            resume_id (str | ObjectId): ResumeResult _id
+            signature (np.ndarray): Output of minhash_signature
+        """
+        resume_id = str(resume_id)
+        previous = self.rows.get(resume_id)
+        if previous is not None:
+            if np.array_equal(self.signatures[previous], signature):
+                return
+            self.live[previous] = False
+
+        self._grow(self.size + 1)
+        row = self.size
+        self.signatures[row] = signature
+        self.live[row] = True
+        self.resume_ids.append(resume_id)
+        self.rows[resume_id] = row
+        self.size += 1
+
+        for band_hash in band_hashes(self.signatures[row:row + 1], self.bands)[0].tolist():
+            self.pending.setdefault(band_hash, []).append(row)
+        self.pending_count += 1
+        if self.pending_count >= _MERGE_EVERY:
+            self.merge()
+
+    def merge(self):
+        """
+        Merge recent additions into the sorted band hash array.
+        """
+        if not self.pending:
+            return
+        hashes = np.fromiter(
+            (band_hash for band_hash, rows in self.pending.items() for _ in rows), dtype=np.uint64
+        )
+        rows = np.fromiter((row for rows in self.pending.values() for row in rows), dtype=np.int64)
+        order = np.argsort(hashes, kind='stable')
+        positions = np.searchsorted(self.keys, hashes[order], side='right')
+        self.keys = np.insert(self.keys, positions, hashes[order])
+        self.key_rows = np.insert(self.key_rows, positions, rows[order])
+        self.pending = {}
+        self.pending_count = 0
+
+    def candidates(self, signature):
+        """
+        Live rows sharing at least one band with a signature.
+
+        Returns:
+            np.ndarray: Row numbers
+        """
+        hashes = band_hashes(signature[None, :], self.bands)[0]
+        starts = self.keys.searchsorted(hashes, side='left')
+        ends = self.keys.searchsorted(hashes, side='right')
+        found = [self.key_rows[start:end] for start, end in zip(starts, ends) if end > start]
+        if self.pending:
+            for band_hash in hashes.tolist():
+                rows = self.pending.get(band_hash)
+                if rows:
+                    found.append(np.asarray(rows, dtype=np.int64))
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.unique(np.concatenate(found))
+        return rows[self.live[rows]]
+
+    def lookup(self, signature, threshold, exclude=None, limit=10):
+        """
+        Indexed resumes whose estimated similarity reaches threshold.
+
+        Args:
+            signature (np.ndarray): Output of minhash_signature
+            threshold (float): Minimum estimated similarity
+            exclude (str, optional): Resume id left out (the resume itself)
+            limit (int): Maximum matches
+
+        Returns:
+            list: (resume_id, similarity) pairs, most similar first
+        """
+        rows = self.candidates(signature)
+        if not len(rows):
+            return []
+        similarity = np.count_nonzero(self.signatures[rows] == signature, axis=1) / self.num_perm
+        keep = similarity >= threshold
+        rows, similarity = rows[keep], similarity[keep]
+        order = np.argsort(-similarity, kind='stable')
+        matches = []
+        for position in order:
+            resume_id = self.resume_ids[rows[position]]
+            if resume_id != exclude:
+                matches.append((resume_id, round(float(similarity[position]), 4)))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def clusters(self, threshold, min_size=2):
+        """
+        Groups of resumes connected by verified near-duplicate pairs.
+        Within every band bucket, live members are compared to the
+        bucket's first one.
+
+        Args:
+            threshold (float): Minimum estimated similarity of a pair
+            min_size (int): Smallest cluster returned
+
+        Returns:
+            list: Clusters (lists of resume ids), largest first
+        """
+        self.merge()
+        parent = np.arange(self.size)
+
+        def find(row):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        live = self.live[self.key_rows]
+        keys, rows = self.keys[live], self.key_rows[live]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        shared = ends - starts > 1
+        for start, end in zip(starts[shared], ends[shared]):
+            members = rows[start:end]
+            similarity = np.count_nonzero(
+                self.signatures[members[1:]] == self.signatures[members[0]], axis=1
+            ) / self.num_perm
+            root = find(members[0])
+            for member in members[1:][similarity >= threshold]:
+                other = find(member)
+                if other != root:
+                    parent[other] = root
+
+        groups = {}
+        for row in np.flatnonzero(self.live[:self.size]):
+            groups.setdefault(find(row), []).append(self.resume_ids[row])
+        clusters = [members for members in groups.values() if len(members) >= min_size]
+        clusters.sort(key=len, reverse=True)
+        return clusters
+
+
+class NearDuplicateIndex:
+    """
+    Disabled near-duplicate index ('none' backend). Other backends keep an
+    LshIndex in memory and persist signatures in their store.
+    """
+
+    name = 'none'
+    enabled = False
+
+    def signature(self, text):
+        return None
+
+    def lookup(self, signature, threshold, exclude=None, limit=10):
+        return []
+
+    def add(self, resume_id, signature):
+        pass
+
+    def refresh(self, force=False):
+        pass
+
+    def clusters(self, threshold=NEAR_DUP_CLUSTER_THRESHOLD, min_size=2):
+        return []
+
+
+class _StoredNearDuplicateIndex(NearDuplicateIndex):
+    """
+    Near-duplicate index backed by an LshIndex, synced with a store.
+    Subclasses implement _read_new() and _write().
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.lsh = LshIndex()
+        self.refreshed_at = 0.0
+
+    def signature(self, text):
+        return minhash_signature(text)
+
+    def lookup(self, signature, threshold, exclude=None, limit=10):
+        if signature is None:
+            return []
+        self.refresh()
+        return self.lsh.lookup(signature, threshold, exclude=str(exclude) if exclude else None, limit=limit)
+
+    def add(self, resume_id, signature):
+        if signature is None:
+            return
+        self._write(resume_id, signature)
+        self.lsh.add(resume_id, signature)
+
+    def refresh(self, force=False):
+        for resume_id, signature in self._read_new():
+            self.lsh.add(resume_id, signature)
+        self.refreshed_at = time.monotonic()
+
+    def clusters(self, threshold=NEAR_DUP_CLUSTER_THRESHOLD, min_size=2):
+        self.refresh(force=True)
+        return self.lsh.clusters(threshold, min_size)
+
+
+class LocalNearDuplicateIndex(_StoredNearDuplicateIndex):
+    """
+    Signatures in an append-only log file. Every record is written with a
+    single O_APPEND write, so the processes of a host can share the file.
+    A process reads its own records back too; re-adding an unchanged
+    signature is a no-op.
+    """
+
+    name = 'local'
+
+    def __init__(self, path=NEAR_DUP_PATH):
+        super().__init__()
+        self.path = path
+        self.record_bytes = 12 + 4 * NEAR_DUP_NUM_PERM
+        self.offset = _LOG_HEADER_BYTES
+        self._create()
+
+    def _header(self):
+        return _LOG_MAGIC + np.array([NEAR_DUP_NUM_PERM, NEAR_DUP_SHINGLE_SIZE], dtype='<u4').tobytes()
+
+    def _create(self):
+        if not os.path.exists(self.path):
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.near_duplicates-')
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    temp_file.write(self._header())
+                # link fails if another process created the log meanwhile
+                os.link(temp_path, self.path)
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(temp_path)
+
+        with open(self.path, 'rb') as log_file:
+            header = log_file.read(_LOG_HEADER_BYTES)
+        if header != self._header():
+            raise ValueError(
+                f"Signature log {self.path} was written with other NEAR_DUP_NUM_PERM / "
+                f"NEAR_DUP_SHINGLE_SIZE settings; move it away and re-run the backfill"
+            )
+
+    def _read_new(self):
+        size = os.path.getsize(self.path)
+        complete = (size - self.offset) // self.record_bytes * self.record_bytes
+        if complete <= 0:
+            return
+        with open(self.path, 'rb') as log_file:
+            log_file.seek(self.offset)
+            data = log_file.read(complete)
+        self.offset += complete
+
+        records = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.record_bytes)
+        signatures = records[:, 12:].copy().view('<u4')
+        for record, signature in zip(records, signatures):
+            yield str(ObjectId(record[:12].tobytes())), signature
+
+    def _write(self, resume_id, signature):
+        record = ObjectId(str(resume_id)).binary + np.asarray(signature, dtype='<u4').tobytes()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, record)
+        finally:
+            os.close(fd)
+
+
+class MongoNearDuplicateIndex(_StoredNearDuplicateIndex):
+    """
+    Signatures in the 'resumesignatures' collection:
+    {_id: resumeId, sig: Binary(uint32 LE), numPerm, shingleSize, updatedAt}.
+    """
+
+    name = 'mongo'
+
+    def __init__(self, db=None):
+        super().__init__()
+        if db is None:
+            from utils.db import get_db
+            db = get_db()
+        self.collection = db[NEAR_DUP_COLLECTION]
+        self.collection.create_index('updatedAt')
+        self.synced_until = None
+
+    def _read_new(self):
+        query = {'numPerm': NEAR_DUP_NUM_PERM, 'shingleSize': NEAR_DUP_SHINGLE_SIZE}
+        if self.synced_until is not None:
+            query['updatedAt'] = {'$gte': self.synced_until - _CATCH_UP_OVERLAP}
+        cursor = self.collection.find(query, {'sig': 1, 'updatedAt': 1}).sort('updatedAt', 1)
+        for document in cursor:
+            updated_at = document['updatedAt']
+            if self.synced_until is None or updated_at > self.synced_until:
+                self.synced_until = updated_at
+            yield str(document['_id']), np.frombuffer(bytes(document['sig']), dtype='<u4')
+
+    def _write(self, resume_id, signature):
+        self.collection.replace_one(
+            {'_id': ObjectId(str(resume_id))},
+            {
+                'sig': Binary(np.asarray(signature, dtype='<u4').tobytes()),
+                'numPerm': NEAR_DUP_NUM_PERM,
+                'shingleSize': NEAR_DUP_SHINGLE_SIZE,
+                'updatedAt': datetime.now(timezone.utc),
+            },
+            upsert=True
+        )
+
+    def refresh(self, force=False):
+        if force or time.monotonic() - self.refreshed_at >= NEAR_DUP_REFRESH_SECONDS:
+            super().refresh(force)
+
+
+_BACKENDS = {
+    'none': NearDuplicateIndex,
+    'local': LocalNearDuplicateIndex,
+    'mongo': MongoNearDuplicateIndex,
+}
+
+
+def get_near_duplicate_index():
+    """
+    Get the configured near-duplicate index (created once per process).
+
+    Returns:
+        NearDuplicateIndex: Index backend instance
+
+    Raises:
+        ValueError: If NEAR_DUP_BACKEND is unknown
+    """
+    global _index
+
+    if _index is not None:
+        return _index
+
+    if NEAR_DUP_BACKEND not in _BACKENDS:
+        raise ValueError(
+            f"Unknown near-duplicate backend: {NEAR_DUP_BACKEND}. "
+            f"Supported backends: {', '.join(_BACKENDS)}"
+        )
+
+    _index = _BACKENDS[NEAR_DUP_BACKEND]()
+    if _index.enabled:
+        _index.refresh(force=True)
+        logger.info(f"🧬 Near-duplicate index ({_index.name}): {len(_index.lsh)} signatures")
+    return _index
+
+
+def find_reusable_result(signature, resume_id=None, db=None):
+    """
+    Stored result of the most similar completed near-duplicate, if it
+    reaches NEAR_DUP_REUSE_THRESHOLD and was produced by the current
+    skills dictionary and rubric.
+
+    Args:
+        signature (np.ndarray | None): Output of NearDuplicateIndex.signature
+        resume_id (str, optional): The resume being analyzed (never matched)
+        db (Database, optional): Database to use (default get_db())
+
+    Returns:
+        dict | None: skills, atsScore, missingSkills, scoringBreakdown,
+            features and duplicateOf ({resumeId, similarity})
+    """
+    if signature is None or NEAR_DUP_REUSE_THRESHOLD > 1:
+        return None
+
+    matches = get_near_duplicate_index().lookup(signature, NEAR_DUP_REUSE_THRESHOLD, exclude=resume_id, limit=5)
+    if not matches:
+        return None
+
+    from utils.ats_engine import RUBRIC_VERSION, FEATURES_VERSION
+    from utils.skills_data import SKILLS_VERSION
+    from utils.feature_store import decode_skill_ids
+
+    if db is None:
+        from utils.db import get_db
+        db = get_db()
+    documents = {str(document['_id']): document for document in db['resumeresults'].find(
+        {
+            '_id': {'$in': [ObjectId(match_id) for match_id, _ in matches]},
+            'status': 'completed',
+            'features.v': FEATURES_VERSION,
+            'skillsVersion': SKILLS_VERSION,
+            'rubricVersion': RUBRIC_VERSION,
+        },
+        {'skills': 1, 'atsScore': 1, 'missingSkills': 1, 'scoringBreakdown': 1, 'features': 1}
+    )}
+
+    for match_id, similarity in matches:
+        document = documents.get(match_id)
+        if document is None:
+            continue
+        return {
+            'skills': document.get('skills') or [],
+            'atsScore': document['atsScore'],
+            'missingSkills': document.get('missingSkills') or [],
+            'scoringBreakdown': document['scoringBreakdown'],
+            'features': {
+                'v': document['features']['v'],
+                'skillIds': decode_skill_ids(document['features']['skillIds']),
+                'ats': document['features']['ats'],
+            },
+            'duplicateOf': {'resumeId': match_id, 'similarity': similarity},
+        }
+    return None
+
+
+def remember_signature(resume_id, signature):
+    """
+    Add a resume's signature to the index (no-op when disabled).
+    """
+    if resume_id and signature is not None:
+        get_near_duplicate_index().add(resume_id, signature)
+
+
+def duplicate_cluster_report(threshold=NEAR_DUP_CLUSTER_THRESHOLD, min_size=2, limit=100, db=None):
+    """
+    Near-duplicate clusters of the indexed resumes, with their owners.
+
+    Args:
+        threshold (float): Minimum estimated similarity of a pair
+        min_size (int): Smallest cluster reported
+        limit (int): Clusters listed (largest first); totals cover all
+        db (Database, optional): Database to use (default get_db())
+
+    Returns:
+        dict: resumes (indexed), clusters, duplicates (resumes in
+            clusters), sameUserClusters, topClusters [{size, resumeIds,
+            userIds}] and tookMs
+    """
+    index = get_near_duplicate_index()
+    if not index.enabled:
+        raise ValueError("Near-duplicate detection is disabled (NEAR_DUP_BACKEND=none)")
+
+    start = time.perf_counter()
+    clusters = index.clusters(threshold, min_size)
+
+    if db is None:
+        from utils.db import get_db
+        db = get_db()
+    members = [ObjectId(resume_id) for cluster in clusters for resume_id in cluster]
+    owners = {}
+    for offset in range(0, len(members), 10000):
+        for document in db['resumeresults'].find({'_id': {'$in': members[offset:offset + 10000]}}, {'userId': 1}):
+            owners[str(document['_id'])] = str(document.get('userId'))
+
+    same_user = 0
+    top_clusters = []
+    for position, cluster in enumerate(clusters):
+        user_ids = sorted({owners[resume_id] for resume_id in cluster if resume_id in owners})
+        if len(user_ids) == 1:
+            same_user += 1
+        if position < limit:
+            top_clusters.append({'size': len(cluster), 'resumeIds': cluster, 'userIds': user_ids})
+
+    return {
+        'resumes': len(index.lsh),
+        'clusters': len(clusters),
+        'duplicates': len(members),
+        'sameUserClusters': same_user,
+        'topClusters': top_clusters,
+        'tookMs': round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def _reset_after_fork():
+    # Mongo backends hold collections a forked child must not share
+    global _index
+    _index = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,264 @@
+"""
+OCR for image-only PDF pages and image uploads, with local Tesseract.
+
+Text extraction (utils.text_extractor) notes PDF pages that have (almost)
+no text layer but draw an image; checking the page's XObject resources
+costs nothing next to extracting its text. When such pages make up most
+of the document, or its text layer is too short to be the resume
+(needs_ocr), the document raises OcrRequired instead of coming back
+(nearly) empty; so do image uploads. The resume then continues on
+OCR_QUEUE (see tasks.ocr_tasks), so minutes of OCR never hold a slot that
+text-layer resumes are waiting for.
+
+Only the image-only pages are rasterized (pdftoppm, one page per call)
+and OCRed (tesseract), OCR_PAGE_WORKERS pages at a time; the text layer of
+the other pages is kept as extracted. Both tools are local binaries
+(poppler-utils, tesseract-ocr) run as subprocesses, so no document leaves
+the worker and a stuck page is killed after OCR_PAGE_TIMEOUT_SECONDS.
+"""
+
+import os
+import logging
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from utils.metrics import time_stage
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OCR_ENABLED = os.getenv('OCR_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+OCR_QUEUE = 'resume_ocr_queue'
+OCR_TESSERACT_CMD = os.getenv('OCR_TESSERACT_CMD', 'tesseract')
+OCR_PDFTOPPM_CMD = os.getenv('OCR_PDFTOPPM_CMD', 'pdftoppm')
+OCR_LANGUAGES = os.getenv('OCR_LANGUAGES', 'eng')
+OCR_DPI = int(os.getenv('OCR_DPI', '300'))
+OCR_MAX_PAGES = int(os.getenv('OCR_MAX_PAGES', '10'))
+OCR_PAGE_WORKERS = int(os.getenv('OCR_PAGE_WORKERS', '0') or 0)
+OCR_PAGE_TIMEOUT_SECONDS = float(os.getenv('OCR_PAGE_TIMEOUT_SECONDS', '60'))
+
+# A PDF page with fewer extracted characters than this that draws an
+# image is treated as a scan
+OCR_MIN_PAGE_CHARS = int(os.getenv('OCR_MIN_PAGE_CHARS', '20'))
+
+# A PDF with such pages is only OCRed when they are the majority of its
+# pages or its whole text layer is shorter than this; otherwise the text
+# layer is kept (e.g. a text resume with a photo cover page)
+OCR_MIN_TEXT_CHARS = int(os.getenv('OCR_MIN_TEXT_CHARS', '200'))
+
+# Image uploads OCRed as a whole
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+# Number of Celery worker processes sharing this host (Celery defaults to one per CPU)
+WORKER_CONCURRENCY = int(os.getenv('CELERY_WORKER_CONCURRENCY', '0') or 0) or None
+
+
+class OcrRequired(Exception):
+    """
+    The document needs OCR: an image upload, or a PDF with image-only pages.
+
+    Attributes:
+        pages (list | None): Image-only PDF pages (1-based), None for an image
+        page_texts (list | None): Extracted text of every PDF page, in page
+            order ('' or a few characters for image-only pages)
+    """
+
+    def __init__(self, pages=None, page_texts=None):
+        if pages is None:
+            message = "Image upload needs OCR"
+        else:
+            message = f"{len(pages)} of {len(page_texts)} PDF pages have no text layer"
+        super().__init__(message)
+        self.pages = pages
+        self.page_texts = page_texts
+
+    def __reduce__(self):
+        # Re-raised across the extraction sandbox's pickle boundary
+        return (OcrRequired, (self.pages, self.page_texts))
+
+
+def page_has_images(page, depth=2):
+    """
+    Whether a PyPDF2 page draws an image XObject, directly or through form
+    XObjects up to depth levels deep. Only dictionaries are read; no
+    stream is decoded.
+    """
+    resources = page.get('/Resources')
+    resources = resources.get_object() if resources is not None else None
+    xobjects = resources.get('/XObject') if resources else None
+    if not xobjects:
+        return False
+
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        subtype = xobject.get('/Subtype')
+        if subtype == '/Image':
+            return True
+        if subtype == '/Form' and depth > 0 and page_has_images(xobject, depth - 1):
+            return True
+    return False
+
+
+def needs_ocr(image_pages, page_texts):
+    """
+    Whether a PDF's text layer is insufficient and its image-only pages
+    should be OCRed.
+
+    Args:
+        image_pages (list): Image-only pages (1-based)
+        page_texts (list): Extracted text of every page, in page order
+
+    Returns:
+        bool: True if image-only pages are a majority of the pages or the
+        text layer has fewer than OCR_MIN_TEXT_CHARS characters
+    """
+    if not image_pages:
+        return False
+    if 2 * len(image_pages) > len(page_texts):
+        return True
+    return sum(len(text.strip()) for text in page_texts) < OCR_MIN_TEXT_CHARS
+
+
+def get_ocr_worker_count():
+    """
+    Pages OCRed at once by one worker process. Tesseract runs single
+    threaded (OMP_THREAD_LIMIT=1), so the host's CPUs are split across
+    the Celery worker processes like the PDF page-extraction pool.
+
+    Returns:
+        int: Concurrent pages
+    """
+    if OCR_PAGE_WORKERS > 0:
+        return OCR_PAGE_WORKERS
+    cpu_count = os.cpu_count() or 1
+    return max(1, cpu_count // (WORKER_CONCURRENCY or cpu_count))
+
+
+def _run_tool(command, description, input_bytes=None):
+    """
+    Run an OCR tool and return its stdout.
+    """
+    try:
+        completed = subprocess.run(
+            command, input=input_bytes, capture_output=True, timeout=OCR_PAGE_TIMEOUT_SECONDS,
+            env={**os.environ, 'OMP_THREAD_LIMIT': '1'},
+        )
+    except FileNotFoundError:
+        # Not the document's fault: keep it out of the 'file_not_found' failures
+        raise RuntimeError(f"OCR tool not installed: {command[0]}")
+    except subprocess.TimeoutExpired:
+        raise TimeoutError(f"{description} exceeded {OCR_PAGE_TIMEOUT_SECONDS:g}s")
+
+    if completed.returncode != 0:
+        error = completed.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise RuntimeError(f"{description} failed: {error[-1] if error else completed.returncode}")
+    return completed.stdout
+
+
+def ocr_image(image_bytes, description='OCR'):
+    """
+    OCR an image (any format Tesseract reads, multi-page TIFFs included).
+
+    Args:
+        image_bytes (bytes): Image file contents
+
+    Returns:
+        str: Recognized text
+    """
+    with time_stage('ocr'):
+        output = _run_tool([OCR_TESSERACT_CMD, 'stdin', 'stdout', '-l', OCR_LANGUAGES],
+                           description, bytes(image_bytes))
+    return output.decode('utf-8', 'replace')
+
+
+def rasterize_pdf_page(pdf_path, page_number):
+    """
+    Render one PDF page as a grayscale PNG at OCR_DPI.
+
+    Returns:
+        bytes: PNG contents
+    """
+    page = str(page_number)
+    with time_stage('pdf_rasterize'):
+        return _run_tool(
+            [OCR_PDFTOPPM_CMD, '-f', page, '-l', page, '-r', str(OCR_DPI), '-gray', '-png', '-singlefile', pdf_path],
+            f"Rasterizing page {page_number}",
+        )
+
+
+def ocr_pdf_pages(pdf_path, pages):
+    """
+    Rasterize and OCR PDF pages, several at a time.
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        pages (list): Page numbers (1-based)
+
+    Returns:
+        dict: Page number -> recognized text
+    """
+    if len(pages) > OCR_MAX_PAGES:
+        logger.info(f"⏹️  OCR page limit reached ({OCR_MAX_PAGES} of {len(pages)} image-only pages)")
+        pages = pages[:OCR_MAX_PAGES]
+
+    def ocr_page(page_number):
+        return ocr_image(rasterize_pdf_page(pdf_path, page_number), f"OCR of page {page_number}")
+
+    workers = min(len(pages), get_ocr_worker_count())
+    if workers <= 1:
+        return {page_number: ocr_page(page_number) for page_number in pages}
+
+    # The work happens in the tools' processes; threads only wait on them
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(pages, pool.map(ocr_page, pages)))
+
+
+@contextmanager
+def _as_path(source, ext):
+    """
+    A path for the command-line tools: paths pass through, buffers are
+    written to a temporary file removed on exit.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        yield os.fspath(source)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=ext) as temp_file:
+        temp_file.write(source)
+        temp_file.flush()
+        yield temp_file.name
+
+
+def ocr_document(source, ext, pages=None, page_texts=None):
+    """
+    Raw text of a document that raised OcrRequired.
+
+    Args:
+        source (str | bytes | mmap): Path to the file, or its contents
+        ext (str): File extension
+        pages (list, optional): OcrRequired.pages
+        page_texts (list, optional): OcrRequired.page_texts
+
+    Returns:
+        str: Raw text (OCRed pages merged with the text layer in page order)
+    """
+    if ext in IMAGE_EXTENSIONS:
+        if isinstance(source, (str, os.PathLike)):
+            with _as_path(source, ext) as path, open(path, 'rb') as image_file:
+                return ocr_image(image_file.read())
+        return ocr_image(source)
+
+    with _as_path(source, ext) as pdf_path:
+        ocr_texts = ocr_pdf_pages(pdf_path, pages)
+
+    texts = list(page_texts)
+    for page_number, text in ocr_texts.items():
+        texts[page_number - 1] = text
+    logger.info(f"🔎 OCRed {len(ocr_texts)} of {len(texts)} PDF pages")
+    return "".join(text + "\n" for text in texts if text)
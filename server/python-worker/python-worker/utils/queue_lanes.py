@@ -0,0 +1,153 @@
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Resume parsing lanes. Each lane is its own durable queue so a worker
+# pool can be dedicated to it and bulk work never sits in front of an
+# interactive upload:
+#   interactive - user uploads (the queue the API server publishes to)
+#   small       - uploads small enough to finish in well under a second
+#   bulk        - very large uploads (e.g. 100-page PDFs), backfills and
+#                 re-processing jobs
+LANE_QUEUES = {
+    'interactive': 'resume_parse_queue',
+    'small': 'resume_small_queue',
+    'bulk': 'resume_bulk_queue',
+}
+
+# Uploads at or under this size (bytes) go to the small lane (0 = disabled)
+RESUME_SMALL_MAX_BYTES = int(os.getenv('RESUME_SMALL_MAX_BYTES', '262144') or 0)
+
+# PDFs must also have at most this many pages to use the small lane (0 = no page check)
+RESUME_SMALL_MAX_PAGES = int(os.getenv('RESUME_SMALL_MAX_PAGES', '3') or 0)
+
+# Uploads at or over this size (bytes) go to the bulk lane (0 = disabled)
+RESUME_BULK_MIN_BYTES = int(os.getenv('RESUME_BULK_MIN_BYTES', '2097152') or 0)
+
+# PDFs with at least this many pages go to the bulk lane (0 = disabled)
+RESUME_BULK_MIN_PAGES = int(os.getenv('RESUME_BULK_MIN_PAGES', '50') or 0)
+
+
+def _parse_lane_prefetch(value):
+    """
+    Parse 'lane=prefetch,...' (e.g. 'interactive=1,small=4,bulk=1').
+    """
+    prefetch = {}
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        lane, _, count = item.partition('=')
+        lane = lane.strip()
+        if lane not in LANE_QUEUES:
+            raise ValueError(f"Unknown resume lane in RESUME_LANE_PREFETCH: {lane}")
+        prefetch[lane] = max(int(count), 1)
+    return prefetch
+
+
+# Per-lane worker prefetch multiplier. A worker consuming several lanes
+# uses the smallest value among them
+RESUME_LANE_PREFETCH = _parse_lane_prefetch(os.getenv('RESUME_LANE_PREFETCH', 'interactive=1,small=4,bulk=1'))
+
+
+def _count_pdf_pages(file_path):
+    """
+    Read a PDF's page count without extracting any text.
+    """
+    from PyPDF2 import PdfReader
+
+    return len(PdfReader(file_path).pages)
+
+
+def _size_lane(size):
+    """
+    Lane for an upload of the given size in bytes, before any page check.
+    """
+    if RESUME_BULK_MIN_BYTES and size >= RESUME_BULK_MIN_BYTES:
+        return 'bulk'
+    if RESUME_SMALL_MAX_BYTES and size <= RESUME_SMALL_MAX_BYTES:
+        return 'small'
+    return 'interactive'
+
+
+def choose_lane(message):
+    """
+    Pick the lane for a parse_resume_task message.
+
+    An explicit message 'lane' wins; otherwise very large files and long
+    PDFs go to the bulk lane, small files to the small lane and everything
+    else to the interactive lane.
+
+    Args:
+        message (dict): parse_resume_task message (resumeId, userId, filePath,
+            optional blobKey and lane)
+
+    Returns:
+        str: Lane name
+    """
+    lane = message.get('lane')
+    if lane:
+        if lane not in LANE_QUEUES:
+            raise ValueError(f"Unknown resume lane: {lane}")
+        return lane
+
+    file_path = message.get('filePath')
+    blob_key = message.get('blobKey')
+    if not (file_path or blob_key):
+        return 'interactive'
+
+    try:
+        if blob_key:
+            # Sized from object metadata only; page counts would need a download
+            from utils.blob_store import get_blob_store
+            return _size_lane(get_blob_store().size(blob_key))
+
+        lane = _size_lane(os.path.getsize(file_path))
+        if lane == 'bulk' or not file_path.lower().endswith('.pdf'):
+            return lane
+
+        page_check = lane == 'small' and RESUME_SMALL_MAX_PAGES
+        if page_check or RESUME_BULK_MIN_PAGES:
+            pages = _count_pdf_pages(file_path)
+            if RESUME_BULK_MIN_PAGES and pages >= RESUME_BULK_MIN_PAGES:
+                return 'bulk'
+            if page_check and pages > RESUME_SMALL_MAX_PAGES:
+                return 'interactive'
+    except Exception as error:
+        # Unreadable here means the task will report the real error
+        logger.warning(f"⚠️  Could not size {blob_key or file_path} for lane routing: {error}")
+        return 'interactive'
+
+    return lane
+
+
+def route_resume_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router placing parse_resume_task on its lane at publish time.
+    An explicit queue passed to apply_async still takes precedence.
+    """
+    if name != 'tasks.parse_resume_task' or options.get('queue'):
+        return None
+
+    message = args[0] if args else kwargs.get('message')
+    if not isinstance(message, dict):
+        return None
+
+    return {'queue': LANE_QUEUES[choose_lane(message)]}
+
+
+def lane_prefetch_multiplier(queue_names):
+    """
+    Prefetch multiplier for a worker consuming the given queues.
+
+    Args:
+        queue_names (iterable): Queues the worker consumes
+
+    Returns:
+        int or None: Smallest configured prefetch among its lanes, or None
+            when it consumes no configured lane
+    """
+    queue_names = set(queue_names)
+    values = [prefetch for lane, prefetch in RESUME_LANE_PREFETCH.items()
+              if LANE_QUEUES[lane] in queue_names]
+    return min(values) if values else None
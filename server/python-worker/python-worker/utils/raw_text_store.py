@@ -0,0 +1,171 @@
+"""
+Storage for extracted resume text.
+
+'resumeresults' documents are read by every dashboard request but the
+extracted text is only needed when a single result is opened. With
+RAW_TEXT_STORAGE=offload the text is compressed into the 'resumerawtexts'
+side collection (keyed by the resume id) and the hot document keeps only
+an empty rawText and a small rawTextRef:
+
+    {'collection': 'resumerawtexts', 'codec': 'zlib', 'length': <chars>,
+     'compressedBytes': <bytes>}
+
+Modes (RAW_TEXT_STORAGE):
+- 'inline':  rawText stays on the resumeresults document (default)
+- 'offload': compressed side document plus rawTextRef
+
+Codecs (RAW_TEXT_CODEC): 'zlib' (standard library; also decoded by the
+Node API) or 'zstd' (needs the zstandard package; Python readers only).
+"""
+
+import os
+import zlib
+import logging
+from datetime import datetime, timezone
+from bson import Binary, ObjectId
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RAW_TEXT_STORAGE = os.getenv('RAW_TEXT_STORAGE', 'inline').lower()
+RAW_TEXT_STORAGE_MODES = ('inline', 'offload')
+RAW_TEXT_CODEC = os.getenv('RAW_TEXT_CODEC', 'zlib').lower()
+RAW_TEXT_CODECS = ('zlib', 'zstd')
+RAW_TEXT_COMPRESSION_LEVEL = int(os.getenv('RAW_TEXT_COMPRESSION_LEVEL', '6'))
+
+RAW_TEXT_COLLECTION = 'resumerawtexts'
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("RAW_TEXT_CODEC=zstd requires the 'zstandard' package")
+    return zstandard
+
+
+def compress_text(text, codec=None, level=None):
+    """
+    Compress text with the configured codec.
+
+    Args:
+        text (str): Text to compress
+        codec (str, optional): 'zlib' or 'zstd' (default RAW_TEXT_CODEC)
+        level (int, optional): Compression level (default RAW_TEXT_COMPRESSION_LEVEL)
+
+    Returns:
+        bytes: Compressed UTF-8 text
+    """
+    codec = codec or RAW_TEXT_CODEC
+    level = RAW_TEXT_COMPRESSION_LEVEL if level is None else level
+    data = text.encode('utf-8')
+
+    if codec == 'zlib':
+        return zlib.compress(data, level)
+    if codec == 'zstd':
+        return _zstd().ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Unknown RAW_TEXT_CODEC: {codec}. Expected one of {', '.join(RAW_TEXT_CODECS)}")
+
+
+def decompress_text(data, codec):
+    """
+    Reverse compress_text.
+    """
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    if codec == 'zstd':
+        return _zstd().ZstdDecompressor().decompress(data).decode('utf-8')
+    raise ValueError(f"Unknown raw text codec: {codec}")
+
+
+def _get_collection():
+    from utils.db import get_db
+    return get_db()[RAW_TEXT_COLLECTION]
+
+
+def offload_raw_text(resume_id, text, codec=None):
+    """
+    Compress text into the side collection.
+
+    Written synchronously (not through the write-behind writer) so the
+    text exists before the hot document points at it.
+
+    Args:
+        resume_id (str | ObjectId): ResumeResult _id
+        text (str): Extracted resume text
+        codec (str, optional): Codec override
+
+    Returns:
+        dict: Fields to $set on the resumeresults document
+    """
+    codec = codec or RAW_TEXT_CODEC
+    if not isinstance(resume_id, ObjectId):
+        resume_id = ObjectId(resume_id)
+
+    data = compress_text(text, codec)
+    _get_collection().replace_one(
+        {'_id': resume_id},
+        {'codec': codec, 'data': Binary(data), 'length': len(text), 'createdAt': datetime.now(timezone.utc)},
+        upsert=True
+    )
+
+    return {
+        'rawText': '',
+        'rawTextRef': {
+            'collection': RAW_TEXT_COLLECTION,
+            'codec': codec,
+            'length': len(text),
+            'compressedBytes': len(data),
+        },
+    }
+
+
+def raw_text_fields(resume_id, text):
+    """
+    Fields to store a completed resume's text under the configured mode.
+
+    Args:
+        resume_id (str | ObjectId): ResumeResult _id
+        text (str): Extracted resume text
+
+    Returns:
+        dict: {'rawText': text} inline, or the offloaded reference fields
+    """
+    if RAW_TEXT_STORAGE == 'inline':
+        return {'rawText': text, 'rawTextRef': None}
+    if RAW_TEXT_STORAGE == 'offload':
+        return offload_raw_text(resume_id, text)
+    raise ValueError(
+        f"Unknown RAW_TEXT_STORAGE: {RAW_TEXT_STORAGE}. Expected one of {', '.join(RAW_TEXT_STORAGE_MODES)}"
+    )
+
+
+def load_raw_text(resume_id, document=None):
+    """
+    Load a resume's text, from the hot document or its side document.
+
+    Args:
+        resume_id (str | ObjectId): ResumeResult _id
+        document (dict, optional): Already loaded resumeresults document
+
+    Returns:
+        str: Extracted text ('' if none was stored)
+    """
+    if not isinstance(resume_id, ObjectId):
+        resume_id = ObjectId(resume_id)
+
+    if document is None:
+        from utils.db import get_db
+        document = get_db()['resumeresults'].find_one({'_id': resume_id}, {'rawText': 1, 'rawTextRef': 1}) or {}
+
+    if not document.get('rawTextRef'):
+        return document.get('rawText') or ''
+
+    side = _get_collection().find_one({'_id': resume_id})
+    if side is None:
+        logger.warning(f"⚠️  Offloaded text missing for resume {resume_id}")
+        return ''
+    return decompress_text(bytes(side['data']), side['codec'])
@@ -0,0 +1,418 @@
+"""
+Content-addressed cache for resume analysis results.
+Keys are a SHA-256 of the uploaded file bytes plus the pipeline, skills
+dictionary, ATS rubric and feature layout versions, so re-uploads of an
+identical file skip extraction, skill matching and scoring entirely.
+
+Backends (RESULT_CACHE_BACKEND):
+- 'none':  caching disabled (default)
+- 'disk':  local directory with LRU eviction by entry count
+- 'redis': Redis keys with a sliding TTL
+- 'mongo': 'resumecache' collection with a TTL index on last access
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from pymongo.errors import DuplicateKeyError
+from utils.skills_data import SKILLS_VERSION
+from utils.ats_engine import RUBRIC_VERSION, FEATURES_VERSION
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever text extraction or cleaning changes the produced text
+PIPELINE_VERSION = "1"
+
+RESULT_CACHE_BACKEND = os.getenv('RESULT_CACHE_BACKEND', 'none').lower()
+RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'results'
+)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '10000'))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv('RESULT_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+RESULT_CACHE_REDIS_URL = os.getenv('RESULT_CACHE_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+
+# How long a worker may hold the compute lock for a key, and how long
+# others wait for its result before computing it themselves
+RESULT_CACHE_LOCK_SECONDS = int(os.getenv('RESULT_CACHE_LOCK_SECONDS', '300'))
+RESULT_CACHE_POLL_SECONDS = 0.25
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Cache backend instance (created once per process)
+_cache = None
+
+
+def hash_file(file_path):
+    """
+    Compute the SHA-256 hex digest of a file's bytes.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key_from_digest(digest):
+    """
+    Build the cache key for a resume whose SHA-256 digest is already known
+    (e.g. from its blob key).
+
+    Args:
+        digest (str): SHA-256 hex digest of the resume bytes
+
+    Returns:
+        str: Content hash combined with pipeline, dictionary, rubric and
+            feature layout versions
+    """
+    return f"{digest}-p{PIPELINE_VERSION}-s{SKILLS_VERSION}-r{RUBRIC_VERSION}-f{FEATURES_VERSION}"
+
+
+def build_cache_key(file_path):
+    """
+    Build the cache key for a resume file.
+
+    Args:
+        file_path (str): Path to the resume file
+
+    Returns:
+        str: Content hash combined with pipeline, dictionary, rubric and
+            feature layout versions
+    """
+    return cache_key_from_digest(hash_file(file_path))
+
+
+class ResultCache:
+    """
+    Base cache backend. Subclasses implement get/set and the per-key
+    compute lock used to coalesce concurrent identical uploads.
+
+    acquire(key) returns a token unique to this attempt (None if another
+    worker holds the lock), and release(key, token) only removes the lock
+    while it still holds that token: an expired lock taken over by another
+    worker is never released by its previous holder.
+    """
+
+    name = 'none'
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def acquire(self, key):
+        return uuid.uuid4().hex
+
+    def release(self, key, token):
+        pass
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached result for key, computing and storing it on a miss.
+        Only one worker computes a given key at a time; the others wait for
+        its result (up to RESULT_CACHE_LOCK_SECONDS) instead of duplicating work.
+
+        Args:
+            key (str): Cache key
+            compute (callable): Produces the JSON-serializable result
+
+        Returns:
+            tuple: (result, hit) where hit is True if the result was cached
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        deadline = time.monotonic() + RESULT_CACHE_LOCK_SECONDS
+
+        token = self.acquire(key)
+        while token is None:
+            if time.monotonic() >= deadline:
+                logger.warning(f"⚠️  Timed out waiting for cache key {key}, computing anyway")
+                return compute(), False
+            time.sleep(RESULT_CACHE_POLL_SECONDS)
+            cached = self.get(key)
+            if cached is not None:
+                return cached, True
+            token = self.acquire(key)
+
+        try:
+            # Another worker may have finished between our miss and the lock
+            cached = self.get(key)
+            if cached is not None:
+                return cached, True
+
+            result = compute()
+            try:
+                self.set(key, result)
+            except Exception as error:
+                logger.error(f"❌ Failed to store cached result: {error}")
+            return result, False
+        finally:
+            self.release(key, token)
+
+
+class DiskResultCache(ResultCache):
+    """
+    Local directory cache, sharded by the first two hex digits of the key.
+    Reads refresh the entry's mtime; the least recently used entries are
+    evicted once the cache holds more than max_entries.
+    """
+
+    name = 'disk'
+
+    # Evict at most once per this many writes to keep set() cheap
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, directory=RESULT_CACHE_DIR, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._writes = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key, suffix='.json'):
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as handle:
+                value = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(path)
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump(value, handle)
+        os.replace(temp_path, path)
+
+        self._writes += 1
+        if self._writes % self.EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries beyond max_entries.
+        """
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    entries.append((entry.stat().st_mtime, entry.path))
+
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        logger.info(f"🧹 Evicted {excess} cached results")
+
+    def _read_lock(self, path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return None
+
+    def _remove_lock(self, path, token):
+        """
+        Remove the lock at path if it holds token. The lock is renamed away
+        first, so it is checked after nobody else can still replace it; a
+        lock that turns out to be someone else's is put back.
+        """
+        moved_path = f"{path}.{uuid.uuid4().hex}.old"
+        try:
+            os.rename(path, moved_path)
+        except FileNotFoundError:
+            return
+        try:
+            if self._read_lock(moved_path) != token:
+                try:
+                    os.link(moved_path, path)
+                except FileExistsError:
+                    pass
+        finally:
+            os.remove(moved_path)
+
+    def acquire(self, key):
+        path = self._path(key, '.lock')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Take over locks left behind by crashed workers, but only the one
+        # that was found expired (read before its mtime, see _remove_lock)
+        stale_token = self._read_lock(path)
+        try:
+            if stale_token is not None and time.time() - os.path.getmtime(path) > RESULT_CACHE_LOCK_SECONDS:
+                self._remove_lock(path, stale_token)
+        except FileNotFoundError:
+            pass
+
+        # The lock appears atomically with its token already written
+        token = uuid.uuid4().hex
+        temp_path = f"{path}.{token}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            handle.write(token)
+        try:
+            os.link(temp_path, path)
+            return token
+        except FileExistsError:
+            return None
+        finally:
+            os.remove(temp_path)
+
+    def release(self, key, token):
+        self._remove_lock(self._path(key, '.lock'), token)
+
+
+class RedisResultCache(ResultCache):
+    """
+    Redis cache. Entries expire after ttl seconds without a read; the compute
+    lock is a SET NX key with its own expiry, holding the owner's token.
+    """
+
+    name = 'redis'
+    PREFIX = 'resume-cache:'
+
+    # Delete the lock only if it still holds the caller's token
+    RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url=RESULT_CACHE_REDIS_URL, ttl=RESULT_CACHE_TTL_SECONDS):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self._release = self.client.register_script(self.RELEASE_SCRIPT)
+
+    def get(self, key):
+        value = self.client.getex(self.PREFIX + key, ex=self.ttl)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.PREFIX + key, json.dumps(value), ex=self.ttl)
+
+    def acquire(self, key):
+        token = uuid.uuid4().hex
+        if self.client.set(self.PREFIX + key + ':lock', token, nx=True, ex=RESULT_CACHE_LOCK_SECONDS):
+            return token
+        return None
+
+    def release(self, key, token):
+        self._release(keys=[self.PREFIX + key + ':lock'], args=[token])
+
+
+class MongoResultCache(ResultCache):
+    """
+    MongoDB cache in the 'resumecache' collection. A TTL index on lastAccess
+    evicts entries that have not been read for ttl seconds; locks live in
+    'resumecachelocks' with their own TTL index.
+    """
+
+    name = 'mongo'
+
+    def __init__(self, ttl=RESULT_CACHE_TTL_SECONDS):
+        from utils.db import get_db
+        db = get_db()
+        self.collection = db['resumecache']
+        self.locks = db['resumecachelocks']
+        self.collection.create_index('lastAccess', expireAfterSeconds=ttl)
+        self.locks.create_index('createdAt', expireAfterSeconds=RESULT_CACHE_LOCK_SECONDS)
+
+    def get(self, key):
+        document = self.collection.find_one_and_update(
+            {'_id': key},
+            {'$set': {'lastAccess': datetime.now(timezone.utc)}}
+        )
+        return document['value'] if document else None
+
+    def set(self, key, value):
+        self.collection.replace_one(
+            {'_id': key},
+            {'value': value, 'lastAccess': datetime.now(timezone.utc)},
+            upsert=True
+        )
+
+    def acquire(self, key):
+        token = uuid.uuid4().hex
+        try:
+            self.locks.insert_one({'_id': key, 'token': token, 'createdAt': datetime.now(timezone.utc)})
+            return token
+        except DuplicateKeyError:
+            return None
+
+    def release(self, key, token):
+        self.locks.delete_one({'_id': key, 'token': token})
+
+
+_BACKENDS = {
+    'none': ResultCache,
+    'disk': DiskResultCache,
+    'redis': RedisResultCache,
+    'mongo': MongoResultCache,
+}
+
+
+def get_result_cache():
+    """
+    Get the configured result cache backend (created once per process).
+
+    Returns:
+        ResultCache: Cache backend instance
+
+    Raises:
+        ValueError: If RESULT_CACHE_BACKEND is unknown
+    """
+    global _cache
+
+    if _cache is not None:
+        return _cache
+
+    if RESULT_CACHE_BACKEND not in _BACKENDS:
+        raise ValueError(
+            f"Unknown result cache backend: {RESULT_CACHE_BACKEND}. "
+            f"Supported backends: {', '.join(_BACKENDS)}"
+        )
+
+    _cache = _BACKENDS[RESULT_CACHE_BACKEND]()
+    logger.info(f"🗄️  Result cache backend: {_cache.name}")
+    return _cache
+
+
+def _reset_after_fork():
+    # Backends hold Mongo collections or Redis connections, which a forked
+    # child must not share with its parent
+    global _cache
+    _cache = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,425 @@
+"""
+Inverted skill index over processed resumes.
+
+Answers "resumes with kafka AND python but NOT php" or "at least 3 of
+these 5 skills" without scanning resumeresults. Every indexed resume gets
+a small integer ordinal; each skill maps to a bitset with one bit per
+ordinal, so a query is a few vectorized AND / OR / NOT passes over
+ordinal_count / 8 bytes per skill (~125 KB per skill per million resumes).
+
+Storage:
+- 'skillindexentries' (Mongo) is the source of truth, one document per
+  resume: {_id: resumeId, ordinal, seq, skills}. Tasks queue entries as
+  they complete and a write-behind writer upserts them in bulk; every
+  write takes a new seq from 'skillindexcounters' (reserved per batch)
+- SKILL_INDEX_PATH holds a compressed snapshot of the bitsets (npz) and
+  the last seq it includes. A process loads the snapshot and then folds
+  in only entries with a newer seq, so start-up and refreshes are
+  incremental
+
+Bitsets are keyed by canonical skill name (aliases are folded on write
+and in queries); names, unlike skill IDs, stay valid across dictionary
+edits, so snapshots and entries never need renumbering. A resume whose
+analysis produced no skills is indexed with an empty list and drops out
+of every result.
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+from bson import ObjectId
+import numpy as np
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from utils.db import BulkWriter, get_bulk_writer
+from utils.skills_data import canonical_skill, canonical_skills
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SKILL_INDEX_ENABLED = os.getenv('SKILL_INDEX_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SKILL_INDEX_PATH = os.getenv('SKILL_INDEX_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'skill_index.npz'
+)
+
+# How often a query process folds in new entries from Mongo
+SKILL_INDEX_REFRESH_SECONDS = float(os.getenv('SKILL_INDEX_REFRESH_SECONDS', '5'))
+
+# Rewrite the snapshot once this many entries were folded in since the last one
+SKILL_INDEX_SNAPSHOT_EVERY = int(os.getenv('SKILL_INDEX_SNAPSHOT_EVERY', '10000'))
+
+SKILL_INDEX_COLLECTION = 'skillindexentries'
+SKILL_INDEX_COUNTERS = 'skillindexcounters'
+
+# seq values are taken before the entry is written, so a writer can land
+# an older seq after a reader has seen a newer one. Catch-up re-reads this
+# many seqs back and skips the ones it already applied
+_CATCH_UP_OVERLAP = 1000
+_CATCH_UP_BATCH = 10000
+
+# Set bits per byte value, for counting result sizes
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+# Query index (loaded once per process) and whether the Mongo indexes were ensured
+_index = None
+_indexes_ready = False
+
+
+class SkillIndex:
+    """
+    In-memory skill -> bitset index. Bit `ordinal` of a bitset is byte
+    ordinal >> 3, bit ordinal & 7; 'live' marks ordinals holding a resume.
+    """
+
+    def __init__(self):
+        self.capacity = 0
+        self.bitsets = {}
+        self.live = np.zeros(0, dtype=np.uint8)
+        self.resume_ids = np.zeros(0, dtype='S12')
+        self.last_seq = 0
+        # Seqs already applied within the catch-up overlap window
+        self.recent_seqs = set()
+        self.refreshed_at = 0
+        self.unsaved = 0
+
+    def __len__(self):
+        return int(_POPCOUNT[self.live].sum())
+
+    def _ensure_capacity(self, max_ordinal):
+        if max_ordinal < self.capacity:
+            return
+        capacity = max(max_ordinal + 1, self.capacity * 2, 1024)
+        capacity = (capacity + 7) & ~7
+        extra = (capacity - self.capacity) // 8
+
+        for skill, bits in self.bitsets.items():
+            self.bitsets[skill] = np.concatenate([bits, np.zeros(extra, dtype=np.uint8)])
+        self.live = np.concatenate([self.live, np.zeros(extra, dtype=np.uint8)])
+        self.resume_ids = np.concatenate([self.resume_ids, np.zeros(capacity - self.capacity, dtype='S12')])
+        self.capacity = capacity
+
+    def _bitset(self, skill):
+        bits = self.bitsets.get(skill)
+        if bits is None:
+            bits = self.bitsets[skill] = np.zeros(self.capacity // 8, dtype=np.uint8)
+        return bits
+
+    def apply(self, entries):
+        """
+        Fold index entries in, replacing whatever an ordinal held before.
+
+        Args:
+            entries (list): (ordinal, resume_id, skills) tuples; a later
+                entry for the same ordinal wins
+        """
+        latest = {}
+        for ordinal, resume_id, skills in entries:
+            latest[ordinal] = (resume_id, skills)
+        if not latest:
+            return
+
+        ordinals = np.fromiter(latest, dtype=np.int64, count=len(latest))
+        self._ensure_capacity(int(ordinals.max()))
+        positions = ordinals >> 3
+        masks = (1 << (ordinals & 7)).astype(np.uint8)
+
+        # Ordinals that already hold a resume lose their old skill bits
+        replaced = (self.live[positions] & masks) != 0
+        if replaced.any():
+            clear_positions = positions[replaced]
+            clear_masks = ~masks[replaced]
+            for bits in self.bitsets.values():
+                np.bitwise_and.at(bits, clear_positions, clear_masks)
+        np.bitwise_and.at(self.live, positions, ~masks)
+
+        by_skill = {}
+        for ordinal, (resume_id, skills) in latest.items():
+            self.resume_ids[ordinal] = ObjectId(resume_id).binary if resume_id else b''
+            for skill in skills or ():
+                skill = canonical_skill(skill)
+                if skill is not None:
+                    by_skill.setdefault(skill, []).append(ordinal)
+
+        live = np.fromiter(
+            (ordinal for ordinal, (_, skills) in latest.items() if skills), dtype=np.int64
+        )
+        np.bitwise_or.at(self.live, live >> 3, (1 << (live & 7)).astype(np.uint8))
+        for skill, skill_ordinals in by_skill.items():
+            skill_ordinals = np.array(skill_ordinals, dtype=np.int64)
+            np.bitwise_or.at(self._bitset(skill), skill_ordinals >> 3,
+                             (1 << (skill_ordinals & 7)).astype(np.uint8))
+
+    def _skill_bits(self, skill):
+        name = canonical_skill(skill)
+        if name is None:
+            raise ValueError(f"Unknown skill: {skill}")
+        bits = self.bitsets.get(name)
+        return bits if bits is not None else np.zeros(self.capacity // 8, dtype=np.uint8)
+
+    def query(self, all_of=(), any_of=(), none_of=(), at_least=None):
+        """
+        Evaluate a boolean / threshold query.
+
+        Args:
+            all_of (list): Skills a resume must have
+            any_of (list): Skills of which a resume must have at least one
+            none_of (list): Skills a resume must not have
+            at_least (tuple, optional): (k, skills) - a resume must have
+                at least k of skills
+
+        Returns:
+            numpy.ndarray: Result bitset
+
+        Raises:
+            ValueError: If a skill is not in the dictionary
+        """
+        result = self.live.copy()
+
+        for skill in all_of:
+            result &= self._skill_bits(skill)
+
+        if any_of:
+            union = np.zeros_like(result)
+            for skill in any_of:
+                union |= self._skill_bits(skill)
+            result &= union
+
+        for skill in none_of:
+            result &= ~self._skill_bits(skill)
+
+        if at_least:
+            minimum, skills = at_least
+            counts = np.zeros(self.capacity, dtype=np.uint16)
+            for skill in skills:
+                counts += np.unpackbits(self._skill_bits(skill), bitorder='little')
+            result &= np.packbits(counts >= minimum, bitorder='little')
+
+        return result
+
+    def count(self, bits):
+        """
+        Number of resumes in a result bitset.
+        """
+        return int(_POPCOUNT[bits].sum())
+
+    def resume_ids_of(self, bits, limit=None, offset=0):
+        """
+        Resume ids in a result bitset, in ordinal (indexing) order.
+        """
+        ordinals = np.flatnonzero(np.unpackbits(bits, bitorder='little'))
+        ordinals = ordinals[offset:offset + limit if limit is not None else None]
+        # numpy drops trailing NUL bytes of 'S12' items; put them back
+        return [self.resume_ids[ordinal].ljust(12, b'\0').hex() for ordinal in ordinals.tolist()]
+
+    def save(self, path=SKILL_INDEX_PATH):
+        """
+        Write a compressed snapshot atomically (temp file + rename).
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-', suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                np.savez_compressed(
+                    handle,
+                    meta=np.frombuffer(json.dumps({
+                        'lastSeq': self.last_seq,
+                        'capacity': self.capacity,
+                        'skills': list(self.bitsets),
+                    }).encode('utf-8'), dtype=np.uint8),
+                    live=self.live,
+                    resume_ids=self.resume_ids,
+                    **{f"skill_{position}": bits for position, bits in enumerate(self.bitsets.values())}
+                )
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path=SKILL_INDEX_PATH):
+        """
+        Read a snapshot written by save().
+        """
+        index = cls()
+        with np.load(path) as snapshot:
+            meta = json.loads(snapshot['meta'].tobytes().decode('utf-8'))
+            index.last_seq = meta['lastSeq']
+            index.capacity = meta['capacity']
+            index.live = snapshot['live']
+            index.resume_ids = snapshot['resume_ids']
+            index.bitsets = {skill: snapshot[f"skill_{position}"] for position, skill in enumerate(meta['skills'])}
+        return index
+
+
+def _ensure_indexes(db):
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    entries = db[SKILL_INDEX_COLLECTION]
+    entries.create_index('seq')
+    entries.create_index('ordinal', unique=True)
+    _indexes_ready = True
+
+
+def reserve_counter(db, name, count=1):
+    """
+    Atomically reserve count consecutive values of a counter.
+
+    Returns:
+        int: First reserved value
+    """
+    counter = db[SKILL_INDEX_COUNTERS].find_one_and_update(
+        {'_id': name}, {'$inc': {'value': count}}, upsert=True, return_document=True
+    )
+    return counter['value'] - count
+
+
+class SkillIndexWriter(BulkWriter):
+    """
+    Write-behind writer for index entries. A flush costs a fixed number of
+    round trips however many resumes it carries: one read of the entries
+    that already have an ordinal, one counter reservation each for the
+    batch's seqs and new ordinals, and one unordered bulk upsert.
+
+    seqs are reserved at flush time, right before the write, so catch-up's
+    overlap window still covers writers landing out of order. An ordinal
+    reserved for a resume another worker inserts meanwhile is left unused.
+    """
+
+    def _operations(self, db, document_ids, pending):
+        _ensure_indexes(db)
+        entries = db[self.collection_name]
+
+        ordinals = {entry['_id']: entry['ordinal'] for entry in entries.find(
+            {'_id': {'$in': document_ids}}, {'ordinal': 1}
+        )}
+        new_ids = [document_id for document_id in document_ids if document_id not in ordinals]
+        if new_ids:
+            first_ordinal = reserve_counter(db, 'ordinal', len(new_ids))
+            ordinals.update((document_id, first_ordinal + offset) for offset, document_id in enumerate(new_ids))
+
+        first_seq = reserve_counter(db, 'seq', len(document_ids))
+        return [
+            UpdateOne(
+                {'_id': document_id},
+                {'$set': {'skills': pending[document_id]['skills'], 'seq': first_seq + offset},
+                 '$setOnInsert': {'ordinal': ordinals[document_id]}},
+                upsert=True,
+            )
+            for offset, document_id in enumerate(document_ids)
+        ]
+
+
+def index_resume_skills(resume_id, skills):
+    """
+    Queue a resume's skills for the index entries (no-op when disabled).
+    Entries are written in bulk by this process's SkillIndexWriter, with
+    the other write-behind updates of the task.
+
+    Args:
+        resume_id (str | ObjectId): ResumeResult _id
+        skills (list): Detected skills
+    """
+    if not SKILL_INDEX_ENABLED:
+        return
+
+    writer = get_bulk_writer(SKILL_INDEX_COLLECTION, SkillIndexWriter)
+    writer.update(resume_id, {'skills': canonical_skills(skills)})
+
+
+def catch_up(index, db):
+    """
+    Fold in entries written since the index's last seq.
+
+    Returns:
+        int: Entries applied
+    """
+    cursor = db[SKILL_INDEX_COLLECTION].find(
+        {'seq': {'$gt': index.last_seq - _CATCH_UP_OVERLAP}}, {'ordinal': 1, 'seq': 1, 'skills': 1}
+    ).sort('seq', 1)
+
+    applied = 0
+    batch = []
+    for entry in cursor:
+        if entry['seq'] in index.recent_seqs:
+            continue
+        batch.append((entry['ordinal'], entry['_id'], entry.get('skills')))
+        index.recent_seqs.add(entry['seq'])
+        index.last_seq = max(index.last_seq, entry['seq'])
+        if len(batch) >= _CATCH_UP_BATCH:
+            index.apply(batch)
+            applied += len(batch)
+            batch = []
+    index.apply(batch)
+
+    window_start = index.last_seq - _CATCH_UP_OVERLAP
+    index.recent_seqs = {seq for seq in index.recent_seqs if seq > window_start}
+    return applied + len(batch)
+
+
+def get_skill_index(refresh=False):
+    """
+    Get this process's query index, loading the snapshot on first use and
+    folding in new entries at most every SKILL_INDEX_REFRESH_SECONDS.
+
+    Args:
+        refresh (bool): Catch up now regardless of the refresh interval
+
+    Returns:
+        SkillIndex: Up-to-date index
+    """
+    global _index
+
+    from utils.db import get_db
+
+    if _index is None:
+        if os.path.exists(SKILL_INDEX_PATH):
+            try:
+                _index = SkillIndex.load(SKILL_INDEX_PATH)
+                logger.info(f"📂 Skill index snapshot loaded ({len(_index)} resumes, seq {_index.last_seq})")
+            except Exception as error:
+                logger.warning(f"⚠️  Skill index snapshot unreadable, rebuilding: {error}")
+        if _index is None:
+            _index = SkillIndex()
+
+    if refresh or time.monotonic() - _index.refreshed_at >= SKILL_INDEX_REFRESH_SECONDS:
+        applied = catch_up(_index, get_db())
+        _index.refreshed_at = time.monotonic()
+        _index.unsaved += applied
+        if _index.unsaved >= SKILL_INDEX_SNAPSHOT_EVERY:
+            _index.save(SKILL_INDEX_PATH)
+            _index.unsaved = 0
+            logger.info(f"💾 Skill index snapshot written ({len(_index)} resumes, seq {_index.last_seq})")
+
+    return _index
+
+
+def query_skill_index(all_of=(), any_of=(), none_of=(), at_least=None, limit=100, offset=0):
+    """
+    Run a skill query against the up-to-date index.
+
+    Args:
+        all_of, any_of, none_of, at_least: See SkillIndex.query
+        limit (int): Maximum resume ids returned
+        offset (int): Resume ids to skip (pagination)
+
+    Returns:
+        dict: count (total matches), resumeIds (page) and tookMs
+    """
+    index = get_skill_index()
+
+    start = time.perf_counter()
+    if at_least:
+        at_least = (int(at_least[0]), at_least[1])
+    bits = index.query(all_of or (), any_of or (), none_of or (), at_least)
+    result = {
+        'count': index.count(bits),
+        'resumeIds': index.resume_ids_of(bits, limit, offset),
+    }
+    result['tookMs'] = round((time.perf_counter() - start) * 1000, 3)
+    return result
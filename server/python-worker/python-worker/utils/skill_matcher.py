@@ -0,0 +1,174 @@
+"""
+Compiled multi-pattern skill matcher.
+Builds an Aho-Corasick automaton from the SKILLS dictionary once at import
+time so every skill can be found in a single linear pass over the text.
+Every keyword, alias or not, reports its canonical skill ID (see
+utils.skills_data); skill names are a view over those IDs.
+"""
+
+import re
+import logging
+from collections import deque
+from utils.skills_data import SKILLS, SKILL_IDS, CANONICAL_SKILLS
+
+logger = logging.getLogger(__name__)
+
+# Any whitespace run counts as a single space, so "spring\n  boot"
+# still matches the dictionary phrase "spring boot"
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _is_word_char(char):
+    return char.isalnum()
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a fixed list of lowercase skill keywords.
+
+    The goto/failure graph is flattened into a deterministic transition
+    table, so scanning costs one dict lookup per character. A match is only
+    reported when it sits on a word boundary: a skill that starts (or ends)
+    with a letter or digit must not be preceded (or followed) by one.
+
+    Keywords map to skill IDs (skill_ids[i] for skills[i], indices when
+    omitted) and names (names[skill_id]), so several keywords can report
+    the same skill.
+    """
+
+    def __init__(self, skills, skill_ids=None, names=None):
+        self.skills = list(skills)
+        self.skill_ids = list(skill_ids) if skill_ids is not None else list(range(len(self.skills)))
+        self.names = list(names) if names is not None else self.skills
+        self._transitions = [{}]
+        self._outputs = [[]]
+        self._needs_left_boundary = [_is_word_char(skill[0]) for skill in self.skills]
+        self._needs_right_boundary = [_is_word_char(skill[-1]) for skill in self.skills]
+
+        for keyword, skill in enumerate(self.skills):
+            self._add_pattern(keyword, skill)
+
+        self._build_transitions()
+
+    def _add_pattern(self, keyword, skill):
+        state = 0
+        for char in skill:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions.append({})
+                self._outputs.append([])
+                self._transitions[state][char] = next_state
+            state = next_state
+        self._outputs[state].append(keyword)
+
+    def _build_transitions(self):
+        # Breadth-first pass computing failure links, folding each state's
+        # failure transitions into its own table so the scan never follows them
+        goto = self._transitions
+        transitions = [dict(goto[0])] + [None] * (len(goto) - 1)
+        failure = [0] * len(goto)
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            fail_state = failure[state]
+
+            if state:
+                table = dict(transitions[fail_state])
+                table.update(goto[state])
+                transitions[state] = table
+                if self._outputs[fail_state]:
+                    self._outputs[state] = self._outputs[state] + self._outputs[fail_state]
+
+            for char, next_state in goto[state].items():
+                failure[next_state] = transitions[fail_state].get(char, 0) if state else 0
+                queue.append(next_state)
+
+        self._transitions = transitions
+        self._outputs = [tuple(output) for output in self._outputs]
+
+    def find_ids(self, text):
+        """
+        Find every dictionary skill present in text.
+
+        Args:
+            text (str): Lowercase text to scan
+
+        Returns:
+            set: Skill IDs of the detected skills
+        """
+        if not text:
+            return set()
+
+        text = _WHITESPACE_RE.sub(' ', text)
+        text_length = len(text)
+        transitions = self._transitions
+        outputs = self._outputs
+        skills = self.skills
+        skill_ids = self.skill_ids
+        needs_left = self._needs_left_boundary
+        needs_right = self._needs_right_boundary
+
+        found = set()
+        state = 0
+
+        for end, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if not outputs[state]:
+                continue
+
+            for keyword in outputs[state]:
+                if skill_ids[keyword] in found:
+                    continue
+                if needs_right[keyword] and end + 1 < text_length and _is_word_char(text[end + 1]):
+                    continue
+                start = end - len(skills[keyword]) + 1
+                if needs_left[keyword] and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                found.add(skill_ids[keyword])
+
+        return found
+
+    def find_skills(self, text):
+        """
+        Find every dictionary skill present in text.
+
+        Args:
+            text (str): Lowercase text to scan
+
+        Returns:
+            list: Detected skills (unique, sorted alphabetically)
+        """
+        return sorted(self.names[skill_id] for skill_id in self.find_ids(text))
+
+
+# Compiled once per process from the predefined SKILLS list, reporting
+# canonical skill IDs (aliases folded)
+SKILL_MATCHER = SkillMatcher(SKILLS, [SKILL_IDS[skill] for skill in SKILLS], CANONICAL_SKILLS)
+
+
+def find_skill_ids(text):
+    """
+    Find predefined skills in text as canonical skill IDs.
+
+    Args:
+        text (str): Lowercase text to scan
+
+    Returns:
+        list: Detected skill IDs (unique, ascending)
+    """
+    return sorted(SKILL_MATCHER.find_ids(text))
+
+
+def find_skills(text):
+    """
+    Find predefined skills in text using the shared compiled matcher.
+
+    Args:
+        text (str): Lowercase text to scan
+
+    Returns:
+        list: Detected canonical skills (unique, sorted alphabetically)
+    """
+    return SKILL_MATCHER.find_skills(text)
@@ -3,153 +3,248 @@ Predefined skills database for resume skill extraction.
 Contains technical and soft skills across multiple categories.
 """
 
-# Comprehensive list of skills to detect in resumes
-SKILLS = [
+import hashlib
+
+# Skills to detect in resumes, grouped by category. A skill listed under
+# several categories carries all of their tags
+SKILL_CATEGORIES = {
     # Programming Languages
-    "python", "java", "javascript", "typescript", "c", "c++", "c#", "csharp",
-    "go", "golang", "rust", "ruby", "php", "swift", "kotlin", "scala",
-    "r", "perl", "shell", "bash", "powershell", "sql", "html", "css",
-    "dart", "objective-c", "lua", "haskell", "elixir", "clojure",
-    
+    "programming_languages": [
+        "python", "java", "javascript", "typescript", "c", "c++", "c#", "csharp",
+        "go", "golang", "rust", "ruby", "php", "swift", "kotlin", "scala",
+        "r", "perl", "shell", "bash", "powershell", "sql", "html", "css",
+        "dart", "objective-c", "lua", "haskell", "elixir", "clojure",
+    ],
     # Frontend Frameworks & Libraries
-    "react", "reactjs", "react.js", "vue", "vuejs", "vue.js", "angular",
-    "angularjs", "svelte", "next.js", "nextjs", "nuxt", "gatsby",
-    "jquery", "bootstrap", "tailwind", "tailwindcss", "material-ui",
-    "sass", "scss", "less", "webpack", "vite", "redux", "mobx",
-    
+    "frontend_frameworks_libraries": [
+        "react", "reactjs", "react.js", "vue", "vuejs", "vue.js", "angular",
+        "angularjs", "svelte", "next.js", "nextjs", "nuxt", "gatsby",
+        "jquery", "bootstrap", "tailwind", "tailwindcss", "material-ui",
+        "sass", "scss", "less", "webpack", "vite", "redux", "mobx",
+    ],
     # Backend Frameworks
-    "node.js", "nodejs", "express", "expressjs", "django", "flask",
-    "fastapi", "spring", "spring boot", "springboot", ".net", "dotnet",
-    "asp.net", "laravel", "symfony", "rails", "ruby on rails",
-    "nestjs", "koa", "hapi", "gin", "echo", "actix",
-    
+    "backend_frameworks": [
+        "node.js", "nodejs", "express", "expressjs", "django", "flask",
+        "fastapi", "spring", "spring boot", "springboot", ".net", "dotnet",
+        "asp.net", "laravel", "symfony", "rails", "ruby on rails",
+        "nestjs", "koa", "hapi", "gin", "echo", "actix",
+    ],
     # Mobile Development
-    "react native", "flutter", "android", "ios", "xamarin", "ionic",
-    "cordova", "swiftui",
-    
+    "mobile_development": [
+        "react native", "flutter", "android", "ios", "xamarin", "ionic",
+        "cordova", "swiftui",
+    ],
     # Databases
-    "mongodb", "mysql", "postgresql", "postgres", "sql server", "oracle",
-    "sqlite", "redis", "cassandra", "dynamodb", "elasticsearch",
-    "mariadb", "couchdb", "neo4j", "firebase", "firestore",
-    "realm", "supabase",
-    
+    "databases": [
+        "mongodb", "mysql", "postgresql", "postgres", "sql server", "oracle",
+        "sqlite", "redis", "cassandra", "dynamodb", "elasticsearch",
+        "mariadb", "couchdb", "neo4j", "firebase", "firestore",
+        "realm", "supabase",
+    ],
     # Cloud Platforms
-    "aws", "amazon web services", "azure", "microsoft azure", "gcp",
-    "google cloud", "google cloud platform", "heroku", "digitalocean",
-    "linode", "cloudflare", "vercel", "netlify",
-    
+    "cloud_platforms": [
+        "aws", "amazon web services", "azure", "microsoft azure", "gcp",
+        "google cloud", "google cloud platform", "heroku", "digitalocean",
+        "linode", "cloudflare", "vercel", "netlify",
+    ],
     # Cloud Services (AWS)
-    "ec2", "s3", "lambda", "rds", "dynamodb", "cloudfront", "route53",
-    "iam", "vpc", "cloudwatch", "sns", "sqs", "api gateway",
-    
+    "cloud_services_aws": [
+        "ec2", "s3", "lambda", "rds", "dynamodb", "cloudfront", "route53",
+        "iam", "vpc", "cloudwatch", "sns", "sqs", "api gateway",
+    ],
     # Cloud Services (Azure)
-    "azure functions", "azure storage", "azure sql", "cosmos db",
-    "azure devops",
-    
+    "cloud_services_azure": [
+        "azure functions", "azure storage", "azure sql", "cosmos db",
+        "azure devops",
+    ],
     # Cloud Services (GCP)
-    "compute engine", "cloud storage", "cloud functions", "bigquery",
-    "cloud sql", "app engine",
-    
+    "cloud_services_gcp": [
+        "compute engine", "cloud storage", "cloud functions", "bigquery",
+        "cloud sql", "app engine",
+    ],
     # DevOps & CI/CD
-    "docker", "kubernetes", "k8s", "jenkins", "gitlab", "github actions",
-    "circleci", "travis ci", "ansible", "terraform", "puppet", "chef",
-    "vagrant", "helm", "argocd", "prometheus", "grafana", "nagios",
-    "ci/cd", "continuous integration", "continuous deployment",
-    
+    "devops_ci_cd": [
+        "docker", "kubernetes", "k8s", "jenkins", "gitlab", "github actions",
+        "circleci", "travis ci", "ansible", "terraform", "puppet", "chef",
+        "vagrant", "helm", "argocd", "prometheus", "grafana", "nagios",
+        "ci/cd", "continuous integration", "continuous deployment",
+    ],
     # Version Control
-    "git", "github", "gitlab", "bitbucket", "svn", "mercurial",
-    
+    "version_control": [
+        "git", "github", "gitlab", "bitbucket", "svn", "mercurial",
+    ],
     # Data Science & ML
-    "pandas", "numpy", "scipy", "matplotlib", "seaborn", "plotly",
-    "scikit-learn", "sklearn", "tensorflow", "keras", "pytorch",
-    "xgboost", "lightgbm", "catboost", "opencv", "nltk", "spacy",
-    "hugging face", "transformers", "bert", "gpt",
-    
+    "data_science_ml": [
+        "pandas", "numpy", "scipy", "matplotlib", "seaborn", "plotly",
+        "scikit-learn", "sklearn", "tensorflow", "keras", "pytorch",
+        "xgboost", "lightgbm", "catboost", "opencv", "nltk", "spacy",
+        "hugging face", "transformers", "bert", "gpt",
+    ],
     # Data Engineering
-    "apache spark", "hadoop", "kafka", "airflow", "luigi", "dbt",
-    "snowflake", "databricks", "redshift", "bigquery",
-    
+    "data_engineering": [
+        "apache spark", "hadoop", "kafka", "airflow", "luigi", "dbt",
+        "snowflake", "databricks", "redshift", "bigquery",
+    ],
     # Testing
-    "jest", "mocha", "chai", "pytest", "unittest", "selenium",
-    "cypress", "playwright", "junit", "testng", "rspec",
-    "jasmine", "karma",
-    
+    "testing": [
+        "jest", "mocha", "chai", "pytest", "unittest", "selenium",
+        "cypress", "playwright", "junit", "testng", "rspec",
+        "jasmine", "karma",
+    ],
     # API & Web Technologies
-    "rest", "restful", "rest api", "graphql", "grpc", "soap",
-    "websocket", "webhooks", "oauth", "jwt", "json", "xml",
-    "microservices", "api design",
-    
+    "api_web_technologies": [
+        "rest", "restful", "rest api", "graphql", "grpc", "soap",
+        "websocket", "webhooks", "oauth", "jwt", "json", "xml",
+        "microservices", "api design",
+    ],
     # Monitoring & Logging
-    "elk", "elasticsearch", "logstash", "kibana", "splunk",
-    "datadog", "new relic", "sentry",
-    
+    "monitoring_logging": [
+        "elk", "elasticsearch", "logstash", "kibana", "splunk",
+        "datadog", "new relic", "sentry",
+    ],
     # Message Queues
-    "rabbitmq", "kafka", "redis", "celery", "activemq", "zeromq",
-    
+    "message_queues": [
+        "rabbitmq", "kafka", "redis", "celery", "activemq", "zeromq",
+    ],
     # Web Servers
-    "nginx", "apache", "tomcat", "iis", "gunicorn", "uvicorn",
-    
+    "web_servers": [
+        "nginx", "apache", "tomcat", "iis", "gunicorn", "uvicorn",
+    ],
     # Operating Systems
-    "linux", "unix", "windows", "macos", "ubuntu", "centos",
-    "debian", "redhat", "fedora",
-    
+    "operating_systems": [
+        "linux", "unix", "windows", "macos", "ubuntu", "centos",
+        "debian", "redhat", "fedora",
+    ],
     # Methodologies & Practices
-    "agile", "scrum", "kanban", "devops", "tdd", "bdd",
-    "test driven development", "behavior driven development",
-    "pair programming", "code review", "ci/cd",
-    
+    "methodologies_practices": [
+        "agile", "scrum", "kanban", "devops", "tdd", "bdd",
+        "test driven development", "behavior driven development",
+        "pair programming", "code review", "ci/cd",
+    ],
     # Design & Architecture
-    "system design", "software architecture", "design patterns",
-    "oop", "object oriented programming", "functional programming",
-    "mvc", "mvvm", "clean architecture", "solid principles",
-    "domain driven design", "ddd",
-    
+    "design_architecture": [
+        "system design", "software architecture", "design patterns",
+        "oop", "object oriented programming", "functional programming",
+        "mvc", "mvvm", "clean architecture", "solid principles",
+        "domain driven design", "ddd",
+    ],
     # Security
-    "security", "cybersecurity", "penetration testing", "owasp",
-    "ssl", "tls", "encryption", "authentication", "authorization",
-    "firewall", "vpn",
-    
+    "security": [
+        "security", "cybersecurity", "penetration testing", "owasp",
+        "ssl", "tls", "encryption", "authentication", "authorization",
+        "firewall", "vpn",
+    ],
     # Soft Skills
-    "communication", "leadership", "teamwork", "team collaboration",
-    "problem solving", "critical thinking", "time management",
-    "project management", "mentoring", "presentation",
-    "analytical skills", "attention to detail", "creative thinking",
-    "adaptability", "flexibility", "self-motivated",
-    
+    "soft_skills": [
+        "communication", "leadership", "teamwork", "team collaboration",
+        "problem solving", "critical thinking", "time management",
+        "project management", "mentoring", "presentation",
+        "analytical skills", "attention to detail", "creative thinking",
+        "adaptability", "flexibility", "self-motivated",
+    ],
     # Project Management & Tools
-    "jira", "confluence", "trello", "asana", "slack", "notion",
-    "monday.com", "microsoft teams", "zoom",
-    
+    "project_management_tools": [
+        "jira", "confluence", "trello", "asana", "slack", "notion",
+        "monday.com", "microsoft teams", "zoom",
+    ],
     # Other Tools & Technologies
-    "postman", "insomnia", "swagger", "figma", "sketch",
-    "adobe xd", "photoshop", "illustrator", "vs code",
-    "visual studio", "intellij", "pycharm", "eclipse",
-    "vim", "emacs",
-    
+    "other_tools_technologies": [
+        "postman", "insomnia", "swagger", "figma", "sketch",
+        "adobe xd", "photoshop", "illustrator", "vs code",
+        "visual studio", "intellij", "pycharm", "eclipse",
+        "vim", "emacs",
+    ],
     # Blockchain & Web3
-    "blockchain", "ethereum", "solidity", "smart contracts",
-    "web3", "nft", "defi",
-    
+    "blockchain_web3": [
+        "blockchain", "ethereum", "solidity", "smart contracts",
+        "web3", "nft", "defi",
+    ],
     # Game Development
-    "unity", "unreal engine", "godot", "game development",
-    
+    "game_development": [
+        "unity", "unreal engine", "godot", "game development",
+    ],
     # Data Formats
-    "json", "xml", "yaml", "csv", "parquet", "avro",
-    
+    "data_formats": [
+        "json", "xml", "yaml", "csv", "parquet", "avro",
+    ],
     # Business & Analytics
-    "tableau", "power bi", "looker", "excel", "google analytics",
-    "mixpanel", "amplitude",
-    
+    "business_analytics": [
+        "tableau", "power bi", "looker", "excel", "google analytics",
+        "mixpanel", "amplitude",
+    ],
     # E-commerce & CMS
-    "shopify", "wordpress", "woocommerce", "magento", "drupal",
-    "contentful", "strapi",
-]
+    "e_commerce_cms": [
+        "shopify", "wordpress", "woocommerce", "magento", "drupal",
+        "contentful", "strapi",
+    ],
+}
+
+# Every skill keyword (canonical names and aliases), lowercase, in
+# dictionary order without duplicates
+SKILLS = list(dict.fromkeys(
+    skill.lower() for skills in SKILL_CATEGORIES.values() for skill in skills
+))
 
-# Convert all skills to lowercase for case-insensitive matching
-SKILLS = [skill.lower() for skill in SKILLS]
+# Spellings of the same skill. Matched like any other keyword, but
+# reported, counted and stored as the canonical skill
+SKILL_ALIASES = {
+    "csharp": "c#",
+    "golang": "go",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "nextjs": "next.js",
+    "tailwindcss": "tailwind",
+    "nodejs": "node.js",
+    "expressjs": "express",
+    "springboot": "spring boot",
+    "dotnet": ".net",
+    "ruby on rails": "rails",
+    "postgres": "postgresql",
+    "amazon web services": "aws",
+    "microsoft azure": "azure",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "k8s": "kubernetes",
+    "sklearn": "scikit-learn",
+    "restful": "rest",
+    "rest api": "rest",
+    "test driven development": "tdd",
+    "behavior driven development": "bdd",
+    "object oriented programming": "oop",
+    "domain driven design": "ddd",
+    "team collaboration": "teamwork",
+}
 
-# Remove duplicates while preserving order
-SKILLS = list(dict.fromkeys(SKILLS))
+# Canonical skills in dictionary order; a skill's ID is its index here
+CANONICAL_SKILLS = [skill for skill in SKILLS if skill not in SKILL_ALIASES]
+
+# Skill ID of every keyword, aliases included
+SKILL_IDS = {skill: skill_id for skill_id, skill in enumerate(CANONICAL_SKILLS)}
+SKILL_IDS.update({alias: SKILL_IDS[canonical] for alias, canonical in SKILL_ALIASES.items()})
+
+
+def _build_category_tags():
+    tags = [[] for _ in CANONICAL_SKILLS]
+    for category, skills in SKILL_CATEGORIES.items():
+        for skill in skills:
+            skill_tags = tags[SKILL_IDS[skill.lower()]]
+            if category not in skill_tags:
+                skill_tags.append(category)
+    return [tuple(skill_tags) for skill_tags in tags]
+
+
+# Category tags per skill ID (from the canonical skill and its aliases)
+SKILL_CATEGORY_TAGS = _build_category_tags()
+
+# Content hash of the dictionary; changes whenever SKILLS or the aliases
+# change so cached or stored results (including skill IDs) can be
+# recognised as stale
+SKILLS_VERSION = hashlib.sha256(
+    ("\n".join(SKILLS) + "\n\n" + "\n".join(f"{alias}={canonical}" for alias, canonical in sorted(SKILL_ALIASES.items())))
+    .encode("utf-8")
+).hexdigest()[:12]
 
 
 def get_all_skills():
@@ -157,7 +252,7 @@ def get_all_skills():
     Get the complete list of predefined skills.
     
     Returns:
-        list: List of all skill keywords
+        list: List of all skill keywords (aliases included)
     """
     return SKILLS.copy()
 
@@ -170,3 +265,56 @@ def get_skills_count():
         int: Number of skills
     """
     return len(SKILLS)
+
+
+def canonical_skill(skill):
+    """
+    Get the canonical name of a skill keyword or alias.
+    
+    Args:
+        skill (str): Skill keyword (any case)
+        
+    Returns:
+        str | None: Canonical skill, or None if not in the dictionary
+    """
+    skill_id = SKILL_IDS.get(skill.strip().lower())
+    return None if skill_id is None else CANONICAL_SKILLS[skill_id]
+
+
+def canonical_skills(skills):
+    """
+    Canonical form of a skills list (e.g. one stored before aliases were folded).
+    
+    Args:
+        skills (iterable): Skill keywords
+        
+    Returns:
+        list: Unique canonical skills, sorted alphabetically; unknown keywords dropped
+    """
+    return sorted({CANONICAL_SKILLS[SKILL_IDS[skill]] for skill in skills or () if skill in SKILL_IDS})
+
+
+def skill_names(skill_ids):
+    """
+    String view of skill IDs.
+    
+    Args:
+        skill_ids (iterable): Skill IDs
+        
+    Returns:
+        list: Canonical skill names, in the order given
+    """
+    return [CANONICAL_SKILLS[skill_id] for skill_id in skill_ids]
+
+
+def skill_ids_of(skills):
+    """
+    Skill IDs of skill keywords, aliases folded and unknown keywords dropped.
+    
+    Args:
+        skills (iterable): Skill keywords (e.g. a stored skills list)
+        
+    Returns:
+        list: Unique skill IDs, ascending
+    """
+    return sorted({SKILL_IDS[skill] for skill in skills if skill in SKILL_IDS})
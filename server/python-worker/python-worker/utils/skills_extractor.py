@@ -1,62 +1,21 @@
 """
-Skills extraction module using NLP and keyword matching.
-Uses spaCy for tokenization and matches against predefined skills list.
+Skills extraction module using keyword matching.
+Matches resume text against the predefined skills list with a compiled
+multi-pattern matcher (see utils.skill_matcher).
 """
 
 import logging
-import spacy
-from utils.skills_data import SKILLS
+from utils.skill_matcher import find_skills
+from utils.metrics import time_stage
 
 logger = logging.getLogger(__name__)
 
-# Global spaCy model instance (loaded once)
-_nlp = None
-
-
-def load_spacy_model():
-    """
-    Load spaCy English model.
-    Uses small model for efficiency (en_core_web_sm).
-    
-    Returns:
-        spacy.Language: Loaded spaCy model
-    """
-    global _nlp
-    
-    if _nlp is not None:
-        return _nlp
-    
-    try:
-        logger.info("📚 Loading spaCy model...")
-        _nlp = spacy.load("en_core_web_sm")
-        logger.info("✅ spaCy model loaded successfully")
-        return _nlp
-    except OSError:
-        logger.warning("⚠️  spaCy model 'en_core_web_sm' not found")
-        logger.info("💡 Attempting to download spaCy model...")
-        
-        # Try downloading the model
-        import subprocess
-        try:
-            subprocess.run(
-                ["python", "-m", "spacy", "download", "en_core_web_sm"],
-                check=True,
-                capture_output=True
-            )
-            logger.info("✅ spaCy model downloaded successfully")
-            _nlp = spacy.load("en_core_web_sm")
-            return _nlp
-        except Exception as download_error:
-            logger.error(f"❌ Failed to download spaCy model: {download_error}")
-            logger.info("💡 Using blank spaCy model as fallback")
-            _nlp = spacy.blank("en")
-            return _nlp
-
 
 def extract_skills(text):
     """
     Extract skills from resume text using keyword matching.
-    Uses spaCy for tokenization and matches against predefined SKILLS list.
+    Matches the lowercased text against the predefined SKILLS list with the
+    compiled skill matcher, which does its own word-boundary tokenization.
     
     This is a DETERMINISTIC approach - no ML models, embeddings, or external APIs.
     
@@ -71,56 +30,20 @@ def extract_skills(text):
         return []
     
     try:
-        logger.info("🔍 Starting skill extraction...")
+        logger.debug("🔍 Starting skill extraction...")
         
         # Convert text to lowercase for case-insensitive matching
         text_lower = text.lower()
         
-        # Load spaCy model
-        nlp = load_spacy_model()
-        
-        # Tokenize text with spaCy
-        doc = nlp(text_lower)
-        
-        # Extract unique tokens
-        tokens = set([token.text for token in doc])
-        
-        # Also add multi-word phrases (bigrams, trigrams)
-        # This helps catch skills like "react native", "spring boot", etc.
-        bigrams = set()
-        trigrams = set()
-        
-        for i in range(len(doc) - 1):
-            bigram = f"{doc[i].text} {doc[i+1].text}"
-            bigrams.add(bigram)
-        
-        for i in range(len(doc) - 2):
-            trigram = f"{doc[i].text} {doc[i+1].text} {doc[i+2].text}"
-            trigrams.add(trigram)
-        
-        # Combine all n-grams
-        all_phrases = tokens.union(bigrams).union(trigrams)
-        
-        # Match against predefined SKILLS list
-        detected_skills = []
-        
-        for skill in SKILLS:
-            # Check if skill appears in text
-            # We check both in phrases and in the full text
-            if skill in all_phrases or skill in text_lower:
-                detected_skills.append(skill)
-        
-        # Remove duplicates while preserving order
-        detected_skills = list(dict.fromkeys(detected_skills))
+        # Match against predefined SKILLS list in a single pass over the
+        # text using the compiled skill matcher
+        with time_stage('skill_match'):
+            detected_skills = find_skills(text_lower)
         
-        # Sort alphabetically for consistency
-        detected_skills.sort()
-        
-        logger.info(f"✅ Skill extraction completed")
-        logger.info(f"📊 Detected {len(detected_skills)} skills")
-        
-        if detected_skills:
-            logger.debug(f"Skills found: {', '.join(detected_skills[:10])}{'...' if len(detected_skills) > 10 else ''}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"✅ Skill extraction completed: {len(detected_skills)} skills")
+            if detected_skills:
+                logger.debug(f"Skills found: {', '.join(detected_skills[:10])}{'...' if len(detected_skills) > 10 else ''}")
         
         return detected_skills
         
@@ -130,10 +53,44 @@ def extract_skills(text):
         return []
 
 
+def extract_skills_batch(texts):
+    """
+    Extract skills from many resume texts at once.
+    Streams the texts through the compiled skill matcher without the
+    per-call logging and timing of extract_skills (the skill_match stage
+    histogram is per resume; a batch would be one corpus-sized sample).
+
+    Args:
+        texts (iterable): Resume texts (may be a generator, e.g. a Mongo cursor)
+
+    Returns:
+        list: One list of detected skills per input text, in input order.
+            Empty texts yield an empty list.
+
+    Raises:
+        Exception: If matching fails; partial results are not returned
+    """
+    try:
+        logger.debug("🔍 Starting batch skill extraction...")
+
+        results = []
+        for text in texts:
+            # Lowercase one text at a time so large corpora are never materialized twice
+            results.append(find_skills(text.lower()) if text and text.strip() else [])
+
+        logger.debug("✅ Batch skill extraction completed: %d documents", len(results))
+        return results
+
+    except Exception as error:
+        logger.error(f"❌ Error during batch skill extraction: {error}")
+        logger.exception("Full traceback:")
+        raise
+
+
 def extract_skills_simple(text):
     """
-    Simplified skill extraction without spaCy (fallback method).
-    Uses simple string matching.
+    Simplified skill extraction without logging or stage timing.
+    Uses the compiled skill matcher directly on the lowercased text.
     
     Args:
         text (str): Resume text to extract skills from
@@ -144,15 +101,5 @@ def extract_skills_simple(text):
     if not text or len(text.strip()) == 0:
         return []
     
-    text_lower = text.lower()
-    detected_skills = []
-    
-    for skill in SKILLS:
-        if skill in text_lower:
-            detected_skills.append(skill)
-    
-    # Remove duplicates and sort
-    detected_skills = list(dict.fromkeys(detected_skills))
-    detected_skills.sort()
-    
-    return detected_skills
+    # Unique, alphabetically sorted matches from the compiled skill matcher
+    return find_skills(text.lower())
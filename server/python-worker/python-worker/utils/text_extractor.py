@@ -1,48 +1,280 @@
 import re
 import os
+import time
 import logging
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from billiard import Pool
 from PyPDF2 import PdfReader
 from docx import Document
+from utils.metrics import time_stage, observe_document
+from utils.blob_store import BufferStream
+from utils.ocr import OCR_ENABLED, OCR_MIN_PAGE_CHARS, IMAGE_EXTENSIONS, OcrRequired, needs_ocr, page_has_images
 
 logger = logging.getLogger(__name__)
 
 
-def extract_text_from_pdf(file_path):
+def _env_limit(name):
+    """
+    Read a non-negative integer limit from the environment (0 = unlimited).
+    """
+    value = int(os.getenv(name, '0') or 0)
+    return value if value > 0 else None
+
+
+# Extraction bounds for very large PDFs (0 or unset = unlimited)
+PDF_MAX_PAGES = _env_limit('PDF_MAX_PAGES')
+PDF_MAX_CHARS = _env_limit('PDF_MAX_CHARS')
+
+# PDFs with more pages than this are extracted by a process pool (0 = never)
+PDF_PARALLEL_PAGE_THRESHOLD = _env_limit('PDF_PARALLEL_PAGE_THRESHOLD')
+
+# Upper bound on page-extraction processes per worker process (0 = no cap)
+PDF_PARALLEL_MAX_WORKERS = _env_limit('PDF_PARALLEL_MAX_WORKERS')
+
+# Number of Celery worker processes sharing this host (Celery defaults to one per CPU)
+WORKER_CONCURRENCY = _env_limit('CELERY_WORKER_CONCURRENCY')
+
+# A single extracted PDF page with its extraction time; images is set for
+# pages without a usable text layer that draw an image (scans, see utils.ocr)
+PdfPage = namedtuple('PdfPage', ['number', 'text', 'seconds', 'images'], defaults=(False,))
+
+# Page-extraction process pool, created lazily inside each worker process
+_pdf_pool = None
+_pdf_pool_size = 0
+
+
+def _iter_reader_pages(reader, first_page=1, last_page=None):
+    """
+    Extract pages first_page..last_page (1-based, inclusive) from an open reader.
+    """
+    last_page = min(last_page or len(reader.pages), len(reader.pages))
+    
+    for page_num in range(first_page, last_page + 1):
+        page_start = time.perf_counter()
+        page = reader.pages[page_num - 1]
+        page_text = page.extract_text() or ""
+        # Only near-empty pages are checked for images
+        images = len(page_text.strip()) < OCR_MIN_PAGE_CHARS and page_has_images(page)
+        yield PdfPage(page_num, page_text, time.perf_counter() - page_start, images)
+
+
+def _limit_chars(pages, max_chars):
+    """
+    Pass pages through until the character budget is reached.
+    The page that crosses the budget is truncated and iteration stops.
+    """
+    total_chars = 0
+    
+    for page in pages:
+        if max_chars is not None and total_chars + len(page.text) >= max_chars:
+            yield page._replace(text=page.text[:max_chars - total_chars])
+            logger.info(f"⏹️  Character budget reached ({max_chars} characters) at page {page.number}")
+            return
+        
+        total_chars += len(page.text)
+        yield page
+
+
+def _extract_pdf_page_range(file_path, first_page, last_page):
+    """
+    Process pool entry point: extract a contiguous page range from a PDF.
+    
+    Returns:
+        list: PdfPage entries in page order
+    """
+    reader = PdfReader(file_path)
+    return list(_iter_reader_pages(reader, first_page, last_page))
+
+
+def get_pdf_pool_size():
+    """
+    Number of processes one worker process may use for PDF page extraction.
+    Splits the host's CPUs across the Celery worker processes so page-level
+    parallelism never oversubscribes the host on top of task-level parallelism.
+    
+    Returns:
+        int: Pool size (1 means extract serially)
+    """
+    cpu_count = os.cpu_count() or 1
+    concurrency = WORKER_CONCURRENCY or cpu_count
+    pool_size = max(1, cpu_count // concurrency)
+    
+    if PDF_PARALLEL_MAX_WORKERS is not None:
+        pool_size = min(pool_size, PDF_PARALLEL_MAX_WORKERS)
+    
+    return pool_size
+
+
+def _get_pdf_pool(pool_size):
+    """
+    Get (or lazily create) this process's page-extraction pool.
+    """
+    global _pdf_pool, _pdf_pool_size
+    
+    if _pdf_pool is None or _pdf_pool_size != pool_size:
+        if _pdf_pool is not None:
+            _pdf_pool.terminate()
+        # billiard, not multiprocessing/concurrent.futures: this runs in
+        # Celery's daemonic prefork children (and sandbox processes forked
+        # from them), which the stdlib refuses to give children
+        _pdf_pool = Pool(processes=pool_size)
+        _pdf_pool_size = pool_size
+        logger.info(f"🧵 Started PDF page-extraction pool with {pool_size} processes")
+    
+    return _pdf_pool
+
+
+def _iter_pdf_pages_parallel(file_path, page_count, pool_size):
+    """
+    Extract page ranges in a process pool and yield pages in page order.
+    Only a few ranges are in flight at a time, so nothing new is started
+    once the consumer stops early.
+    """
+    pool = _get_pdf_pool(pool_size)
+    
+    # A few ranges per process keeps the pool busy when page costs differ
+    range_count = min(page_count, pool_size * 4)
+    range_size = -(-page_count // range_count)
+    page_ranges = iter([(file_path, first, min(first + range_size - 1, page_count))
+                        for first in range(1, page_count + 1, range_size)])
+    
+    pending = deque()
+    for _ in range(pool_size * 2):
+        range_args = next(page_ranges, None)
+        if range_args is None:
+            break
+        pending.append(pool.apply_async(_extract_pdf_page_range, range_args))
+    
+    while pending:
+        page_range = pending.popleft().get()
+        range_args = next(page_ranges, None)
+        if range_args is not None:
+            pending.append(pool.apply_async(_extract_pdf_page_range, range_args))
+        yield from page_range
+
+
+@contextmanager
+def _open_source(source):
+    """
+    Turn a path or in-memory buffer (bytes, mmap) into what the PDF/DOCX
+    readers accept: paths are checked and passed through, buffers are
+    wrapped in a zero-copy stream that is released on exit so the
+    caller can close its mmap.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        yield source
+        return
+    
+    stream = BufferStream(source)
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+
+def _describe_source(source):
+    return source if isinstance(source, (str, os.PathLike)) else f"<{len(source)} byte buffer>"
+
+
+def iter_pdf_pages(file_path, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    """
+    Lazily extract text from a PDF one page at a time using PyPDF2.
+    Stops early once the page count or character budget is reached, so
+    the rest of the document is never parsed.
+    
+    Documents on disk with more than PDF_PARALLEL_PAGE_THRESHOLD pages are
+    split into page ranges extracted by a process pool; pages are still
+    yielded in order. In-memory buffers are always extracted serially.
+    
+    Args:
+        file_path (str | bytes | mmap): Path to the PDF file, or its contents
+        max_pages (int, optional): Maximum number of pages to extract
+        max_chars (int, optional): Character budget; the page that crosses
+            it is truncated and extraction stops
+        
+    Yields:
+        PdfPage: Page number (1-based), extracted text, seconds spent and
+            whether the page is image-only
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with _open_source(file_path) as source:
+        with time_stage('file_read'):
+            reader = PdfReader(source)
+        page_count = len(reader.pages)
+        observe_document(pages=page_count)
+        
+        if max_pages is not None and page_count > max_pages:
+            logger.info(f"⏹️  Page limit reached ({max_pages} of {page_count} pages), skipping the rest")
+            page_count = max_pages
+        
+        pool_size = get_pdf_pool_size()
+        
+        if (source is file_path and PDF_PARALLEL_PAGE_THRESHOLD is not None
+                and page_count > PDF_PARALLEL_PAGE_THRESHOLD and pool_size > 1):
+            logger.info(f"⚡ Extracting {page_count} pages in parallel ({pool_size} processes)")
+            pages = _iter_pdf_pages_parallel(file_path, page_count, pool_size)
+        else:
+            pages = _iter_reader_pages(reader, 1, page_count)
+        
+        with time_stage('pdf_parse'):
+            yield from _limit_chars(pages, max_chars)
+
+
+def extract_text_from_pdf(file_path, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, ocr=False):
     """
     Extract text from a PDF file using PyPDF2.
     
     Args:
-        file_path (str): Path to the PDF file
+        file_path (str | bytes | mmap): Path to the PDF file, or its contents
+        max_pages (int, optional): Maximum number of pages to extract
+        max_chars (int, optional): Maximum number of characters to extract
+        ocr (bool): Raise OcrRequired if image-only pages leave the text
+            layer insufficient (see utils.ocr.needs_ocr)
         
     Returns:
         str: Extracted raw text from the PDF
         
     Raises:
+        OcrRequired: If ocr is set and the text layer is insufficient
         Exception: If PDF reading fails
     """
     try:
-        logger.info(f"📄 Extracting text from PDF: {file_path}")
+        logger.debug("📄 Extracting text from PDF: %s", _describe_source(file_path))
+        
+        page_texts = []
+        image_pages = []
+        slowest_page = None
         
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        # Extract text page by page, joining once at the end
+        for page in iter_pdf_pages(file_path, max_pages=max_pages, max_chars=max_chars):
+            logger.debug("  - Extracted page %d: %d characters in %.1fms", page.number, len(page.text), page.seconds * 1000)
+            if slowest_page is None or page.seconds > slowest_page.seconds:
+                slowest_page = page
+            page_texts.append(page.text)
+            if page.images:
+                image_pages.append(page.number)
         
-        reader = PdfReader(file_path)
-        text = ""
+        if ocr and needs_ocr(image_pages, page_texts):
+            raise OcrRequired(image_pages, page_texts)
         
-        # Extract text from all pages
-        for page_num, page in enumerate(reader.pages, start=1):
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-                logger.debug(f"  - Extracted page {page_num}: {len(page_text)} characters")
+        text = "".join(page_text + "\n" for page_text in page_texts if page_text)
         
         if not text.strip():
             logger.warning("⚠️  PDF appears to be empty or text extraction failed")
             return ""
         
-        logger.info(f"✅ Successfully extracted {len(text)} characters from PDF")
+        logger.debug("✅ Successfully extracted %d characters from PDF", len(text))
+        if slowest_page is not None:
+            logger.debug("⏱️  Slowest page: %d (%.1fms)", slowest_page.number, slowest_page.seconds * 1000)
         return text
         
+    except OcrRequired:
+        raise
     except Exception as error:
         logger.error(f"❌ Error extracting text from PDF: {error}")
         raise
@@ -53,7 +285,7 @@ def extract_text_from_docx(file_path):
     Extract text from a DOCX file using python-docx.
     
     Args:
-        file_path (str): Path to the DOCX file
+        file_path (str | bytes | mmap): Path to the DOCX file, or its contents
         
     Returns:
         str: Extracted raw text from the DOCX
@@ -62,32 +294,32 @@ def extract_text_from_docx(file_path):
         Exception: If DOCX reading fails
     """
     try:
-        logger.info(f"📄 Extracting text from DOCX: {file_path}")
-        
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        doc = Document(file_path)
-        text = ""
+        logger.debug("📄 Extracting text from DOCX: %s", _describe_source(file_path))
         
-        # Extract text from all paragraphs
-        for para in doc.paragraphs:
-            if para.text:
-                text += para.text + "\n"
+        with _open_source(file_path) as source, time_stage('file_read'):
+            doc = Document(source)
         
-        # Extract text from tables (if any)
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text:
-                        text += cell.text + " "
-                text += "\n"
+        with time_stage('docx_parse'):
+            text = ""
+            
+            # Extract text from all paragraphs
+            for para in doc.paragraphs:
+                if para.text:
+                    text += para.text + "\n"
+            
+            # Extract text from tables (if any)
+            for table in doc.tables:
+                for row in table.rows:
+                    for cell in row.cells:
+                        if cell.text:
+                            text += cell.text + " "
+                    text += "\n"
         
         if not text.strip():
             logger.warning("⚠️  DOCX appears to be empty")
             return ""
         
-        logger.info(f"✅ Successfully extracted {len(text)} characters from DOCX")
+        logger.debug("✅ Successfully extracted %d characters from DOCX", len(text))
         return text
         
     except Exception as error:
@@ -119,6 +351,14 @@ def extract_text_from_doc(file_path):
     )
 
 
+# Precompiled patterns for clean_text. Only runs of two or more spaces and
+# three or more newlines are matched, so ordinary single separators never
+# trigger a substitution.
+_SPACE_RUN_RE = re.compile(r'  +')
+_BLANK_LINES_RE = re.compile(r'\n\n\n+')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]')
+
+
 def clean_text(raw_text):
     """
     Clean and normalize extracted text.
@@ -138,57 +378,59 @@ def clean_text(raw_text):
     
     logger.debug("🧹 Cleaning extracted text...")
     
-    # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', raw_text)
-    
-    # Replace multiple newlines with double newline (paragraph separator)
-    text = re.sub(r'\n\s*\n+', '\n\n', text)
-    
-    # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
+    # Collapse runs of spaces, then strip every line in one split/join
+    lines = [line.strip() for line in _SPACE_RUN_RE.sub(' ', raw_text).split('\n')]
     
-    # Remove leading/trailing whitespace from entire text
-    text = text.strip()
+    # Collapse blank lines into a single paragraph separator and trim the text
+    text = _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
     
     # Remove null characters and other control characters
-    text = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]', '', text)
+    text = _CONTROL_CHARS_RE.sub('', text)
     
-    logger.debug(f"✅ Text cleaned: {len(text)} characters")
+    logger.debug("✅ Text cleaned: %d characters", len(text))
     return text
 
 
-def extract_text(file_path):
+def extract_text(file_path, ext=None):
     """
     Main extraction function that detects file type and extracts text accordingly.
     
     Args:
-        file_path (str): Path to the resume file
+        file_path (str | bytes | mmap): Path to the resume file, or its
+            contents (e.g. a blob store buffer) parsed without a temp file
+        ext (str, optional): File extension ('.pdf', '.docx'); required
+            for buffers, taken from the path otherwise
         
     Returns:
         str: Cleaned extracted text
         
     Raises:
+        OcrRequired: With OCR_ENABLED, for image uploads and PDFs with
+            image-only pages (see utils.ocr)
         ValueError: If file extension is not supported
         Exception: If extraction fails
     """
     # Get file extension
-    _, ext = os.path.splitext(file_path)
+    if ext is None:
+        _, ext = os.path.splitext(file_path)
     ext = ext.lower()
     
-    logger.info(f"🔍 Detected file extension: {ext}")
+    logger.debug("🔍 Detected file extension: %s", ext)
     
     # Extract based on file type
     if ext == '.pdf':
-        raw_text = extract_text_from_pdf(file_path)
+        raw_text = extract_text_from_pdf(file_path, ocr=OCR_ENABLED)
     elif ext == '.docx':
         raw_text = extract_text_from_docx(file_path)
     elif ext == '.doc':
         raw_text = extract_text_from_doc(file_path)
+    elif ext in IMAGE_EXTENSIONS and OCR_ENABLED:
+        raise OcrRequired()
     else:
         raise ValueError(f"Unsupported file format: {ext}. Supported formats: .pdf, .docx")
     
     # Clean the extracted text
-    cleaned_text = clean_text(raw_text)
+    with time_stage('clean_text'):
+        cleaned_text = clean_text(raw_text)
     
     return cleaned_text